@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from ..db.database import get_db
+from ..services.export_archive import export_service, parse_artifacts
+from typing import List, Optional
+from pydantic import BaseModel, Field
+import datetime
+
+# Create router
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+# Define Pydantic models
+class ExportRequest(BaseModel):
+    meeting_ids: Optional[List[int]] = None
+    date_from: Optional[datetime.datetime] = None
+    date_to: Optional[datetime.datetime] = None
+    title: Optional[str] = None
+    # Artifact names: "report" / "report.pdf", "transcript.txt", or a format such as "html" or "srt"
+    artifacts: List[str] = Field(default_factory=lambda: ["report"])
+
+
+@router.post("")
+def create_export(
+    request: ExportRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Export the meetings matching a filter as one ZIP archive
+    The archive is streamed while missing documents render in parallel
+    """
+    try:
+        artifacts = parse_artifacts(request.artifacts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    meeting_ids = export_service.find_meetings(
+        db,
+        meeting_ids=request.meeting_ids,
+        date_from=request.date_from,
+        date_to=request.date_to,
+        title=request.title
+    )
+    if not meeting_ids:
+        raise HTTPException(status_code=404, detail="No meetings match the export filter")
+    if len(meeting_ids) > export_service.max_meetings:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Export is limited to {export_service.max_meetings} meetings, narrow the filter"
+        )
+    
+    filename = f"meetings_export_{datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(
+        export_service.stream_archive(meeting_ids, artifacts),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,17 +1,35 @@
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Form, BackgroundTasks
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Form, BackgroundTasks, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse, ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text, tuple_
 import os
 import shutil
-from ..db.database import get_db, Meeting, PDF
+from ..db.database import get_db, get_async_db, SessionLocal, FULLTEXT_ENABLED, Meeting, MeetingContent, PDF, Translation
+from ..db.fulltext import SEARCH_SQL, COUNT_SQL, SNIPPET_COLUMNS, build_match_query, make_snippet
 from ..services.assembly_ai import assembly_ai_service
 from ..services.cohere_analysis import cohere_analysis_service
-from ..services.pdf_generator import pdf_generator_service
+from ..services.pdf_cache import pdf_cache_service, document_inputs
+from ..services.pdf_generator import pdf_generator_service, TEMPLATE_VERSION
+from ..services.export_renderers import export_renderer_registry
+from ..services.document_stream import (
+    text_document, fallback_text_document, stream_text_document, stream_buffer,
+    meeting_etag, validator_headers, not_modified, not_modified_response
+)
+from ..services.render_farm import RenderQueueFull
+from ..services.semantic_search import semantic_search_service
+from ..services.response_cache import response_cache_service
+from ..services.garbage_collector import garbage_collector_service, soft_delete_meetings
+from ..services.audio_retention import audio_retention_service
+from ..services.translation_jobs import translation_job_service, TRANSLATABLE_FIELDS
 from ..core.config import settings
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
 import uuid
+import base64
 import datetime
+import json
 
 # Create router
 router = APIRouter(prefix="/meetings", tags=["meetings"])
@@ -37,11 +55,98 @@ class MeetingResponse(MeetingBase):
     timezone: Optional[str] = "UTC"
     detected_language: Optional[str] = None
     audio_duration: Optional[str] = None
+    status: Optional[str] = None
+    updated_at: Optional[datetime.datetime] = None
     
     class Config:
         from_attributes = True
 
 
+class MeetingListItem(BaseModel):
+    id: int
+    title: str
+    date: Optional[datetime.datetime] = None
+    timezone: Optional[str] = "UTC"
+    language: Optional[str] = None
+    detected_language: Optional[str] = None
+    audio_duration: Optional[str] = None
+    status: Optional[str] = None
+    summary_excerpt: Optional[str] = None
+    updated_at: Optional[datetime.datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class MeetingListPage(BaseModel):
+    items: List[MeetingListItem]
+    next_cursor: Optional[str] = None
+
+
+class MeetingBatchResponse(BaseModel):
+    items: List[Dict[str, Any]]
+    missing: List[int]
+
+
+class BulkDeleteRequest(BaseModel):
+    meeting_ids: List[int] = Field(..., min_length=1)
+
+
+class BulkDeleteResponse(BaseModel):
+    deleted: List[int]
+    missing: List[int]
+
+
+class MeetingSearchHit(BaseModel):
+    meeting_id: int
+    title: Optional[str] = None
+    date: Optional[datetime.datetime] = None
+    score: float
+    snippet: Optional[str] = None
+
+
+class MeetingSearchResponse(BaseModel):
+    query: str
+    total: int
+    skip: int
+    limit: int
+    results: List[MeetingSearchHit]
+
+
+class TranslationJobRequest(BaseModel):
+    target_languages: List[str] = Field(..., min_length=1)
+    fields: List[str] = list(TRANSLATABLE_FIELDS.keys())
+
+
+class TranslationJobResponse(BaseModel):
+    job_id: str
+    meeting_id: int
+    status: str
+    target_languages: List[str]
+    fields: List[str]
+    progress: Dict[str, Dict[str, str]]
+    error: Optional[str] = None
+    created_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+
+
+class TranslationSummary(BaseModel):
+    target_lang: str
+    field: str
+    created_at: Optional[datetime.datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class MeetingTranslationResponse(BaseModel):
+    meeting_id: int
+    target_lang: str
+    transcription: Optional[str] = None
+    summary: Optional[str] = None
+    action_items: Optional[str] = None
+
+
 class PDFResponse(BaseModel):
     id: int
     meeting_id: int
@@ -58,7 +163,7 @@ async def upload_meeting_audio(
     title: str = Form(...),
     audio_file: UploadFile = File(...),
     timezone: str = Form("UTC"),  # Add timezone parameter with default UTC
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload meeting audio file for processing
@@ -91,24 +196,24 @@ async def upload_meeting_audio(
             language="en",  # Default to English, will be updated if detected otherwise
             audio_path=file_path,
             date=current_time,
-            timezone=timezone  # Store the client's timezone
+            timezone=timezone,  # Store the client's timezone
+            status="processing",
+            content=None  # No text yet - set so the response does not try to load it
         )
         db.add(db_meeting)
-        db.commit()
-        db.refresh(db_meeting)
+        await db.commit()
         
         # Process audio in background
         background_tasks.add_task(
             process_meeting_audio,
             meeting_id=db_meeting.id,
-            audio_path=file_path,
-            db=db
+            audio_path=file_path
         )
         
         return db_meeting
     except Exception as e:
         # If there's a database error, handle it
-        db.rollback()
+        await db.rollback()
         # Delete the uploaded file
         if os.path.exists(file_path):
             try:
@@ -118,119 +223,359 @@ async def upload_meeting_audio(
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-@router.get("/", response_model=List[MeetingResponse])
-def get_meetings(
-    skip: int = 0,
-    limit: int = 100,
+def _encode_cursor(date, meeting_id):
+    raw = json.dumps([date.isoformat() if date else None, meeting_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        date, meeting_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(date), int(meeting_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Fields that can be selected with fields=, and the column each one is read from
+SELECTABLE_FIELDS = {
+    "id": Meeting.id,
+    "title": Meeting.title,
+    "date": Meeting.date,
+    "timezone": Meeting.timezone,
+    "language": Meeting.language,
+    "detected_language": Meeting.detected_language,
+    "audio_duration": Meeting.audio_duration,
+    "status": Meeting.status,
+    "summary_excerpt": Meeting.summary_excerpt,
+    "action_items": Meeting.action_items,
+    "updated_at": Meeting.updated_at,
+    "transcription": MeetingContent.transcription,
+    "translation": MeetingContent.translation,
+    "summary": MeetingContent.summary
+}
+CONTENT_FIELDS = {"transcription", "translation", "summary"}
+
+# Fields of a list page, and of a batch when no fields are given
+LIST_FIELDS = [
+    "id", "title", "date", "timezone", "language", "detected_language",
+    "audio_duration", "status", "summary_excerpt", "updated_at"
+]
+
+# Meetings allowed in one batch request
+BATCH_MAX_MEETINGS = 200
+
+# Meetings allowed in one bulk delete
+BULK_DELETE_MAX_MEETINGS = 1000
+
+
+def _parse_fields(fields):
+    """
+    Parse a fields= selector
+
+    Args:
+        fields: Comma-separated field names, or None
+
+    Returns:
+        List of field names with id first, or None when no selector was given
+    """
+    if fields is None:
+        return None
+    names = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in names:
+            continue
+        if name not in SELECTABLE_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown field '{name}'. Available fields: {', '.join(SELECTABLE_FIELDS)}"
+            )
+        names.append(name)
+    return names
+
+
+def _fields_query(names, *columns):
+    # Only the selected columns are read; the content table is joined only when its text is selected
+    query = select(*(SELECTABLE_FIELDS[name].label(name) for name in names), *columns)
+    if CONTENT_FIELDS.intersection(names):
+        query = query.select_from(Meeting).outerjoin(MeetingContent, MeetingContent.meeting_id == Meeting.id)
+    return query
+
+
+def _field_values(row, names):
+    return {name: row._mapping[name] for name in names}
+
+
+@router.get("/", response_model=MeetingListPage)
+async def get_meetings(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    date_from: Optional[datetime.datetime] = None,
+    date_to: Optional[datetime.datetime] = None,
+    language: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a page of meetings, newest first
+    Only the list columns and the stored summary excerpt are loaded, never the text.
+    Pass next_cursor from the previous page as cursor to get the next one; pages are
+    found through the (date, id) index, so deep pages cost the same as the first.
+    date_from is inclusive, date_to exclusive; language is a language code (en, zh, ...)
+    fields (e.g. title,status) returns only those fields of each meeting, plus id
+    """
+    names = _parse_fields(fields)
+    query = _fields_query(names or LIST_FIELDS, Meeting.date.label("cursor_date"))
+    if date_from:
+        query = query.where(Meeting.date >= date_from)
+    if date_to:
+        query = query.where(Meeting.date < date_to)
+    if language:
+        query = query.where(Meeting.language == language)
+    if cursor:
+        query = query.where(tuple_(Meeting.date, Meeting.id) < tuple_(*_decode_cursor(cursor)))
+    
+    result = await db.execute(query.order_by(Meeting.date.desc(), Meeting.id.desc()).limit(limit + 1))
+    rows = result.all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].cursor_date, rows[-1].id)
+    if names is None:
+        return MeetingListPage(items=[MeetingListItem.model_validate(row) for row in rows], next_cursor=next_cursor)
+    return ORJSONResponse({"items": [_field_values(row, names) for row in rows], "next_cursor": next_cursor})
+
+
+@router.get("/batch", response_model=MeetingBatchResponse)
+async def get_meetings_batch(
+    ids: str = Query(..., description="Comma-separated meeting IDs"),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get several meetings in one query
+    Returns the selected fields (the list fields by default) of each meeting in the
+    order the IDs were given; IDs with no meeting are listed in missing
+    """
+    try:
+        meeting_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated meeting IDs")
+    if not meeting_ids:
+        raise HTTPException(status_code=400, detail="No meeting IDs given")
+    if len(meeting_ids) > BATCH_MAX_MEETINGS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_MEETINGS} meetings can be fetched at once")
+    
+    names = _parse_fields(fields) or LIST_FIELDS
+    result = await db.execute(_fields_query(names).where(Meeting.id.in_(meeting_ids)))
+    found = {row.id: _field_values(row, names) for row in result}
+    return ORJSONResponse({
+        "items": [found[meeting_id] for meeting_id in meeting_ids if meeting_id in found],
+        "missing": [meeting_id for meeting_id in meeting_ids if meeting_id not in found]
+    })
+
+
+@router.get("/search", response_model=MeetingSearchResponse)
+def search_meetings_text(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
     """
-    Get list of all meetings
+    Keyword search over meeting titles, transcripts, summaries, action items and translations
+    Results are ranked with BM25 and include a highlighted snippet
     """
-    meetings = db.query(Meeting).offset(skip).limit(limit).all()
-    return meetings
+    if not FULLTEXT_ENABLED:
+        raise HTTPException(status_code=503, detail="Full-text search is not available")
+    
+    match_query = build_match_query(q)
+    if not match_query:
+        raise HTTPException(status_code=400, detail="Search query has no searchable terms")
+    
+    try:
+        total = db.execute(text(COUNT_SQL), {"query": match_query}).scalar()
+        rows = db.execute(text(SEARCH_SQL), {
+            "query": match_query,
+            "limit": limit,
+            "skip": skip
+        }).all()
+    except Exception as e:
+        print(f"Full-text search error: {e}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {e}")
+    
+    # The index holds no text, so snippets are cut from the meetings; columns are
+    # loaded (and decompressed) one at a time until one of them has a match
+    meetings = {m.id: m for m in db.query(Meeting).filter(Meeting.id.in_([row.id for row in rows]))}
+    results = []
+    for row in rows:
+        meeting = meetings.get(row.id)
+        snippet = None
+        if meeting:
+            snippet = make_snippet((getattr(meeting, column) for column in SNIPPET_COLUMNS), q, "<mark>", "</mark>", 24)
+        results.append(MeetingSearchHit(
+            meeting_id=row.id,
+            title=row.title,
+            date=row.date,
+            score=round(-row.rank, 4),  # bm25() is lower-is-better
+            snippet=snippet
+        ))
+    return MeetingSearchResponse(query=q, total=total, skip=skip, limit=limit, results=results)
+
+
+@router.get("/cache/stats")
+def get_response_cache_stats():
+    """
+    Hit rate and counters of the meeting response cache since this process started
+    """
+    return response_cache_service.stats()
+
+
+@router.get("/gc/stats")
+def get_garbage_collector_stats():
+    """
+    Deleted meetings waiting for their files to be removed, and garbage collector counters
+    """
+    return garbage_collector_service.stats()
+
+
+@router.get("/audio-retention/stats")
+def get_audio_retention_stats():
+    """
+    Audio retention policy and the recordings transcoded and bytes reclaimed since this process started
+    """
+    return audio_retention_service.stats()
+
+
+@router.post("/bulk-delete", response_model=BulkDeleteResponse)
+def bulk_delete_meetings(
+    request: BulkDeleteRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Delete several meetings
+    Returns as soon as the meetings are marked deleted; their files are removed in the background
+    """
+    meeting_ids = list(dict.fromkeys(request.meeting_ids))
+    if len(meeting_ids) > BULK_DELETE_MAX_MEETINGS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_DELETE_MAX_MEETINGS} meetings can be deleted at once")
+    try:
+        deleted = soft_delete_meetings(db, meeting_ids)
+    except Exception as e:
+        db.rollback()
+        print(f"Error deleting meetings {meeting_ids}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to delete meetings: {e}")
+    return BulkDeleteResponse(deleted=deleted, missing=[meeting_id for meeting_id in meeting_ids if meeting_id not in deleted])
 
 
 @router.get("/{meeting_id}", response_model=MeetingResponse)
-def get_meeting(
+async def get_meeting(
     meeting_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get meeting by ID
+    Responses are served from the response cache until the meeting is next written,
+    and answer If-None-Match / If-Modified-Since with 304 while it is unchanged.
+    fields (e.g. title,summary) returns only those fields, plus id, read in one query
     """
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    names = _parse_fields(fields)
+    if names is not None:
+        # Not cached - the response is only the selected columns
+        row = (await db.execute(
+            _fields_query(
+                names, Meeting.content_version.label("etag_version"), Meeting.updated_at.label("etag_updated_at")
+            ).where(Meeting.id == meeting_id)
+        )).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        etag = meeting_etag(meeting_id, row.etag_version, "fields", *names)
+        if not_modified(request, etag, row.etag_updated_at):
+            return not_modified_response(etag, row.etag_updated_at)
+        return ORJSONResponse(_field_values(row, names), headers=validator_headers(etag, row.etag_updated_at))
+    
+    cached = await response_cache_service.get_async(meeting_id)
+    if cached is not None:
+        headers, body = cached
+        if not_modified(request, headers["ETag"], headers.get("Last-Modified")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+    
+    epoch = await response_cache_service.epoch_async()
+    version = (await db.execute(
+        select(Meeting.content_version, Meeting.updated_at).where(Meeting.id == meeting_id)
+    )).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    etag = meeting_etag(meeting_id, version.content_version)
+    if not_modified(request, etag, version.updated_at):
+        return not_modified_response(etag, version.updated_at)
+    
+    # The response reads the text, and an async session cannot load it lazily
+    meeting = await db.scalar(
+        select(Meeting).where(Meeting.id == meeting_id).options(
+            selectinload(Meeting.content)
+            .undefer(MeetingContent.transcription)
+            .undefer(MeetingContent.translation)
+            .undefer(MeetingContent.summary)
+        )
+    )
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return meeting
+
+    # Validators of the version actually loaded, which a concurrent write may have moved past
+    headers = validator_headers(meeting_etag(meeting_id, meeting.content_version), meeting.updated_at)
+    body = MeetingResponse.model_validate(meeting).model_dump_json().encode("utf-8")
+    await response_cache_service.put_async(meeting_id, body, epoch, headers)
+    return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
 
 
 @router.get("/{meeting_id}/pdf/{pdf_type}")
 def get_meeting_pdf(
     meeting_id: int,
     pdf_type: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get meeting document by type (transcript, summary, report)
-    Returns PDF if possible, falls back to text file if there are issues
+    Returns PDF if possible, falls back to text if there are issues
     """
     # Check if meeting exists
     meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Check if PDF exists
-    pdf = db.query(PDF).filter(
-        PDF.meeting_id == meeting_id,
-        PDF.pdf_type == pdf_type
-    ).first()
+    # The content version identifies the document, so a client's current copy needs no text loaded or rendered
+    etag = meeting_etag(meeting_id, meeting.content_version, "pdf", pdf_type, TEMPLATE_VERSION)
+    if not_modified(request, etag, meeting.updated_at):
+        return not_modified_response(etag, meeting.updated_at)
     
-    # If PDF doesn't exist, generate it
-    file_path = None
     try:
-        if not pdf:
-            if pdf_type == "transcript":
-                if not meeting.transcription:
-                    raise HTTPException(status_code=400, detail="Meeting has no transcription")
-                file_path = pdf_generator_service.generate_transcript_pdf(
-                    meeting.title, meeting.transcription, meeting.id
-                )
-            elif pdf_type == "summary":
-                if not meeting.summary or not meeting.action_items:
-                    raise HTTPException(status_code=400, detail="Meeting has no summary or action items")
-                file_path = pdf_generator_service.generate_summary_pdf(
-                    meeting.title, meeting.summary, meeting.action_items, meeting.id
-                )
-            elif pdf_type == "report":
-                if not meeting.transcription or not meeting.summary:
-                    raise HTTPException(status_code=400, detail="Meeting incomplete")
-                file_path = pdf_generator_service.generate_full_report_pdf(
-                    meeting.title, meeting.transcription, meeting.summary, 
-                    meeting.action_items or "No action items", meeting.id
-                )
-            else:
-                raise HTTPException(status_code=400, detail="Invalid PDF type")
-            
-            # Save PDF record
-            pdf = PDF(
-                meeting_id=meeting_id,
-                file_path=file_path,
-                pdf_type=pdf_type
+        inputs = document_inputs(meeting, pdf_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        if not settings.PDF_CACHE_ENABLED:
+            # Render into memory; nothing is written to PDF_DIR
+            buffer = pdf_generator_service.render_to_buffer(
+                pdf_type, meeting.title, meeting.transcription, meeting.summary,
+                meeting.action_items or "No action items"
+            )
+            return stream_buffer(
+                buffer, f"{meeting.title}_{pdf_type}.pdf", "application/pdf", etag, last_modified=meeting.updated_at
             )
-            db.add(pdf)
-            db.commit()
-            db.refresh(pdf)
         
-        # Check if the file exists
-        if not os.path.exists(pdf.file_path):
-            # File might have been deleted or moved
-            # Generate a text file as fallback
-            print(f"PDF file not found at {pdf.file_path}, generating text fallback")
-            
-            # Create a text fallback based on PDF type
-            fallback_dir = os.path.join(settings.PDF_DIR, "fallback")
-            os.makedirs(fallback_dir, exist_ok=True)
-            
-            fallback_filename = f"{pdf_type}_{meeting_id}_{meeting.title.replace(' ', '_')}.txt"
-            fallback_path = os.path.join(fallback_dir, fallback_filename)
-            
-            with open(fallback_path, 'w', encoding='utf-8') as f:
-                f.write(f"=== {pdf_type.upper()} FOR: {meeting.title} ===\n\n")
-                if pdf_type == "transcript":
-                    f.write(meeting.transcription or "No transcription available")
-                elif pdf_type == "summary":
-                    f.write(f"SUMMARY:\n{meeting.summary or 'No summary available'}\n\n")
-                    f.write(f"ACTION ITEMS:\n{meeting.action_items or 'No action items available'}")
-                elif pdf_type == "report":
-                    f.write(f"SUMMARY:\n{meeting.summary or 'No summary available'}\n\n")
-                    f.write(f"ACTION ITEMS:\n{meeting.action_items or 'No action items available'}\n\n")
-                    f.write(f"TRANSCRIPT:\n{meeting.transcription or 'No transcription available'}")
-            
-            # Update the PDF record with the new path
-            pdf.file_path = fallback_path
-            db.commit()
-            db.refresh(pdf)
+        # Render the document unless an up-to-date copy is cached
+        try:
+            pdf = pdf_cache_service.get_or_render(db, meeting, pdf_type)
+        except RenderQueueFull as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
         
         # Determine media type based on file extension
         file_extension = os.path.splitext(pdf.file_path)[1].lower()
@@ -243,52 +588,74 @@ def get_meeting_pdf(
         return FileResponse(
             pdf.file_path,
             filename=download_filename,
-            media_type=media_type
+            media_type=media_type,
+            headers=validator_headers(etag, meeting.updated_at) if pdf.content_hash else None
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error generating document: {e}")
         
-        # Create a simple text file as emergency fallback
-        emergency_filename = f"emergency_{pdf_type}_{meeting_id}.txt"
-        emergency_path = os.path.join(settings.PDF_DIR, emergency_filename)
-        
-        try:
-            with open(emergency_path, 'w', encoding='utf-8') as f:
-                f.write(f"=== {pdf_type.upper()} FOR: {meeting.title} ===\n\n")
-                f.write(f"Error generating document: {str(e)}\n\n")
-                
-                if pdf_type == "transcript":
-                    f.write("TRANSCRIPT:\n" + (meeting.transcription or "No transcription available"))
-                elif pdf_type == "summary":
-                    f.write("SUMMARY:\n" + (meeting.summary or "No summary available"))
-                    f.write("\n\nACTION ITEMS:\n" + (meeting.action_items or "No action items available"))
-                elif pdf_type == "report":
-                    f.write("SUMMARY:\n" + (meeting.summary or "No summary available"))
-                    f.write("\n\nACTION ITEMS:\n" + (meeting.action_items or "No action items available"))
-                    f.write("\n\nTRANSCRIPT:\n" + (meeting.transcription or "No transcription available"))
-            
-            return FileResponse(
-                emergency_path,
-                filename=f"{meeting.title}_{pdf_type}.txt",
-                media_type="text/plain"
-            )
-        except Exception as fallback_error:
-            print(f"Emergency fallback failed: {fallback_error}")
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Failed to generate document: {str(e)}. Emergency fallback also failed: {str(fallback_error)}"
-            )
+        # Serve the raw text from memory as an emergency fallback
+        return stream_text_document(
+            fallback_text_document(meeting, pdf_type, e),
+            f"{meeting.title}_{pdf_type}.txt"
+        )
 
 
-@router.post("/{meeting_id}/translate")
+@router.get("/{meeting_id}/export/{export_format}")
+def export_meeting(
+    meeting_id: int,
+    export_format: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Export a meeting in a lightweight format (md, html, docx, json, srt, vtt)
+    Subtitle formats are built from the stored utterance timestamps
+    """
+    renderer = export_renderer_registry.get(export_format)
+    if not renderer:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported export format, use one of: {', '.join(export_renderer_registry.formats)}"
+        )
+    
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    etag = meeting_etag(meeting_id, meeting.content_version, "export", export_format)
+    if not_modified(request, etag, meeting.updated_at):
+        return not_modified_response(etag, meeting.updated_at)
+    
+    try:
+        renderer.check(meeting)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return stream_text_document(
+        renderer.render(meeting),
+        f"{meeting.title}.{renderer.extension}",
+        request,
+        media_type=renderer.media_type,
+        etag=etag,
+        last_modified=meeting.updated_at
+    )
+
+
+@router.post("/{meeting_id}/translate", status_code=202)
 def translate_meeting(
     meeting_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     target_language: str = "zh"  # Default to Chinese if not provided
 ):
     """
     Translate meeting transcription to target language
+    Returns a job ID immediately; the translation runs in the background and
+    can be followed through the translation stream endpoint
     """
     print(f"Translating meeting {meeting_id} to language {target_language}")
     
@@ -301,39 +668,186 @@ def translate_meeting(
     if not meeting.transcription:
         raise HTTPException(status_code=400, detail="Meeting has no transcription")
     
-    # Translate text
-    source_language = meeting.language
+    job = translation_job_service.create_job(
+        meeting_id, [target_language], ["transcription"], update_meeting_translation=True
+    )
+    background_tasks.add_task(translation_job_service.run_job, job.id)
+    
+    return {
+        "status": "queued",
+        "job_id": job.id,
+        "meeting_id": meeting_id,
+        "target_language": target_language,
+        "stream_url": f"{settings.API_PREFIX}/meetings/{meeting_id}/translations/{target_language}/stream"
+    }
+
+
+@router.post("/{meeting_id}/translations", response_model=TranslationJobResponse, status_code=202)
+async def create_translation_job(
+    meeting_id: int,
+    request: TranslationJobRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Translate a meeting into several languages at once
+    Runs as a background job; poll the returned job ID for progress
+    """
+    meeting = await db.scalar(select(Meeting.id).where(Meeting.id == meeting_id))
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
     try:
-        print(f"Translating from {source_language} to {target_language}")
-        translation = assembly_ai_service.translate_text(
-            meeting.transcription,
-            source_lang=source_language,
-            target_lang=target_language
+        job = await run_in_threadpool(
+            translation_job_service.create_job, meeting_id, request.target_languages, request.fields
         )
-        
-        # Update meeting record
-        meeting.translation = translation
-        db.commit()
-        db.refresh(meeting)
-        
-        return {"status": "success", "meeting_id": meeting_id, "target_language": target_language}
-    except Exception as e:
-        print(f"Translation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Translation failed: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    background_tasks.add_task(translation_job_service.run_job, job.id)
+    return job.to_dict()
 
 
-async def process_meeting_audio(meeting_id: int, audio_path: str, db: Session):
+@router.get("/{meeting_id}/translation-jobs/{job_id}", response_model=TranslationJobResponse)
+def get_translation_job(
+    meeting_id: int,
+    job_id: str
+):
+    """
+    Get the status of a translation job, whichever API process runs it
+    """
+    job = translation_job_service.get_job(job_id)
+    if not job or job["meeting_id"] != meeting_id:
+        raise HTTPException(status_code=404, detail="Translation job not found")
+    return job
+
+
+@router.get("/{meeting_id}/translations", response_model=List[TranslationSummary])
+def list_meeting_translations(
+    meeting_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    List the stored translations of a meeting (without their content)
+    """
+    return db.query(Translation.target_lang, Translation.field, Translation.created_at).filter(
+        Translation.meeting_id == meeting_id
+    ).order_by(Translation.target_lang, Translation.field).all()
+
+
+@router.get("/{meeting_id}/translations/{target_lang}", response_model=MeetingTranslationResponse)
+def get_meeting_translation(
+    meeting_id: int,
+    target_lang: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the stored translation of a meeting in one language
+    """
+    translations = db.query(Translation).filter(
+        Translation.meeting_id == meeting_id,
+        Translation.target_lang == target_lang
+    ).all()
+    if not translations:
+        raise HTTPException(status_code=404, detail="Translation not found")
+    
+    response = MeetingTranslationResponse(meeting_id=meeting_id, target_lang=target_lang)
+    for translation in translations:
+        setattr(response, translation.field, translation.content)
+    return response
+
+
+@router.get("/{meeting_id}/translations/{target_lang}/stream")
+async def stream_meeting_translation(
+    meeting_id: int,
+    target_lang: str,
+    field: str = "transcription",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream a translation as server-sent events
+    While a translation job is running in this process, segments are sent in order
+    as soon as they are translated; a job running in another process is followed
+    until it finishes and its stored translation is then sent; otherwise the stored
+    translation is sent
+    Events: "segment" ({"index", "text"}) followed by one "done" ({"status"}, and
+    "failed_segments" with the indexes that could not be translated)
+    """
+    if field not in TRANSLATABLE_FIELDS:
+        raise HTTPException(status_code=400, detail="Invalid field")
+    
+    job = translation_job_service.find_active_job(meeting_id, target_lang, field)
+    remote_job_id = None
+    stored = None
+    if not job:
+        remote_job_id = await run_in_threadpool(
+            translation_job_service.find_remote_job, meeting_id, target_lang, field
+        )
+    
+    async def load_stored():
+        return await db.scalar(select(Translation.content).where(
+            Translation.meeting_id == meeting_id,
+            Translation.target_lang == target_lang,
+            Translation.field == field
+        ))
+    
+    if not job and not remote_job_id:
+        stored = await load_stored()
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Translation not found")
+    
+    def sse(event, data):
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    async def events():
+        if remote_job_id:
+            status = await translation_job_service.wait_for_field(remote_job_id, target_lang, field)
+            content = await load_stored() if status == "completed" else None
+            if content is not None:
+                for index, segment in enumerate(assembly_ai_service.segment_text(content, TRANSLATABLE_FIELDS[field])):
+                    yield sse("segment", {"index": index, "text": segment})
+            else:
+                status = "failed"
+            yield sse("done", {"status": status, "job_id": remote_job_id})
+            return
+        if job:
+            async for index, segment in translation_job_service.stream_segments(job, target_lang, field):
+                yield sse("segment", {"index": index, "text": segment})
+            status = job.progress.get(target_lang, {}).get(field, job.status)
+            done = {"status": status, "job_id": job.id}
+            stream = job.streams.get((target_lang, field))
+            if stream and stream.failed:
+                done["failed_segments"] = stream.failed
+            yield sse("done", done)
+        else:
+            for index, segment in enumerate(assembly_ai_service.segment_text(stored, TRANSLATABLE_FIELDS[field])):
+                yield sse("segment", {"index": index, "text": segment})
+            yield sse("done", {"status": "completed"})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def process_meeting_audio(meeting_id: int, audio_path: str):
     """
     Background task to process meeting audio with auto language detection
+    Uses its own session, since the request's session is closed by then
     """
+    db = SessionLocal()
     try:
         print(f"Processing meeting audio for meeting_id={meeting_id}, audio_path={audio_path}")
         
         # Transcribe audio with auto language detection
         print("Starting transcription with language detection...")
         audio_info = {}
+        utterances = []
         try:
-            transcription = assembly_ai_service.transcribe_audio(audio_path)
+            transcript_result = assembly_ai_service.transcribe_audio_detailed(audio_path)
+            transcription = transcript_result["text"]
+            utterances = transcript_result["utterances"]
             if not transcription or transcription.strip() == "":
                 print("Warning: Received empty transcription result")
                 transcription = "Transcription failed. Please try again with a clearer audio file."
@@ -432,6 +946,9 @@ Key points:
             meeting.transcription = transcription
             meeting.summary = summary
             meeting.action_items = action_items
+            meeting.status = "failed" if transcription.startswith(("Transcription failed", "Error processing")) else "completed"
+            if utterances:
+                meeting.utterances = json.dumps(utterances)
             
             # Update language if detected
             if audio_info.get("detected_language"):
@@ -463,7 +980,6 @@ Key points:
                 
                 # Convert to JSON string if needed
                 if isinstance(audio_info, dict):
-                    import json
                     try:
                         audio_info_str = json.dumps(audio_info)
                         # Check if the audio_info column exists in the database object
@@ -480,12 +996,17 @@ Key points:
                 # Pre-generate PDFs in the background to ensure they're ready when needed
                 try:
                     print("Pre-generating PDF files...")
-                    pdf_generator_service.generate_transcript_pdf(meeting.title, meeting.transcription, meeting.id)
-                    pdf_generator_service.generate_summary_pdf(meeting.title, meeting.summary, meeting.action_items, meeting.id)
-                    pdf_generator_service.generate_full_report_pdf(meeting.title, meeting.transcription, meeting.summary, meeting.action_items, meeting.id)
-                    print("PDF files generated successfully")
+                    if pdf_cache_service.prerender(db, meeting):
+                        print("PDF files queued for rendering")
                 except Exception as pdf_err:
                     print(f"Warning: Failed to pre-generate PDFs: {pdf_err}")
+                
+                # Add the transcript to the semantic search index
+                if not meeting.transcription.startswith(("Transcription failed", "Error processing")):
+                    try:
+                        semantic_search_service.index_meeting(meeting.id, meeting.transcription, utterances)
+                    except Exception as index_err:
+                        print(f"Warning: Failed to index meeting for search: {index_err}")
             except Exception as db_err:
                 print(f"Error during database commit: {db_err}")
                 db.rollback()
@@ -495,6 +1016,7 @@ Key points:
                     meeting.transcription = transcription
                     meeting.summary = summary
                     meeting.action_items = action_items
+                    meeting.status = "failed" if transcription.startswith(("Transcription failed", "Error processing")) else "completed"
                     db.commit()
                     print("Second attempt to update succeeded")
                 except Exception as second_err:
@@ -511,9 +1033,12 @@ Key points:
             meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
             if meeting:
                 meeting.transcription = f"Error processing meeting: {str(e)}"
+                meeting.status = "failed"
                 db.commit()
         except Exception as db_err:
             print(f"Error updating meeting record with error status: {db_err}")
+    finally:
+        db.close()
 
 
 @router.delete("/{meeting_id}")
@@ -523,172 +1048,65 @@ def delete_meeting(
 ):
     """
     Delete a meeting and associated files
+    The meeting is hidden at once; its audio and PDF files are removed in the background
     """
-    # Check if meeting exists
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-    
     try:
-        print(f"Deleting meeting ID {meeting_id}: {meeting.title}")
-        deleted_files = []
-        
-        # Delete associated PDFs
-        pdf_files = db.query(PDF).filter(PDF.meeting_id == meeting_id).all()
-        for pdf in pdf_files:
-            # Delete PDF file if it exists
-            if pdf.file_path and os.path.exists(pdf.file_path):
-                try:
-                    os.remove(pdf.file_path)
-                    deleted_files.append(pdf.file_path)
-                except Exception as e:
-                    print(f"Warning: Failed to delete PDF file {pdf.file_path}: {e}")
-            db.delete(pdf)
-        
-        # Delete audio file if it exists
-        if meeting.audio_path and os.path.exists(meeting.audio_path):
-            try:
-                os.remove(meeting.audio_path)
-                deleted_files.append(meeting.audio_path)
-            except Exception as e:
-                print(f"Warning: Failed to delete audio file {meeting.audio_path}: {e}")
-        
-        # Delete meeting from database
-        db.delete(meeting)
-        db.commit()
-        
-        print(f"Successfully deleted meeting and {len(deleted_files)} associated files")
-        return {
-            "status": "success", 
-            "message": "Meeting deleted successfully",
-            "deleted_files_count": len(deleted_files)
-        }
+        deleted = soft_delete_meetings(db, [meeting_id])
     except Exception as e:
         db.rollback()
         print(f"Error deleting meeting {meeting_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete meeting: {e}")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    print(f"Deleted meeting ID {meeting_id}, its files are queued for removal")
+    return {
+        "status": "success",
+        "message": "Meeting deleted successfully"
+    }
 
 
 @router.get("/{meeting_id}/text/{content_type}")
 def get_meeting_text(
     meeting_id: int,
     content_type: str,
+    request: Request,
+    lang: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Get meeting content as plain text by type (transcript, summary, report)
+    Get meeting content as plain text by type (transcript, summary, report, translation)
     This is a more reliable alternative to PDF downloads
+    For translations, lang selects a stored translation instead of the latest one
     """
     # Check if meeting exists
     meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Create text content based on requested type
+    # Stored translations count towards the content version, so it covers every variant
+    etag = meeting_etag(meeting_id, meeting.content_version, "text", content_type, lang)
+    if not_modified(request, etag, meeting.updated_at):
+        return not_modified_response(etag, meeting.updated_at)
+    
+    # Generate the document in memory and stream it
     try:
-        if content_type == "transcript":
-            if not meeting.transcription:
-                raise HTTPException(status_code=400, detail="Meeting has no transcription")
-            
-            # Create text content
-            content = f"=== TRANSCRIPT: {meeting.title} ===\n\n"
-            content += meeting.transcription
-            
-            # Add metadata
-            content += f"\n\n=== METADATA ===\nMeeting: {meeting.title}\n"
-            if meeting.detected_language:
-                content += f"Detected language: {meeting.detected_language}\n"
-            if meeting.audio_duration:
-                content += f"Duration: {meeting.audio_duration}\n"
-            if meeting.date:
-                content += f"Date: {meeting.date.strftime('%Y-%m-%d %H:%M:%S')}\n"
-            
-            filename = f"{meeting.title}_transcript.txt"
-            
-        elif content_type == "summary":
-            if not meeting.summary:
-                raise HTTPException(status_code=400, detail="Meeting has no summary")
-            
-            # Create text content
-            content = f"=== SUMMARY: {meeting.title} ===\n\n"
-            content += f"SUMMARY:\n{meeting.summary}\n\n"
-            
-            if meeting.action_items:
-                content += f"ACTION ITEMS:\n{meeting.action_items}\n"
-            
-            # Add metadata
-            content += f"\n=== METADATA ===\nMeeting: {meeting.title}\n"
-            if meeting.detected_language:
-                content += f"Detected language: {meeting.detected_language}\n"
-            if meeting.audio_duration:
-                content += f"Duration: {meeting.audio_duration}\n"
-            if meeting.date:
-                content += f"Date: {meeting.date.strftime('%Y-%m-%d %H:%M:%S')}\n"
-            
-            filename = f"{meeting.title}_summary.txt"
-            
-        elif content_type == "report":
-            if not meeting.transcription or not meeting.summary:
-                raise HTTPException(status_code=400, detail="Meeting incomplete")
-            
-            # Create text content
-            content = f"=== FULL REPORT: {meeting.title} ===\n\n"
-            content += f"SUMMARY:\n{meeting.summary}\n\n"
-            
-            if meeting.action_items:
-                content += f"ACTION ITEMS:\n{meeting.action_items}\n\n"
-            
-            content += f"TRANSCRIPT:\n{meeting.transcription}\n"
-            
-            # Add metadata
-            content += f"\n=== METADATA ===\nMeeting: {meeting.title}\n"
-            if meeting.detected_language:
-                content += f"Detected language: {meeting.detected_language}\n"
-            if meeting.audio_duration:
-                content += f"Duration: {meeting.audio_duration}\n"
-            if meeting.date:
-                content += f"Date: {meeting.date.strftime('%Y-%m-%d %H:%M:%S')}\n"
-            
-            filename = f"{meeting.title}_full_report.txt"
-            
-        elif content_type == "translation":
-            if not meeting.translation:
-                raise HTTPException(status_code=400, detail="Meeting has no translation")
-            
-            # Create text content
-            content = f"=== TRANSLATION: {meeting.title} ===\n\n"
-            content += meeting.translation
-            
-            # Add metadata
-            content += f"\n\n=== METADATA ===\nMeeting: {meeting.title}\n"
-            if meeting.detected_language:
-                content += f"Source language: {meeting.detected_language}\n"
-            if meeting.audio_duration:
-                content += f"Duration: {meeting.audio_duration}\n"
-            if meeting.date:
-                content += f"Date: {meeting.date.strftime('%Y-%m-%d %H:%M:%S')}\n"
-            
-            filename = f"{meeting.title}_translation.txt"
-            
-        else:
-            raise HTTPException(status_code=400, detail="Invalid content type")
-        
-        # Create temporary file
-        temp_dir = os.path.join(settings.PDF_DIR, "text")
-        os.makedirs(temp_dir, exist_ok=True)
+        translation = None
+        if content_type == "translation":
+            translation = meeting.translation
+            if lang:
+                translation = db.query(Translation.content).filter(
+                    Translation.meeting_id == meeting_id,
+                    Translation.target_lang == lang,
+                    Translation.field == "transcription"
+                ).scalar()
         
-        file_path = os.path.join(temp_dir, f"{meeting_id}_{content_type}.txt")
-        
-        # Write content to file
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        try:
+            chunks, filename = text_document(meeting, content_type, translation, lang)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Return file
-        return FileResponse(
-            file_path,
-            filename=filename,
-            media_type="text/plain"
-        )
+        return stream_text_document(chunks, filename, request, etag=etag, last_modified=meeting.updated_at)
         
     except HTTPException:
         raise
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..db.database import get_db
+from ..services.semantic_search import semantic_search_service
+from typing import List, Optional
+from pydantic import BaseModel
+
+# Create router
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+# Define Pydantic models
+class SearchResult(BaseModel):
+    meeting_id: int
+    meeting_title: Optional[str] = None
+    segment_index: int
+    speaker: Optional[str] = None
+    text: str
+    start_ms: Optional[int] = None
+    end_ms: Optional[int] = None
+    timestamp: Optional[str] = None
+    score: float
+
+
+@router.get("/", response_model=List[SearchResult])
+def search_meetings(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Semantic search across all meeting transcripts
+    Returns the best matching transcript segments with their timestamps
+    """
+    if not semantic_search_service.enabled:
+        raise HTTPException(status_code=503, detail=f"Semantic search is not available: {semantic_search_service.disabled_reason}")
+    
+    try:
+        return semantic_search_service.search(db, q, limit=limit)
+    except Exception as e:
+        print(f"Search error: {e}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {e}")
@@ -0,0 +1,298 @@
+"""
+Online backups of the SQLite database.
+
+The database is copied with SQLite's backup API a few pages at a time, so the
+API keeps writing while a backup runs and the copy is still a consistent
+snapshot (a write between two steps restarts the copy). The snapshot is
+compressed with zstd (gzip when the zstandard package is not installed) and
+can come with a manifest of SHA-256 hashes of the database and of every
+upload and PDF file it references, so a restore can be checked for
+completeness.
+
+This module only depends on the standard library (and optionally zstandard)
+so db_utils.py can use it without loading the ORM models.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import sqlite3
+import datetime
+
+from .compression import ZSTD_AVAILABLE
+
+if ZSTD_AVAILABLE:
+    import zstandard
+
+BACKUP_PREFIX = "meetings_"
+MANIFEST_SUFFIX = ".manifest.json"
+# Extensions of backup files; plain .db copies were made before backups were compressed
+BACKUP_EXTENSIONS = (".db.zst", ".db.gz", ".db")
+
+# Seconds between backup steps, so waiting writers get the database
+STEP_SLEEP = 0.01
+
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+CHUNK_SIZE = 1024 * 1024
+
+
+def _open_compressed(path, mode, name=None):
+    # The codec follows the extension of name (default: the path itself)
+    name = name or path
+    if name.endswith(".zst"):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"{path} is zstd-compressed - install zstandard to read it")
+        raw = open(path, mode)
+        if mode == "wb":
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    if name.endswith(".gz"):
+        return gzip.open(path, mode, compresslevel=GZIP_LEVEL) if mode == "wb" else gzip.open(path, mode)
+    return open(path, mode)
+
+
+def _copy_stream(source, target):
+    # Copy in chunks and return (bytes, SHA-256 of the bytes)
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            return size, digest.hexdigest()
+        digest.update(chunk)
+        size += len(chunk)
+        target.write(chunk)
+
+
+def file_sha256(path):
+    """
+    SHA-256 of a file, read in chunks
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def referenced_files(conn):
+    """
+    Files the database points at
+
+    Args:
+        conn: sqlite3 connection to a meetings database
+
+    Returns:
+        List of (kind, path) tuples, kind being "audio" or "pdf"
+    """
+    files = [("audio", path) for (path,) in conn.execute("SELECT audio_path FROM meetings WHERE audio_path IS NOT NULL")]
+    files += [("pdf", path) for (path,) in conn.execute("SELECT file_path FROM pdfs WHERE file_path IS NOT NULL")]
+    return files
+
+
+def _file_entry(kind, path):
+    if not os.path.isfile(path):
+        return {"kind": kind, "path": path, "missing": True}
+    return {"kind": kind, "path": path, "size": os.path.getsize(path), "sha256": file_sha256(path)}
+
+
+def create_backup(db_path, backup_dir, step_pages=1024, manifest=False, progress=None):
+    """
+    Back up a live database into a compressed snapshot
+
+    Args:
+        db_path: Path of the database
+        backup_dir: Directory for the backup (created if missing)
+        step_pages: Pages copied per step (-1 copies everything in one step)
+        manifest: Also write a manifest with hashes of the backup and of the referenced files
+        progress: Optional callable(remaining, total) called after every step
+
+    Returns:
+        Dictionary with the backup path, manifest path (or None), sizes and file counts
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    stem = os.path.join(backup_dir, f"{BACKUP_PREFIX}{timestamp}")
+    backup_path = stem + (".db.zst" if ZSTD_AVAILABLE else ".db.gz")
+    snapshot_path = stem + ".snapshot.tmp"
+    partial_path = backup_path + ".part"
+
+    files = []
+    try:
+        source = sqlite3.connect(db_path)
+        snapshot = sqlite3.connect(snapshot_path)
+        try:
+            with snapshot:
+                source.backup(
+                    snapshot, pages=step_pages, sleep=STEP_SLEEP,
+                    progress=(lambda status, remaining, total: progress(remaining, total)) if progress else None
+                )
+            # A standalone file that opens without a -wal next to it
+            snapshot.execute("PRAGMA journal_mode=DELETE")
+            check = snapshot.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise RuntimeError(f"Backup snapshot failed its integrity check: {check}")
+            if manifest:
+                files = referenced_files(snapshot)
+        finally:
+            snapshot.close()
+            source.close()
+
+        with open(snapshot_path, "rb") as src, _open_compressed(partial_path, "wb", name=backup_path) as dst:
+            database_size, database_sha256 = _copy_stream(src, dst)
+        os.replace(partial_path, backup_path)
+    finally:
+        for path in (snapshot_path, partial_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    manifest_path = None
+    entries = []
+    if manifest:
+        entries = [_file_entry(kind, path) for kind, path in files]
+        manifest_path = stem + MANIFEST_SUFFIX
+        with open(manifest_path + ".part", "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": datetime.datetime.now().isoformat(),
+                "source": os.path.abspath(db_path),
+                "database": {
+                    "file": os.path.basename(backup_path),
+                    "size": database_size,
+                    "sha256": database_sha256,
+                    "compressed_size": os.path.getsize(backup_path)
+                },
+                "files": entries
+            }, f, indent=2)
+        os.replace(manifest_path + ".part", manifest_path)
+
+    return {
+        "path": backup_path,
+        "manifest_path": manifest_path,
+        "database_size": database_size,
+        "compressed_size": os.path.getsize(backup_path),
+        "files": len(entries),
+        "missing_files": sum(1 for entry in entries if entry.get("missing"))
+    }
+
+
+def list_backups(backup_dir):
+    """
+    Backups in a directory, newest first
+
+    Args:
+        backup_dir: Backup directory
+
+    Returns:
+        List of backup file paths
+    """
+    if not os.path.isdir(backup_dir):
+        return []
+    backups = [
+        entry.path for entry in os.scandir(backup_dir)
+        if entry.is_file() and entry.name.startswith(BACKUP_PREFIX) and entry.name.endswith(BACKUP_EXTENSIONS)
+    ]
+    # The timestamp in the name sorts chronologically
+    return sorted(backups, key=os.path.basename, reverse=True)
+
+
+def _backup_stem(path):
+    for extension in BACKUP_EXTENSIONS:
+        if path.endswith(extension):
+            return path[:-len(extension)]
+    return path
+
+
+def rotate_backups(backup_dir, keep):
+    """
+    Delete all but the newest backups, with their manifests
+
+    Args:
+        backup_dir: Backup directory
+        keep: Number of backups to keep (0 keeps all)
+
+    Returns:
+        List of deleted backup paths
+    """
+    if keep <= 0:
+        return []
+    removed = []
+    for path in list_backups(backup_dir)[keep:]:
+        os.remove(path)
+        manifest_path = _backup_stem(path) + MANIFEST_SUFFIX
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        removed.append(path)
+    return removed
+
+
+def verify_backup(backup_path):
+    """
+    Check that a backup can be restored
+
+    The backup is decompressed to a temporary file and integrity-checked. If it
+    has a manifest, its hash is compared with the manifest, and every file the
+    manifest lists must still exist with the same content. Files that were
+    already missing when the backup was taken cannot be restored either, so
+    they are reported as problems too.
+
+    Args:
+        backup_path: Backup file
+
+    Returns:
+        Dictionary with ok, the list of problems found, the number of files
+        checked and the number missing from the backup
+    """
+    problems = []
+    manifest_path = _backup_stem(backup_path) + MANIFEST_SUFFIX
+    manifest = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    restored_path = _backup_stem(backup_path) + ".verify.tmp"
+    try:
+        with _open_compressed(backup_path, "rb") as src, open(restored_path, "wb") as dst:
+            _, database_sha256 = _copy_stream(src, dst)
+        if manifest and manifest["database"]["sha256"] != database_sha256:
+            problems.append("database does not match the hash in the manifest")
+        conn = sqlite3.connect(restored_path)
+        try:
+            check = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            conn.close()
+        if check != "ok":
+            problems.append(f"integrity check failed: {check}")
+    finally:
+        if os.path.exists(restored_path):
+            os.remove(restored_path)
+
+    entries = manifest["files"] if manifest else []
+    files_checked = 0
+    missing_at_backup = 0
+    for entry in entries:
+        path = entry["path"]
+        if entry.get("missing"):
+            missing_at_backup += 1
+            problems.append(f"{entry['kind']} file was already missing when the backup was taken: {path}")
+            continue
+        files_checked += 1
+        if not os.path.isfile(path):
+            problems.append(f"{entry['kind']} file missing: {path}")
+        elif file_sha256(path) != entry["sha256"]:
+            problems.append(f"{entry['kind']} file changed: {path}")
+
+    return {
+        "ok": not problems,
+        "problems": problems,
+        "files_checked": files_checked,
+        "missing_at_backup": missing_at_backup,
+        "has_manifest": manifest is not None
+    }
@@ -0,0 +1,97 @@
+"""
+Compression for large text stored in the database.
+
+Values are stored as a one-byte codec marker followed by the payload, so rows
+written with zstd, with zlib (when the zstandard package is not installed) or
+uncompressed (short values that do not shrink) can all be read back by any
+installation that has the codec.
+
+This module only depends on the standard library (and optionally zstandard) so
+migrations can use it without loading the ORM models.
+"""
+
+import zlib
+import threading
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CODEC_RAW = b"r"
+CODEC_ZLIB = b"d"
+CODEC_ZSTD = b"z"
+
+ZSTD_LEVEL = 6
+ZLIB_LEVEL = 6
+
+# Values shorter than this are stored uncompressed
+MIN_COMPRESS_BYTES = 128
+
+# zstd contexts are not thread-safe, so keep one pair per thread
+_local = threading.local()
+
+
+def _zstd_compressor():
+    if not hasattr(_local, "compressor"):
+        _local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return _local.compressor
+
+
+def _zstd_decompressor():
+    if not hasattr(_local, "decompressor"):
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor
+
+
+def compress_text(text):
+    """
+    Compress text for storage
+
+    Args:
+        text: String to compress, or None
+
+    Returns:
+        Codec marker and payload as bytes, or None for None
+    """
+    if text is None:
+        return None
+    data = text.encode("utf-8")
+    if len(data) >= MIN_COMPRESS_BYTES:
+        if ZSTD_AVAILABLE:
+            compressed = CODEC_ZSTD + _zstd_compressor().compress(data)
+        else:
+            compressed = CODEC_ZLIB + zlib.compress(data, ZLIB_LEVEL)
+        if len(compressed) < len(data) + 1:
+            return compressed
+    return CODEC_RAW + data
+
+
+def decompress_text(value):
+    """
+    Read text stored by compress_text
+
+    Args:
+        value: Stored bytes, or None
+
+    Returns:
+        The original string, or None for None
+
+    Raises:
+        RuntimeError: If the value was written with zstd and zstandard is not installed
+        ValueError: If the codec marker is unknown
+    """
+    if value is None:
+        return None
+    value = bytes(value)
+    codec, payload = value[:1], value[1:]
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Content was compressed with zstd - install the zstandard package to read it")
+        return _zstd_decompressor().decompress(payload).decode("utf-8")
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == CODEC_RAW:
+        return payload.decode("utf-8")
+    raise ValueError(f"Unknown content codec: {codec!r}")
@@ -1,10 +1,21 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import LargeBinary, TypeDecorator, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import Session, sessionmaker, relationship, deferred, with_loader_criteria
 import datetime
 import os
 import shutil
 from ..core.config import settings
+from .migrations import (
+    MIGRATIONS, run_migrations, pending_migrations, latest_version, applied_migrations,
+    acquire_migration_lock, run_postgres_migrations, postgres_version, applied_postgres_migrations
+)
+from .compression import compress_text, decompress_text
+from .fulltext import FTS_AVAILABLE, meeting_fulltext_values, index_meeting, unindex_meeting
 
 # Check if database exists in old location and migrate if needed
 def migrate_database_if_needed():
@@ -37,20 +48,112 @@ def migrate_database_if_needed():
 # Try to migrate the database if needed
 migrate_database_if_needed()
 
-# Create SQLite database engine with path in data directory
+# Database URL - SQLite in the data directory unless DATABASE_URL is set
 DB_FILE = os.path.join(settings.DATA_DIR, "meetings.db")
-DATABASE_URL = f"sqlite:///{DB_FILE}"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+DATABASE_URL = make_url(settings.DATABASE_URL or f"sqlite:///{DB_FILE}")
+IS_SQLITE = DATABASE_URL.get_backend_name() == "sqlite"
+if IS_SQLITE:
+    DB_FILE = DATABASE_URL.database
+elif DATABASE_URL.get_backend_name() != "postgresql":
+    raise RuntimeError(f"Unsupported DATABASE_URL backend: {DATABASE_URL.get_backend_name()} (use sqlite or postgresql)")
 
-# Create sessionmaker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Drivers of the async engine, by sync driver
+ASYNC_DRIVERS = {
+    "pysqlite": "aiosqlite",
+    "aiosqlite": "aiosqlite",
+    "psycopg2": "asyncpg",
+    "asyncpg": "asyncpg",
+    "psycopg": "psycopg_async",
+    "psycopg_async": "psycopg_async",
+}
+
+def _async_url(url):
+    driver = ASYNC_DRIVERS.get(url.get_driver_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver for {url.drivername} - use psycopg2, asyncpg or psycopg")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}")
+
+def _engine_options(is_async):
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if IS_SQLITE:
+        if is_async:
+            # aiosqlite defaults to a new connection (and thread) per checkout
+            options["poolclass"] = AsyncAdaptedQueuePool
+        else:
+            options["connect_args"] = {"check_same_thread": False}
+        return options
+    
+    # Connections dropped by the server or a proxy are replaced instead of failing a request
+    options.update(pool_pre_ping=True, pool_recycle=settings.DB_POOL_RECYCLE)
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        # Set at connection startup, so a rolled back transaction cannot undo it
+        timeout = str(int(settings.DB_STATEMENT_TIMEOUT_MS))
+        if is_async and _async_url(DATABASE_URL).get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    # Pragmas are per connection (journal_mode is stored in the file, the others are not)
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+# Create the engines - sync for the threadpool endpoints and background work, async for async endpoints
+engine = create_engine(DATABASE_URL, **_engine_options(is_async=False))
+async_engine = create_async_engine(_async_url(DATABASE_URL), **_engine_options(is_async=True))
+if IS_SQLITE:
+    event.listen(engine, "connect", _configure_sqlite_connection)
+    event.listen(async_engine.sync_engine, "connect", _configure_sqlite_connection)
+
+# Session class of both sessionmakers, so the flush hooks below apply to sync and async sessions
+class MeetingSession(Session):
+    pass
+
+# Create sessionmakers
+SessionLocal = sessionmaker(class_=MeetingSession, autocommit=False, autoflush=False, bind=engine)
+# Objects stay readable after commit - an async session cannot lazily reload expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, sync_session_class=MeetingSession, autoflush=False, expire_on_commit=False
+)
 
 # Create base class for models
 Base = declarative_base()
 
+# Characters of the summary kept inline in meetings, for meeting lists
+SUMMARY_EXCERPT_CHARS = 200
+
+# Text column stored compressed (see compression.py)
+class CompressedText(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return compress_text(value)
+    
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
+def _content_proxy(field):
+    # meeting.<field> reads and writes the field on the meeting's content row, creating it on first write
+    return association_proxy("content", field, creator=lambda value: MeetingContent(**{field: value}))
+
 # Define Meeting model
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        Index("ix_meetings_date_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -58,79 +161,297 @@ class Meeting(Base):
     timezone = Column(String, default="UTC")  # Store timezone information
     audio_path = Column(String)
     audio_info = Column(Text, nullable=True)  # JSON string with audio file information
-    transcription = Column(Text, nullable=True)
-    translation = Column(Text, nullable=True)
-    summary = Column(Text, nullable=True)
     action_items = Column(Text, nullable=True)
     language = Column(String, default="en")
     detected_language = Column(String, nullable=True)  # Human-readable detected language
     audio_duration = Column(String, nullable=True)  # Duration of the audio file
+    status = Column(String, default="processing")  # 'processing', 'completed' or 'failed'
+    summary_excerpt = Column(String, nullable=True)  # Start of the summary, kept in sync on flush
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)  # Set on flush when the meeting or its text changes
+    content_version = Column(Integer, nullable=False, default=1)  # Incremented with updated_at; identifies the representation in ETags
+    deleted_at = Column(DateTime, nullable=True, index=True)  # Set by delete; the garbage collector removes the files and the row
+    
+    # Large text lives compressed in meeting_contents and is only loaded when read
+    content = relationship("MeetingContent", back_populates="meeting", uselist=False, cascade="all, delete-orphan")
+    transcription = _content_proxy("transcription")
+    translation = _content_proxy("translation")
+    summary = _content_proxy("summary")
+    utterances = _content_proxy("utterances")  # JSON list of utterances with start/end timestamps (ms)
     
     # Define relationship with PDFs
     pdfs = relationship("PDF", back_populates="meeting", cascade="all, delete-orphan")
+    
+    # Define relationship with stored translations
+    translations = relationship("Translation", back_populates="meeting", cascade="all, delete-orphan")
+
+# Define meeting content model - the large text of a meeting, compressed.
+# Every column is deferred, so reading one field does not load or decompress the others.
+class MeetingContent(Base):
+    __tablename__ = "meeting_contents"
+    
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), primary_key=True)
+    transcription = deferred(Column(CompressedText, nullable=True))
+    translation = deferred(Column(CompressedText, nullable=True))
+    summary = deferred(Column(CompressedText, nullable=True))
+    utterances = deferred(Column(CompressedText, nullable=True))
+    
+    # Define relationship with Meeting
+    meeting = relationship("Meeting", back_populates="content")
 
 # Define PDF model for storing generated PDF files
 class PDF(Base):
     __tablename__ = "pdfs"
+    __table_args__ = (
+        Index("ix_pdfs_meeting_id_pdf_type", "meeting_id", "pdf_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"))
     file_path = Column(String)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     pdf_type = Column(String)  # 'transcription', 'translation', 'summary', etc.
+    content_hash = Column(String, nullable=True)  # Hash of the template version and inputs the file was rendered from
     
     # Define relationship with Meeting
     meeting = relationship("Meeting", back_populates="pdfs")
 
-# Function to check and add missing columns to the database
-def update_database_schema():
-    import sqlite3
+# Define translation model - one row per (meeting, target language, translated field)
+class Translation(Base):
+    __tablename__ = "translations"
+    __table_args__ = (
+        UniqueConstraint("meeting_id", "target_lang", "field", name="uq_translations_meeting_lang_field"),
+    )
     
-    try:
-        print("Checking database schema for updates...")
-        
-        # Connect to SQLite database
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        
-        # Get current columns in the meetings table
-        cursor.execute("PRAGMA table_info(meetings)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        # Check if required columns exist and add them if they don't
-        if "audio_info" not in columns:
-            print("Adding missing 'audio_info' column to meetings table...")
-            cursor.execute("ALTER TABLE meetings ADD COLUMN audio_info TEXT")
-            conn.commit()
-        
-        if "detected_language" not in columns:
-            print("Adding missing 'detected_language' column to meetings table...")
-            cursor.execute("ALTER TABLE meetings ADD COLUMN detected_language TEXT")
-            conn.commit()
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), index=True)
+    target_lang = Column(String)
+    field = Column(String)  # 'transcription', 'summary' or 'action_items'
+    content = Column(Text)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    
+    # Define relationship with Meeting
+    meeting = relationship("Meeting", back_populates="translations")
+
+# Define search segment model - one row per embedded transcript chunk.
+# The primary key is the row of the segment's vector in the semantic search index.
+class SearchSegment(Base):
+    __tablename__ = "search_segments"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), index=True)
+    segment_index = Column(Integer)
+    speaker = Column(String, nullable=True)
+    start_ms = Column(Integer, nullable=True)
+    end_ms = Column(Integer, nullable=True)
+    text = Column(Text)
+
+# Define translation memory model - translated segments reused across meetings
+class TranslationMemory(Base):
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        UniqueConstraint("segment_hash", "source_lang", "target_lang", name="uq_translation_memory_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    segment_hash = Column(String(64))  # SHA-256 of the normalized source segment
+    source_lang = Column(String)
+    target_lang = Column(String)
+    translated_text = Column(Text)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+# Define translation job model - the state of background translation jobs, readable by every API process
+class TranslationJobRecord(Base):
+    __tablename__ = "translation_jobs"
+
+    id = Column(String(32), primary_key=True)
+    meeting_id = Column(Integer, index=True)  # No foreign key - finished jobs outlive purged meetings until pruned
+    status = Column(String)  # 'queued', 'running', 'completed' or 'failed'
+    target_languages = Column(Text)  # JSON list of language codes
+    fields = Column(Text)  # JSON list of translated fields
+    progress = Column(Text)  # JSON object: target language -> field -> status
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)  # Heartbeat of the process running the job
+    finished_at = Column(DateTime, nullable=True)
+
+# Attributes that feed the full-text index
+FULLTEXT_MEETING_ATTRIBUTES = ("title", "action_items")
+FULLTEXT_CONTENT_ATTRIBUTES = ("transcription", "summary", "translation")
+
+def _changed(obj, attributes):
+    # Unloaded deferred attributes have no history, so this never loads anything
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+# The FTS5 index only exists in SQLite databases
+FULLTEXT_ENABLED = FTS_AVAILABLE and IS_SQLITE
+
+class _DriverConnection:
+    # sqlite3-style execute() on the session's connection for the fulltext helpers,
+    # for the sync and the async (aiosqlite) driver alike
+    def __init__(self, connection):
+        self.connection = connection
+    
+    def execute(self, sql, parameters=()):
+        return self.connection.exec_driver_sql(sql, tuple(parameters))
+
+def _raw_connection(session):
+    return _DriverConnection(session.connection())
+
+def _touch_changed_meetings(session):
+    # A new version of a meeting is any change to it, its text or its stored translations
+    touched = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Meeting):
+            if obj not in session.new and obj not in session.deleted and session.is_modified(obj, include_collections=False):
+                touched.add(obj)
+        elif isinstance(obj, MeetingContent):
+            if obj in session.new or obj in session.deleted or session.is_modified(obj, include_collections=False):
+                touched.add(obj.meeting)
+        elif isinstance(obj, Translation):
+            if obj in session.new or obj in session.deleted or session.is_modified(obj, include_collections=False):
+                touched.add(session.get(Meeting, obj.meeting_id))
+    
+    now = datetime.datetime.utcnow()
+    for meeting in touched:
+        if meeting is not None and meeting.id is not None and meeting not in session.deleted:
+            meeting.updated_at = now
+            meeting.content_version = (meeting.content_version or 0) + 1
+
+@event.listens_for(MeetingSession, "before_flush")
+def _before_flush(session, flush_context, instances):
+    # Left over only if an earlier flush failed, and then rolled back with it
+    session.info.pop("fulltext_pending", None)
+    
+    # Keep the summary excerpt in step with the summary
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, MeetingContent) and obj.meeting is not None and _changed(obj, ("summary",)):
+            summary = obj.summary
+            obj.meeting.summary_excerpt = summary[:SUMMARY_EXCERPT_CHARS] if summary else None
+    
+    _touch_changed_meetings(session)
+    
+    if not FULLTEXT_ENABLED:
+        return
+    
+    # A contentless index removes a row only given the values it was indexed with,
+    # so take those out of the database before the flush overwrites them
+    stale = set()
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Meeting) and (obj in session.deleted or _changed(obj, FULLTEXT_MEETING_ATTRIBUTES)):
+            stale.add(obj.id)
+        elif isinstance(obj, MeetingContent) and (obj in session.deleted or _changed(obj, FULLTEXT_CONTENT_ATTRIBUTES)):
+            stale.add(obj.meeting_id)
+    for obj in session.new:
+        # New content for a meeting that is already indexed
+        if isinstance(obj, MeetingContent) and obj.meeting is not None and obj.meeting.id is not None:
+            stale.add(obj.meeting.id)
+    
+    stale.discard(None)
+    if not stale:
+        return
+    conn = _raw_connection(session)
+    for meeting_id in stale:
+        values = meeting_fulltext_values(conn, meeting_id)
+        if values is not None:
+            unindex_meeting(conn, meeting_id, values)
+    session.info.setdefault("fulltext_pending", set()).update(stale)
+
+@event.listens_for(MeetingSession, "after_flush")
+def _after_flush(session, flush_context):
+    if not FULLTEXT_ENABLED:
+        return
+    pending = session.info.pop("fulltext_pending", set())
+    pending.update(obj.id for obj in session.new if isinstance(obj, Meeting))
+    if not pending:
+        return
+    # Index the flushed values; deleted meetings are gone and stay out of the index
+    conn = _raw_connection(session)
+    for meeting_id in pending:
+        values = meeting_fulltext_values(conn, meeting_id)
+        if values is not None:
+            index_meeting(conn, meeting_id, values)
+
+@event.listens_for(MeetingSession, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("fulltext_pending", None)
+
+@event.listens_for(MeetingSession, "do_orm_execute")
+def _exclude_deleted_meetings(execute_state):
+    # Deleted meetings are invisible to every ORM query, unless it sets include_deleted=True
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(Meeting, Meeting.deleted_at.is_(None), include_aliases=True)
+        )
+
+def init_database(migrate=True):
+    """
+    Create missing tables and bring the schema up to date
+    
+    A new, empty database is always created at the latest version, since
+    there is nothing to migrate yet.
+    
+    Args:
+        migrate: Apply pending migrations; if False, only check that none are pending
         
-        if "audio_duration" not in columns:
-            print("Adding missing 'audio_duration' column to meetings table...")
-            cursor.execute("ALTER TABLE meetings ADD COLUMN audio_duration TEXT")
-            conn.commit()
-            
-        if "timezone" not in columns:
-            print("Adding missing 'timezone' column to meetings table...")
-            cursor.execute("ALTER TABLE meetings ADD COLUMN timezone TEXT DEFAULT 'UTC'")
-            conn.commit()
+    Returns:
+        List of (version, name, seconds) tuples for the migrations applied
         
-        print("Database schema updates completed.")
+    Raises:
+        RuntimeError: If migrate is False and the schema is out of date
+    """
+    import sqlite3
+    
+    if not IS_SQLITE:
+        # One transaction under the schema lock, so API nodes starting together do not race
+        with engine.begin() as conn:
+            acquire_migration_lock(conn)
+            new_database = not inspect(conn).has_table(Meeting.__tablename__)
+            Base.metadata.create_all(bind=conn)
+            if migrate or new_database:
+                return run_postgres_migrations(conn)
+            pending = [v for v, _, _, _ in MIGRATIONS if v > postgres_version(conn)]
+    else:
+        new_database = not inspect(engine).has_table(Meeting.__tablename__)
+        Base.metadata.create_all(bind=engine)
         
-        # Close connection
-        conn.close()
+        if migrate or new_database:
+            return run_migrations(DB_FILE)
         
-    except Exception as e:
-        print(f"Error updating database schema: {e}")
-
-# Create all tables
-Base.metadata.create_all(bind=engine)
+        conn = sqlite3.connect(DB_FILE)
+        try:
+            pending = pending_migrations(conn)
+        finally:
+            conn.close()
+    if pending:
+        raise RuntimeError(
+            f"Database schema is out of date ({len(pending)} pending migrations, latest is "
+            f"{latest_version()}) - run 'python db_utils.py --migrate'"
+        )
+    return []
 
-# Update database schema if needed
-update_database_schema()
+def migration_history():
+    """
+    Migrations applied to the database
+    
+    Returns:
+        List of (version, name, applied_at, duration_ms, size_before, size_after) tuples
+    """
+    import sqlite3
+    
+    if not IS_SQLITE:
+        with engine.connect() as conn:
+            return applied_postgres_migrations(conn)
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        return applied_migrations(conn)
+    finally:
+        conn.close()
 
 # Database dependency
 def get_db():
@@ -138,4 +459,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Async database dependency - for async endpoints, which must not block the event loop on queries
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,289 @@
+"""
+SQLite FTS5 full-text index over meeting text.
+
+The transcript, summary and translation are stored compressed in the
+meeting_contents table, which FTS5 cannot read, so the index is a contentless
+FTS5 table: it holds only the inverted index, not a copy of the text. Rows are
+added and removed with the plain-text values by the ORM flush hooks in
+database.py (and by rebuild_fulltext_index), and snippets are cut from the
+text in Python.
+
+This module only depends on sqlite3 so db_utils.py can use it without loading
+the ORM models.
+"""
+
+import re
+import html
+import sqlite3
+import unicodedata
+
+from .compression import decompress_text
+
+FTS_TABLE = "meetings_fts"
+
+# Indexed columns, in FTS5 column order
+FTS_COLUMNS = ["title", "transcription", "summary", "action_items", "translation"]
+
+# BM25 weights per column - title and summary matches rank above transcript matches
+FTS_WEIGHTS = [10.0, 1.0, 3.0, 2.0, 1.0]
+
+# Columns searched for a snippet, best-weighted first
+SNIPPET_COLUMNS = ["title", "summary", "action_items", "transcription", "translation"]
+
+FTS_SCHEMA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {", ".join(FTS_COLUMNS)},
+        content='',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+"""
+
+# Sync triggers of the external-content index used before the text was compressed
+LEGACY_TRIGGERS = [f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"]
+
+VALUES_SQL = """
+    SELECT m.title, c.transcription, c.summary, m.action_items, c.translation
+    FROM meetings m
+    LEFT JOIN meeting_contents c ON c.meeting_id = m.id
+    WHERE m.id = ?
+"""
+
+SEARCH_SQL = f"""
+    SELECT m.id, m.title, m.date,
+           bm25({FTS_TABLE}, {", ".join(str(w) for w in FTS_WEIGHTS)}) AS rank
+    FROM {FTS_TABLE}
+    JOIN meetings m ON m.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH :query AND m.deleted_at IS NULL
+    ORDER BY rank
+    LIMIT :limit OFFSET :skip
+"""
+
+# Deleted meetings stay indexed until the garbage collector removes them, so both queries skip them
+COUNT_SQL = f"""
+    SELECT COUNT(*)
+    FROM {FTS_TABLE}
+    JOIN meetings m ON m.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH :query AND m.deleted_at IS NULL
+"""
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+QUERY_PART_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Suffixes stripped when matching snippet words, roughly what the porter stemmer folds together
+STEM_SUFFIXES = ("ingly", "edly", "ing", "ed", "es", "s", "ly")
+
+
+def fts5_available():
+    """Check whether the linked SQLite library was compiled with FTS5"""
+    try:
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(content)")
+        conn.close()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+FTS_AVAILABLE = fts5_available()
+
+
+def ensure_fulltext_index(conn):
+    """
+    Create the FTS5 table if it is missing
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+
+    Returns:
+        True if the table was created by this call (it is empty until rebuilt)
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone()
+    conn.execute(FTS_SCHEMA)
+    return not exists
+
+
+def meeting_fulltext_values(conn, meeting_id):
+    """
+    Plain-text values of a meeting in FTS column order
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+        meeting_id: Meeting ID
+
+    Returns:
+        List of values, or None if the meeting does not exist
+    """
+    row = conn.execute(VALUES_SQL, (meeting_id,)).fetchone()
+    if row is None:
+        return None
+    title, transcription, summary, action_items, translation = row
+    return [title, decompress_text(transcription), decompress_text(summary), action_items, decompress_text(translation)]
+
+
+def index_meeting(conn, meeting_id, values):
+    """
+    Add a meeting to the index
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+        meeting_id: Meeting ID
+        values: Values in FTS column order, from meeting_fulltext_values
+    """
+    conn.execute(
+        f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, {', '.join('?' * len(FTS_COLUMNS))})",
+        [meeting_id, *values]
+    )
+
+
+def unindex_meeting(conn, meeting_id, values):
+    """
+    Remove a meeting from the index
+
+    A contentless index can only remove a row given the exact values it was
+    indexed with, so read them with meeting_fulltext_values before changing
+    the meeting.
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+        meeting_id: Meeting ID
+        values: Values in FTS column order, as they were indexed
+    """
+    conn.execute(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {', '.join(FTS_COLUMNS)}) "
+        f"VALUES ('delete', ?, {', '.join('?' * len(FTS_COLUMNS))})",
+        [meeting_id, *values]
+    )
+
+
+def rebuild_fulltext_index(conn):
+    """
+    Rebuild the FTS5 index from the meetings and meeting_contents tables
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+    """
+    conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+    meeting_ids = [row[0] for row in conn.execute("SELECT id FROM meetings ORDER BY id")]
+    for meeting_id in meeting_ids:
+        index_meeting(conn, meeting_id, meeting_fulltext_values(conn, meeting_id))
+    conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def parse_query(text):
+    """
+    Split search input into phrases
+
+    Args:
+        text: User search input
+
+    Returns:
+        List of (terms, prefix) tuples; prefix is True for a trailing *
+    """
+    phrases = []
+    for phrase, word in QUERY_PART_PATTERN.findall(text or ""):
+        terms = TOKEN_PATTERN.findall(phrase if phrase else word)
+        if terms:
+            phrases.append((terms, word.endswith("*")))
+    return phrases
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 MATCH expression
+
+    Every word becomes a quoted term (so FTS5 operators in user input are inert)
+    and all terms must match. Double-quoted input is kept as a phrase and a
+    trailing * on a word is kept as a prefix search.
+
+    Args:
+        text: User search input
+
+    Returns:
+        MATCH expression, or an empty string if the input has no searchable terms
+    """
+    parts = []
+    for terms, prefix in parse_query(text):
+        expression = '"' + " ".join(terms) + '"'
+        if prefix:
+            expression += "*"
+        parts.append(expression)
+    return " ".join(parts)
+
+
+def _fold(word):
+    word = unicodedata.normalize("NFKD", word.casefold())
+    return "".join(c for c in word if not unicodedata.combining(c))
+
+
+def _stem(word):
+    for suffix in STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def make_snippet(texts, text_query, mark_open="<mark>", mark_close="</mark>", snippet_tokens=24):
+    """
+    Cut a highlighted snippet around the first match, like FTS5 snippet()
+
+    The snippet is an HTML fragment: the text is escaped and only the marks
+    are markup, so it is safe to render even though the text is user content.
+
+    Args:
+        texts: Iterable of candidate texts, best column first; it is consumed
+            only up to the first text with a match, so it may load lazily
+        text_query: User search input
+        mark_open: Markup inserted before each matching word
+        mark_close: Markup inserted after each matching word
+        snippet_tokens: Words in the snippet
+
+    Returns:
+        Escaped snippet string, or None if every text is empty
+    """
+    words = set()
+    prefixes = []
+    for terms, prefix in parse_query(text_query):
+        folded = [_fold(term) for term in terms]
+        words.update(_stem(term) for term in folded)
+        if prefix:
+            prefixes.append(folded[-1])
+
+    def is_match(token):
+        token = _fold(token)
+        return _stem(token) in words or any(token.startswith(p) for p in prefixes)
+
+    fallback = None
+    for text in texts:
+        if not text:
+            continue
+        tokens = list(TOKEN_PATTERN.finditer(text))
+        if fallback is None:
+            fallback = (text, tokens, 0)
+        hit = next((i for i, token in enumerate(tokens) if is_match(token.group())), None)
+        if hit is not None:
+            return _cut_snippet(text, tokens, max(0, hit - snippet_tokens // 4), snippet_tokens, is_match, mark_open, mark_close)
+
+    if fallback is None:
+        return None
+    text, tokens, start = fallback
+    return _cut_snippet(text, tokens, start, snippet_tokens, is_match, mark_open, mark_close)
+
+
+def _cut_snippet(text, tokens, start, count, is_match, mark_open, mark_close):
+    if not tokens:
+        return html.escape(text[:200])
+    window = tokens[start:start + count]
+    pieces = ["…"] if start > 0 else []
+    position = window[0].start()
+    for token in window:
+        pieces.append(html.escape(text[position:token.start()]))
+        if is_match(token.group()):
+            pieces.append(f"{mark_open}{html.escape(token.group())}{mark_close}")
+        else:
+            pieces.append(html.escape(token.group()))
+        position = token.end()
+    if start + count < len(tokens):
+        pieces.append("…")
+    return "".join(pieces)
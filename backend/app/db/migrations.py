@@ -0,0 +1,442 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+Tables are created from the ORM models; changes to existing databases (new
+columns, indexes, the full-text index) are numbered migrations applied in
+order and recorded in the schema_migrations table with the time each took.
+Migrations run from `python db_utils.py --migrate` or at server startup, not
+when the models are imported. The database size before and after each one is
+recorded too, so compacting migrations can be checked.
+
+Every migration is idempotent, so databases that were upgraded by the old
+import-time checks are brought under version control without errors.
+
+A PostgreSQL database is created from the ORM models at the current schema, so
+the migrations above never run there; a migration that changes existing
+tables also lists the PostgreSQL statements that make the same change, for
+databases created by an earlier version.
+
+This module only depends on sqlite3 (and SQLAlchemy Core for PostgreSQL) so
+db_utils.py can use it without loading the ORM models.
+"""
+
+import time
+import sqlite3
+import datetime
+
+from sqlalchemy import text
+
+from .compression import compress_text
+from .fulltext import FTS_AVAILABLE, FTS_TABLE, LEGACY_TRIGGERS, ensure_fulltext_index, rebuild_fulltext_index
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+# (version, name, function, vacuum) in order of application
+MIGRATIONS = []
+
+# Version -> statements applied to PostgreSQL databases
+POSTGRES_MIGRATIONS = {}
+
+# pg_advisory_xact_lock key that serializes schema changes across API nodes
+MIGRATION_LOCK_KEY = 7_305_122_401
+
+
+def migration(version, name, vacuum=False, postgres=()):
+    """
+    Register a function as the migration with the given version number
+
+    Args:
+        version: Migration number, higher than every registered one
+        name: Description shown when it is applied
+        vacuum: Run VACUUM afterwards to return freed pages to the file system
+        postgres: Idempotent SQL statements making the same change on PostgreSQL
+    """
+    def register(fn):
+        assert not MIGRATIONS or MIGRATIONS[-1][0] < version, "Migrations must be registered in version order"
+        MIGRATIONS.append((version, name, fn, vacuum))
+        POSTGRES_MIGRATIONS[version] = list(postgres)
+        return fn
+    return register
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _add_missing_columns(conn, table, columns):
+    existing = _columns(conn, table)
+    if not existing:
+        return
+    for column, definition in columns:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+@migration(1, "meeting and pdf columns added after the first release")
+def _legacy_columns(conn):
+    _add_missing_columns(conn, "meetings", [
+        ("audio_info", "TEXT"),
+        ("detected_language", "TEXT"),
+        ("audio_duration", "TEXT"),
+        ("timezone", "TEXT DEFAULT 'UTC'"),
+        ("utterances", "TEXT"),
+    ])
+    _add_missing_columns(conn, "pdfs", [
+        ("content_hash", "TEXT"),
+    ])
+
+
+@migration(2, "full-text search index")
+def _fulltext_index(conn):
+    if FTS_AVAILABLE:
+        ensure_fulltext_index(conn)
+    else:
+        print("Warning: SQLite was built without FTS5 - full-text search is disabled")
+
+
+@migration(3, "indexes for document lookups and date-ordered meeting lists")
+def _query_indexes(conn):
+    # get_meeting_pdf, the PDF cache and delete_meeting filter on (meeting_id, pdf_type);
+    # the rowid is part of every index, so "ORDER BY id DESC" is served by it too
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_pdfs_meeting_id_pdf_type ON pdfs (meeting_id, pdf_type)")
+    # Date ranges and (date, id) ordering in exports and meeting lists
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_meetings_date_id ON meetings (date, id)")
+    conn.execute("ANALYZE")
+
+
+@migration(4, "meeting processing status")
+def _meeting_status(conn):
+    _add_missing_columns(conn, "meetings", [
+        ("status", "TEXT DEFAULT 'processing'"),
+    ])
+    if "transcription" not in _columns(conn, "meetings"):
+        # Created after the text moved to meeting_contents (migration 5), so there are no rows to derive from
+        return
+    # Derive the status of existing meetings from what the pipeline stored
+    conn.execute("""
+        UPDATE meetings SET status = CASE
+            WHEN transcription IS NULL THEN 'processing'
+            WHEN transcription LIKE 'Transcription failed%' OR transcription LIKE 'Error processing%' THEN 'failed'
+            ELSE 'completed'
+        END
+        WHERE status IS NULL OR status = 'processing'
+    """)
+
+
+@migration(5, "compressed meeting_contents table for large text columns", vacuum=True)
+def _compressed_contents(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS meeting_contents (
+            meeting_id INTEGER NOT NULL PRIMARY KEY REFERENCES meetings (id),
+            transcription BLOB,
+            translation BLOB,
+            summary BLOB,
+            utterances BLOB
+        )
+    """)
+    _add_missing_columns(conn, "meetings", [
+        ("summary_excerpt", "TEXT"),
+    ])
+
+    # The external-content index reads the text columns, so it goes first
+    for trigger in LEGACY_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    columns = _columns(conn, "meetings")
+    legacy = [c for c in ("transcription", "translation", "summary", "utterances") if c in columns]
+    if legacy:
+        rows = conn.execute(f"SELECT id, {', '.join(legacy)} FROM meetings")
+        while True:
+            batch = rows.fetchmany(100)
+            if not batch:
+                break
+            conn.executemany(
+                f"INSERT OR REPLACE INTO meeting_contents (meeting_id, {', '.join(legacy)}) "
+                f"VALUES (?, {', '.join('?' * len(legacy))})",
+                [(row[0], *(compress_text(value) for value in row[1:])) for row in batch]
+            )
+        if "summary" in legacy:
+            conn.execute("UPDATE meetings SET summary_excerpt = substr(summary, 1, 200)")
+
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            for column in legacy:
+                conn.execute(f"ALTER TABLE meetings DROP COLUMN {column}")
+        else:
+            # No DROP COLUMN before SQLite 3.35 - empty the columns so VACUUM reclaims the space
+            conn.execute(f"UPDATE meetings SET {', '.join(c + ' = NULL' for c in legacy)}")
+
+    if FTS_AVAILABLE:
+        ensure_fulltext_index(conn)
+        rebuild_fulltext_index(conn)
+
+
+@migration(6, "meeting updated_at and content_version for conditional requests", postgres=[
+    "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP",
+    "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS content_version INTEGER NOT NULL DEFAULT 1",
+    "UPDATE meetings SET updated_at = date WHERE updated_at IS NULL",
+])
+def _meeting_versions(conn):
+    _add_missing_columns(conn, "meetings", [
+        ("updated_at", "DATETIME"),
+        ("content_version", "INTEGER NOT NULL DEFAULT 1"),
+    ])
+    # Existing meetings were last written around when they were processed
+    conn.execute("UPDATE meetings SET updated_at = date WHERE updated_at IS NULL")
+
+
+@migration(7, "soft-deleted meetings", postgres=[
+    "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP",
+    "CREATE INDEX IF NOT EXISTS ix_meetings_deleted_at ON meetings (deleted_at)",
+])
+def _soft_delete(conn):
+    _add_missing_columns(conn, "meetings", [
+        ("deleted_at", "DATETIME"),
+    ])
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_meetings_deleted_at ON meetings (deleted_at)")
+
+
+def _ensure_migrations_table(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL,
+            duration_ms REAL NOT NULL
+        )
+    """)
+    _add_missing_columns(conn, MIGRATIONS_TABLE, [
+        ("size_before", "INTEGER"),
+        ("size_after", "INTEGER"),
+    ])
+
+
+def database_size(conn):
+    """Size of the database file in bytes, from its page count"""
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+
+def latest_version():
+    """Version the code expects the database to be at"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def current_version(conn):
+    """
+    Version the database is at
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+
+    Returns:
+        Highest applied migration version, 0 if none
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (MIGRATIONS_TABLE,)
+    ).fetchone()
+    if not exists:
+        return 0
+    return conn.execute(f"SELECT COALESCE(MAX(version), 0) FROM {MIGRATIONS_TABLE}").fetchone()[0]
+
+
+def pending_migrations(conn):
+    """
+    Migrations not yet applied to the database
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+
+    Returns:
+        List of (version, name) tuples
+    """
+    version = current_version(conn)
+    return [(v, name) for v, name, _, _ in MIGRATIONS if v > version]
+
+
+def applied_migrations(conn):
+    """
+    Migrations recorded in the database
+
+    Args:
+        conn: sqlite3 connection to the meetings database
+
+    Returns:
+        List of (version, name, applied_at, duration_ms, size_before, size_after)
+        tuples; the sizes are None for migrations applied before they were recorded
+    """
+    if current_version(conn) == 0:
+        return []
+    columns = _columns(conn, MIGRATIONS_TABLE)
+    sizes = "size_before, size_after" if "size_before" in columns else "NULL, NULL"
+    return conn.execute(
+        f"SELECT version, name, applied_at, duration_ms, {sizes} FROM {MIGRATIONS_TABLE} ORDER BY version"
+    ).fetchall()
+
+
+def run_migrations(db_path, verbose=True):
+    """
+    Apply pending migrations in order
+
+    Each migration runs in its own write transaction together with its
+    schema_migrations row, so a failed migration leaves the database at the
+    previous version. Several processes starting at once are safe: the write
+    lock serializes them and a migration applied by another process is skipped.
+
+    Args:
+        db_path: Path to the SQLite database file
+        verbose: Print each migration and its duration
+
+    Returns:
+        List of (version, name, seconds) tuples for the migrations applied
+    """
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    applied = []
+    try:
+        _ensure_migrations_table(conn)
+        for version, name, fn, vacuum in MIGRATIONS:
+            if version <= current_version(conn):
+                continue
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have applied it while we waited for the lock
+                if version <= current_version(conn):
+                    conn.execute("ROLLBACK")
+                    continue
+                size_before = database_size(conn)
+                start = time.perf_counter()
+                fn(conn)
+                elapsed = time.perf_counter() - start
+                if not conn.in_transaction:
+                    # The migration committed its own work
+                    conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    f"INSERT INTO {MIGRATIONS_TABLE} (version, name, applied_at, duration_ms, size_before, size_after) "
+                    f"VALUES (?, ?, ?, ?, ?, ?)",
+                    (version, name, datetime.datetime.utcnow().isoformat(), elapsed * 1000, size_before, database_size(conn))
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+            if vacuum:
+                # VACUUM cannot run inside a transaction; it rewrites the file without the freed pages
+                start = time.perf_counter()
+                conn.execute("VACUUM")
+                elapsed += time.perf_counter() - start
+                conn.execute(
+                    f"UPDATE {MIGRATIONS_TABLE} SET size_after = ?, duration_ms = ? WHERE version = ?",
+                    (database_size(conn), elapsed * 1000, version)
+                )
+
+            applied.append((version, name, elapsed))
+            if verbose:
+                print(f"Applied migration {version:03d} ({name}) in {elapsed * 1000:.1f} ms")
+    finally:
+        conn.close()
+    return applied
+
+
+def acquire_migration_lock(conn):
+    """
+    Take the PostgreSQL schema lock until the end of the transaction
+
+    Args:
+        conn: SQLAlchemy connection in a transaction
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def _ensure_postgres_migrations_table(conn):
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL,
+            duration_ms DOUBLE PRECISION NOT NULL,
+            size_before BIGINT,
+            size_after BIGINT
+        )
+    """))
+
+
+def postgres_version(conn):
+    """
+    Version a PostgreSQL database is at
+
+    Args:
+        conn: SQLAlchemy connection to the database
+
+    Returns:
+        Highest applied migration version, 0 if none
+    """
+    exists = conn.execute(text("SELECT to_regclass(:table)"), {"table": MIGRATIONS_TABLE}).scalar()
+    if not exists:
+        return 0
+    return conn.execute(text(f"SELECT COALESCE(MAX(version), 0) FROM {MIGRATIONS_TABLE}")).scalar()
+
+
+def applied_postgres_migrations(conn):
+    """
+    Migrations recorded in a PostgreSQL database, like applied_migrations
+
+    Args:
+        conn: SQLAlchemy connection to the database
+    """
+    if postgres_version(conn) == 0:
+        return []
+    return [tuple(row) for row in conn.execute(text(
+        f"SELECT version, name, applied_at, duration_ms, size_before, size_after FROM {MIGRATIONS_TABLE} ORDER BY version"
+    ))]
+
+
+def run_postgres_migrations(conn, verbose=True):
+    """
+    Apply pending migrations to a PostgreSQL database
+
+    Runs in the caller's transaction after taking the schema lock, so API nodes
+    starting at once apply each migration exactly once. The tables must already
+    exist (created from the ORM models); migrations without PostgreSQL
+    statements are only recorded.
+
+    Args:
+        conn: SQLAlchemy connection in a transaction
+        verbose: Print each migration and its duration
+
+    Returns:
+        List of (version, name, seconds) tuples for the migrations applied
+    """
+    acquire_migration_lock(conn)
+    _ensure_postgres_migrations_table(conn)
+    version = postgres_version(conn)
+    applied = []
+    for v, name, _, _ in MIGRATIONS:
+        if v <= version:
+            continue
+        size_before = conn.execute(text("SELECT pg_database_size(current_database())")).scalar()
+        start = time.perf_counter()
+        for statement in POSTGRES_MIGRATIONS[v]:
+            conn.execute(text(statement))
+        elapsed = time.perf_counter() - start
+        conn.execute(
+            text(
+                f"INSERT INTO {MIGRATIONS_TABLE} (version, name, applied_at, duration_ms, size_before, size_after) "
+                f"VALUES (:version, :name, :applied_at, :duration_ms, :size_before, "
+                f"pg_database_size(current_database()))"
+            ),
+            {
+                "version": v,
+                "name": name,
+                "applied_at": datetime.datetime.utcnow().isoformat(),
+                "duration_ms": elapsed * 1000,
+                "size_before": size_before
+            }
+        )
+        applied.append((v, name, elapsed))
+        if verbose:
+            print(f"Applied migration {v:03d} ({name}) in {elapsed * 1000:.1f} ms")
+    return applied
@@ -0,0 +1,156 @@
+"""
+Reconciliation of the upload and document directories with the database.
+
+Files are found in both directions: files on disk that no meeting or PDF
+row references (orphans, left behind by interrupted deletes or uploads that
+never got a row), and rows that point at files that do not exist. The
+directories are walked with os.scandir and compared against a set of the
+referenced paths read from a streaming cursor, so the cost is linear in
+files plus rows, and only orphan candidates are stat()ed.
+
+This module only depends on the standard library so db_utils.py can use it
+without loading the ORM models.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Files younger than this are never orphans - an upload is written before its row is committed
+DEFAULT_MIN_AGE_HOURS = 1.0
+
+DEFAULT_DELETE_WORKERS = 16
+
+
+def normalize_path(path):
+    """Path in the form used for comparisons"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def scan_files(directory):
+    """
+    Walk a directory tree with os.scandir
+
+    Hidden files (such as .gitkeep) are skipped.
+
+    Args:
+        directory: Root directory
+
+    Yields:
+        os.DirEntry of every regular file
+    """
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+def referenced_rows(conn):
+    """
+    Files the database points at, streamed from the cursor
+
+    Rows of deleted meetings count too - their files are removed by the
+    garbage collector.
+
+    Args:
+        conn: sqlite3 connection to a meetings database
+
+    Yields:
+        (kind, owner ID, path) tuples; kind is "audio" (owner is the meeting) or "pdf" (owner is the PDF row)
+    """
+    for meeting_id, path in conn.execute("SELECT id, audio_path FROM meetings WHERE audio_path IS NOT NULL"):
+        yield "audio", meeting_id, path
+    for pdf_id, path in conn.execute("SELECT id, file_path FROM pdfs WHERE file_path IS NOT NULL"):
+        yield "pdf", pdf_id, path
+
+
+def reconcile(conn, directories, min_age_hours=DEFAULT_MIN_AGE_HOURS):
+    """
+    Compare the files in some directories with the paths the database references
+
+    Args:
+        conn: sqlite3 connection to a meetings database
+        directories: Directories the application writes files to
+        min_age_hours: Files modified more recently than this are not reported as orphans
+
+    Returns:
+        Dictionary with:
+            files_scanned: Number of files found
+            orphans: List of (path, size) of files no row references
+            recent: Number of unreferenced files skipped for being too new
+            dangling: List of (kind, owner ID, path) of rows whose file does not exist
+    """
+    referenced = {normalize_path(path) for _, _, path in referenced_rows(conn)}
+
+    cutoff = time.time() - min_age_hours * 3600
+    roots = [normalize_path(directory) for directory in directories if directory and os.path.isdir(directory)]
+    present = set()
+    orphans = []
+    recent = 0
+    files_scanned = 0
+    for root in roots:
+        for entry in scan_files(root):
+            files_scanned += 1
+            normalized = normalize_path(entry.path)
+            if normalized in referenced:
+                present.add(normalized)
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime > cutoff:
+                recent += 1
+            else:
+                orphans.append((entry.path, stat.st_size))
+
+    # Second pass over the rows: paths inside the scanned directories were either seen or not,
+    # others (moved data directories, paths from another host) need a lookup
+    prefixes = tuple(os.path.join(root, "") for root in roots)
+    dangling = []
+    for kind, owner_id, path in referenced_rows(conn):
+        normalized = normalize_path(path)
+        if normalized not in present and (normalized.startswith(prefixes) or not os.path.isfile(path)):
+            dangling.append((kind, owner_id, path))
+
+    return {"files_scanned": files_scanned, "orphans": orphans, "recent": recent, "dangling": dangling}
+
+
+def delete_files(paths, workers=DEFAULT_DELETE_WORKERS):
+    """
+    Delete files in parallel
+
+    Args:
+        paths: File paths
+        workers: Number of threads (removal on network storage is latency bound)
+
+    Returns:
+        Tuple of (number deleted, list of (path, error) for the ones that failed)
+    """
+    def remove(path):
+        try:
+            os.remove(path)
+            return None
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            return e
+
+    failed = []
+    deleted = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for path, error in zip(paths, executor.map(remove, paths)):
+            if error is None:
+                deleted += 1
+            else:
+                failed.append((path, error))
+    return deleted, failed
@@ -0,0 +1,70 @@
+from fastapi import FastAPI
+
+from .core.config import settings
+from .core.http_compression import CompressionMiddleware
+from .services.render_farm import render_farm_service
+from .services.pdf_cache import pdf_cache_service
+from .services.garbage_collector import garbage_collector_service
+from .services.audio_retention import audio_retention_service
+from .db.database import init_database, async_engine
+
+
+def register_lifecycle(app: FastAPI):
+    """
+    Add the shared middleware and the startup and shutdown hooks to an app
+
+    Both entrypoints (app/main.py and main.py) call this, so a hook or
+    middleware added here applies however the server is started.
+
+    Args:
+        app: FastAPI application
+    """
+    # Compress JSON and text responses
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+    # Create a new database, or refuse to start on an outdated schema (DB_AUTO_MIGRATE applies migrations)
+    @app.on_event("startup")
+    def migrate_database():
+        init_database(migrate=settings.DB_AUTO_MIGRATE)
+
+    # Close pooled async connections - aiosqlite keeps a thread per connection
+    @app.on_event("shutdown")
+    async def dispose_database():
+        await async_engine.dispose()
+
+    # Stop the document render workers with the server
+    @app.on_event("shutdown")
+    def shutdown_render_farm():
+        render_farm_service.shutdown()
+
+    # Track the size of PDF_DIR for eviction, rescanning it in the background
+    @app.on_event("startup")
+    def start_pdf_cache():
+        pdf_cache_service.start()
+
+    @app.on_event("shutdown")
+    def shutdown_pdf_cache():
+        pdf_cache_service.shutdown()
+
+    # Remove the files of deleted meetings in the background
+    @app.on_event("startup")
+    def start_garbage_collector():
+        garbage_collector_service.start()
+
+    @app.on_event("shutdown")
+    def shutdown_garbage_collector():
+        garbage_collector_service.shutdown()
+
+    # Transcode the recordings of old meetings (AUDIO_RETENTION_ENABLED)
+    @app.on_event("startup")
+    def start_audio_retention():
+        audio_retention_service.start()
+
+    @app.on_event("shutdown")
+    def shutdown_audio_retention():
+        audio_retention_service.shutdown()
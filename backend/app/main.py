@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api import meetings
+from fastapi.responses import ORJSONResponse
+from .api import meetings, search, exports
 from .core.config import settings
+from .lifecycle import register_lifecycle
 import uvicorn
 import os
 
@@ -13,6 +15,7 @@ os.makedirs(settings.PDF_DIR, exist_ok=True)
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -24,8 +27,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression, database setup and background services
+register_lifecycle(app)
+
 # Include routers
 app.include_router(meetings.router, prefix=settings.API_PREFIX)
+app.include_router(search.router, prefix=settings.API_PREFIX)
+app.include_router(exports.router, prefix=settings.API_PREFIX)
 
 # Root endpoint
 @app.get("/")
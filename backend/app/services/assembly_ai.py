@@ -1,8 +1,10 @@
 import os
+import asyncio
 import logging
-import time
 import assemblyai as aai
 from ..core.config import settings
+from .translation_memory import translation_memory_service, segment_hash, is_in_language
+from .translation_client import translation_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -17,6 +19,13 @@ except ImportError:
     PYDUB_AVAILABLE = False
     logger.warning("Pydub not available - will use file size estimation for audio duration")
 
+class TranslationFailed(Exception):
+    """Raised when some segments could not be translated; the others are in the translation memory"""
+    
+    def __init__(self, message, failed_segments=()):
+        super().__init__(message)
+        self.failed_segments = list(failed_segments)
+
 class AssemblyAIService:
     """Service for AssemblyAI for transcription and language processing"""
     
@@ -54,9 +63,26 @@ class AssemblyAIService:
         Returns:
             Transcription text
         """
+        return self.transcribe_audio_detailed(audio_file_path, language)["text"]
+    
+    def transcribe_audio_detailed(self, audio_file_path, language=None):
+        """
+        Transcribe audio and keep the utterance timestamps
+        
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code (en, zh, etc.) - if not provided, auto-detection is used
+            
+        Returns:
+            Dictionary with the formatted transcript text and a list of utterances
+            (speaker, text, start and end in milliseconds)
+        """
         if self.demo_mode:
             logger.info(f"Demo mode: Returning mock transcription for {audio_file_path}")
-            return "This is a demo transcription. The actual transcription would be generated from the audio file in production mode."
+            return {
+                "text": "This is a demo transcription. The actual transcription would be generated from the audio file in production mode.",
+                "utterances": []
+            }
 
         if not os.path.exists(audio_file_path):
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
@@ -93,13 +119,10 @@ class AssemblyAIService:
                 # Format transcript with speaker labels if available
                 if transcript.utterances:
                     # Format with speaker labels
-                    formatted_transcript = ""
-                    for utterance in transcript.utterances:
-                        formatted_transcript += f"{utterance.speaker}: {utterance.text}\n\n"
-                    return formatted_transcript.strip()
+                    return self.format_utterances(transcript.utterances)
                 else:
                     # Return plain text if no speaker labels
-                    return transcript.text
+                    return {"text": transcript.text, "utterances": []}
             else:
                 logger.error(f"Transcription failed with status: {transcript.status}")
                 raise Exception(f"Transcription failed with status: {transcript.status}")
@@ -108,6 +131,30 @@ class AssemblyAIService:
             logger.error(f"Error in transcribe_audio: {e}")
             raise
     
+    def format_utterances(self, utterances):
+        """
+        Format AssemblyAI utterances as a speaker-labelled transcript
+        
+        Args:
+            utterances: Utterances with speaker, text, start and end attributes
+            
+        Returns:
+            Dictionary with the formatted transcript text and a list of utterances
+            (speaker, text, start and end in milliseconds)
+        """
+        records = [
+            {
+                "speaker": utterance.speaker,
+                "text": utterance.text,
+                "start": utterance.start,
+                "end": utterance.end
+            }
+            for utterance in utterances
+        ]
+        # One join instead of growing the string per utterance, which is quadratic for long meetings
+        text = "\n\n".join(f"{record['speaker']}: {record['text']}" for record in records)
+        return {"text": text.strip(), "utterances": records}
+    
     def get_audio_info(self, audio_file_path):
         """
         Get information about the audio file, including language detection
@@ -197,145 +244,200 @@ class AssemblyAIService:
                 "file_path": audio_file_path
             }
     
-    def translate_text(self, text, source_lang="en", target_lang="zh"):
+    def segment_text(self, text, separator="\n\n"):
         """
-        Translate text using Google Translate
+        Split text into translation segments
         
         Args:
-            text: Text to translate
-            source_lang: Source language code
-            target_lang: Target language code
+            text: Text to split
+            separator: Segment separator (paragraphs by default, "\n" for line lists)
             
         Returns:
-            Translated text
+            List of non-empty segments
         """
-        if self.demo_mode:
-            logger.info(f"Demo mode: Returning mock translation from {source_lang} to {target_lang}")
-            
-            # For demo purposes, provide realistic translations for certain language pairs
-            if source_lang == "en" and target_lang == "zh":
-                # English to Chinese mock translation with realistic formatting
-                if len(text) > 500:
-                    # Just prepare a realistic looking translation demo for long text
-                    return "这是一个会议记录的中文翻译。\n\n约翰：早上好，感谢大家参加我们的产品规划会议。我想讨论即将到来的第三季度发布，确保我们在优先事项上达成一致。\n\n莎拉：谢谢，约翰。我已经为新的仪表盘功能准备了UI模型。设计团队已经完成了初始版本，但我们希望得到大家的反馈。\n\n亚历克斯：这些模型看起来很棒。不过我担心实施时间表，我们的工程团队已经在修复结账流程中报告的错误。\n\n约翰：这是一个有效的担忧，亚历克斯。让我们先优先修复错误，然后再转向新功能。莎拉，你能在会议后与大家分享模型吗？"
-                else:
-                    # Simply wrap the text with Chinese characters to simulate translation
-                    return f"[中文翻译] {text}"
-            
-            elif source_lang == "en" and target_lang == "es":
-                # English to Spanish mock translation
-                if len(text) > 500:
-                    return "Esta es una traducción de la transcripción de la reunión al español.\n\nJohn: Buenos días a todos. Gracias por unirse a nuestra reunión de planificación de productos hoy. Quería discutir el próximo lanzamiento del tercer trimestre y asegurarme de que todos estemos alineados en las prioridades."
-                else:
-                    return f"[Traducción al español] {text}"
-            
-            # Default for other language pairs
-            return f"[Demo translation to {target_lang}] {text}"
-
-        try:
-            import requests
-            import json
-            import re
-            import html
-            
-            # Use a different approach that's more reliable
-            # This method uses the Google Translate website directly
-            
-            logger.info(f"Translating text from {source_lang} to {target_lang} using Google Translate")
+        return [segment.strip() for segment in (text or "").split(separator) if segment.strip()]
+    
+    async def translate_segments_async(self, segments, source_lang="en", target_lang="zh", hashes=None, client=None,
+                                       on_segment=None):
+        """
+        Translate a list of segments, reusing the translation memory
+        
+        Segments found in the translation memory and segments that are already
+        in the target language are not sent upstream. The remaining unique
+        segments are packed into chunks and translated remotely.
+        
+        Args:
+            segments: List of text segments
+            source_lang: Source language code
+            target_lang: Target language code
+            hashes: Optional precomputed segment hashes, so callers translating
+                the same segments into several languages hash them only once
+            client: Optional httpx.AsyncClient (defaults to the shared client)
+            on_segment: Optional callback (index, translated segment) called as soon as
+                each segment's translation is known, in completion order
             
-            # Split text into smaller chunks if it's too long
-            # Google Translate has a limit on the length of text it can translate
-            max_chunk_size = 1000
-            chunks = []
+        Returns:
+            List of translated segments, in the same order
             
-            # If text is very large, split it into paragraphs
-            if len(text) > max_chunk_size:
-                paragraphs = text.split("\n\n")
-                current_chunk = ""
-                
-                for paragraph in paragraphs:
-                    if len(current_chunk) + len(paragraph) < max_chunk_size:
-                        current_chunk += paragraph + "\n\n"
-                    else:
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                        current_chunk = paragraph + "\n\n"
-                
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
+        Raises:
+            TranslationFailed: If some segments could not be translated; the ones
+                that were are stored in the translation memory and passed to on_segment
+        """
+        if source_lang != target_lang and not self.demo_mode:
+            return await self._translate_segments_with_memory(
+                segments, source_lang, target_lang, hashes, client, on_segment
+            )
+        
+        if source_lang == target_lang:
+            results = list(segments)
+        else:
+            results = [f"[Demo translation to {target_lang}] {segment}" for segment in segments]
+        if on_segment:
+            for i, result in enumerate(results):
+                on_segment(i, result)
+        return results
+    
+    async def _translate_segments_with_memory(self, segments, source_lang, target_lang, hashes, client, on_segment):
+        """Translate segments through the translation memory and the upstream client"""
+        loop = asyncio.get_running_loop()
+        if hashes is None:
+            hashes = [segment_hash(segment) for segment in segments]
+        cached = await loop.run_in_executor(
+            None, translation_memory_service.lookup, hashes, source_lang, target_lang
+        )
+        
+        results = [None] * len(segments)
+        pending = {}  # segment hash -> segment text, in first-seen order
+        positions = {}  # segment hash -> indexes of every copy of the segment
+        for i, (segment, h) in enumerate(zip(segments, hashes)):
+            if h in cached:
+                results[i] = cached[h]
+            elif is_in_language(segment, target_lang):
+                results[i] = segment
             else:
-                chunks = [text]
-            
-            translated_chunks = []
+                pending.setdefault(h, segment)
+                positions.setdefault(h, []).append(i)
+        
+        if on_segment:
+            for i, result in enumerate(results):
+                if result is not None:
+                    on_segment(i, result)
+        
+        logger.info(
+            f"Translation memory ({target_lang}): {len(segments)} segments, "
+            f"{len(segments) - sum(r is None for r in results)} reused, {len(pending)} to translate"
+        )
+        
+        pending_hashes = list(pending.keys())
+        
+        def on_translated(j, translation):
+            if on_segment:
+                for i in positions[pending_hashes[j]]:
+                    on_segment(i, translation)
+        
+        translated = await self._translate_missing(
+            list(pending.values()), source_lang, target_lang, client, on_translated
+        )
+        new_entries = {}
+        for h, translation in zip(pending.keys(), translated):
+            if translation is not None:
+                new_entries[h] = translation
+        await loop.run_in_executor(
+            None, translation_memory_service.store, new_entries, source_lang, target_lang
+        )
+        
+        failed = []
+        for i, h in enumerate(hashes):
+            if results[i] is None:
+                results[i] = new_entries.get(h)
+                if results[i] is None:
+                    failed.append(i)
+        if failed:
+            raise TranslationFailed(
+                f"{len(failed)} of {len(segments)} segments could not be translated to {target_lang}", failed
+            )
+        return results
+    
+    async def _translate_missing(self, segments, source_lang, target_lang, client=None, on_translated=None):
+        """
+        Translate segments upstream, packing them into chunks
+        
+        Chunks are sent concurrently over a pooled connection with adaptive
+        rate limiting and per-chunk retries (see TranslationClient).
+        
+        Args:
+            segments: List of segments to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            client: Optional httpx.AsyncClient (defaults to the shared client)
+            on_translated: Optional callback (index, translation) called as segments succeed
             
-            for i, chunk in enumerate(chunks):
-                try:
-                    # Endpoint for Google Translate
-                    url = "https://translate.googleapis.com/translate_a/single"
-                    
-                    # Parameters for the request
-                    params = {
-                        "client": "gtx",
-                        "sl": source_lang,
-                        "tl": target_lang,
-                        "dt": "t",
-                        "q": chunk
-                    }
-                    
-                    # Make the request
-                    response = requests.get(url, params=params, timeout=10)
-                    
-                    # Check for errors
-                    if response.status_code != 200:
-                        logger.error(f"Translation error: Google Translate returned status code {response.status_code}")
-                        translated_chunks.append(f"[Translation error for chunk {i+1}]")
-                        continue
-                    
-                    # Parse the response - it's a nested array structure
-                    try:
-                        data = response.json()
-                    except json.JSONDecodeError as json_err:
-                        logger.error(f"Error parsing translation JSON response: {json_err}")
-                        translated_chunks.append(f"[Translation parsing error for chunk {i+1}]")
-                        continue
-                    
-                    # Extract the translated text from the response
-                    # The response format is different from the other endpoint
-                    translated_text = ""
-                    if isinstance(data, list) and len(data) > 0 and isinstance(data[0], list):
-                        # Extract all translated parts and join them
-                        translated_parts = []
-                        for part in data[0]:
-                            if isinstance(part, list) and len(part) > 0:
-                                translated_parts.append(str(part[0]))
-                        
-                        translated_text = "".join(translated_parts)
-                    else:
-                        # Fallback if we can't parse the response
-                        translated_text = f"[Translation error: unexpected response format for chunk {i+1}]"
-                    
-                    translated_chunks.append(translated_text)
-                    
-                    # Add a delay between requests to avoid rate limiting
-                    if i < len(chunks) - 1:
-                        import time
-                        time.sleep(1)
-                
-                except Exception as chunk_error:
-                    logger.error(f"Error translating chunk {i+1}: {chunk_error}")
-                    translated_chunks.append(f"[Translation error for chunk {i+1}: {str(chunk_error)}]")
+        Returns:
+            List of translations (None for segments that failed), in the same order
+        """
+        if not segments:
+            return []
+        
+        chunks = self._pack_chunks(segments)
+        results = [None] * len(segments)
+        retry = []
+        
+        def on_chunk(c, translated_chunk):
+            if translated_chunk is None:
+                return
+            chunk = chunks[c]
+            parts = [part.strip() for part in translated_chunk.split("\n\n") if part.strip()]
+            if len(parts) == len(chunk):
+                for i, part in zip(chunk, parts):
+                    results[i] = part
+                    if on_translated:
+                        on_translated(i, part)
+            else:
+                # Paragraph breaks were not preserved - translate this chunk's segments one by one
+                retry.extend(chunk)
+        
+        await translation_client.translate_chunks([
+            "\n\n".join(segments[i] for i in chunk) for chunk in chunks
+        ], source_lang, target_lang, client=client, on_chunk=on_chunk)
+        
+        if retry:
+            logger.info(f"Re-translating {len(retry)} segments individually to keep segment boundaries")
+            retry.sort()
             
-            # Combine all translated chunks
-            full_translation = "\n\n".join(translated_chunks)
+            def on_retried(r, translation):
+                results[retry[r]] = translation
+                if on_translated and translation is not None:
+                    on_translated(retry[r], translation)
             
-            # Clean up any HTML entities that might be in the response
-            full_translation = html.unescape(full_translation)
+            await translation_client.translate_chunks(
+                [segments[i] for i in retry], source_lang, target_lang, client=client, on_chunk=on_retried
+            )
+        return results
+    
+    def _pack_chunks(self, segments, max_chunk_size=1000):
+        """
+        Group segment indexes into chunks below the upstream size limit
+        
+        Args:
+            segments: List of segments
+            max_chunk_size: Maximum characters per chunk (a longer segment gets its own chunk)
             
-            return full_translation
-                
-        except Exception as e:
-            logger.error(f"Error in translate_text: {e}")
-            return f"[Translation error: {str(e)}. Original text follows:]\n\n{text}"
+        Returns:
+            List of lists of segment indexes
+        """
+        chunks = []
+        current = []
+        current_size = 0
+        for i, segment in enumerate(segments):
+            if current and current_size + len(segment) >= max_chunk_size:
+                chunks.append(current)
+                current = []
+                current_size = 0
+            current.append(i)
+            current_size += len(segment) + 2
+        if current:
+            chunks.append(current)
+        return chunks
     
     def _map_language_code(self, language):
         """
@@ -0,0 +1,291 @@
+import os
+import json
+import uuid
+import shutil
+import logging
+import datetime
+import threading
+import subprocess
+
+from ..core.config import settings
+from ..db.database import SessionLocal, Meeting
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ffmpeg does the transcoding - it streams the file, so memory use does not grow with the recording
+FFMPEG_BINARY = shutil.which("ffmpeg")
+FFMPEG_AVAILABLE = FFMPEG_BINARY is not None
+
+# Extension of transcoded recordings, which are never transcoded again
+ARCHIVE_EXTENSION = ".opus"
+
+# Seconds one recording may take to transcode
+TRANSCODE_TIMEOUT = 3600
+
+
+def transcode_to_opus(source_path, output_path, bitrate):
+    """
+    Transcode an audio file to mono Opus in an Ogg container
+
+    Args:
+        source_path: Audio file in any format ffmpeg reads
+        output_path: File to write
+        bitrate: Target bitrate, e.g. "24k"
+
+    Raises:
+        RuntimeError: If ffmpeg is not installed or fails
+    """
+    if not FFMPEG_AVAILABLE:
+        raise RuntimeError("ffmpeg is not installed")
+    # Meetings are speech: one channel and the VoIP tuning keep voices clear at low bitrates
+    command = [
+        FFMPEG_BINARY, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+        "-i", source_path,
+        "-vn", "-ac", "1", "-c:a", "libopus", "-b:a", bitrate, "-application", "voip",
+        "-f", "ogg", output_path
+    ]
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=TRANSCODE_TIMEOUT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip() or f"ffmpeg exited with {result.returncode}")
+
+
+class AudioRetentionService:
+    """
+    Shrinks the recordings of old meetings
+
+    Uploads are only needed in full quality until they are transcribed. Once a
+    completed meeting is AUDIO_RETENTION_DAYS old its recording is transcoded
+    to low-bitrate Opus, written to AUDIO_ARCHIVE_DIR if one is set (a local
+    directory or a mounted object store), and the original is removed.
+
+    The new file is written under a temporary name and renamed into place, and
+    audio_path is switched through the ORM only while the meeting (locked for
+    the update where the database supports it) still points at the original
+    and is not deleted - so a meeting never points at a partial file, and a
+    meeting deleted or changed meanwhile keeps its original (the new file is
+    removed instead). Going through the session bumps the meeting's
+    content_version and invalidates its cached responses. The original is
+    removed only after the update is committed.
+    """
+
+    def __init__(self):
+        self.enabled = settings.AUDIO_RETENTION_ENABLED
+        self.retention_days = settings.AUDIO_RETENTION_DAYS
+        self.bitrate = settings.AUDIO_OPUS_BITRATE
+        self.archive_dir = settings.AUDIO_ARCHIVE_DIR
+        self.interval = settings.AUDIO_RETENTION_INTERVAL
+        self.batch_size = settings.AUDIO_RETENTION_BATCH_SIZE
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._skipped_ids = set()  # Meetings that failed or have no file, left alone until restart
+        self.totals = self._empty_report()
+
+    @staticmethod
+    def _empty_report():
+        return {"transcoded": 0, "failed": 0, "missing": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0, "bytes_reclaimed": 0}
+
+    def start(self):
+        """Start the background thread"""
+        if not self.enabled or self._thread is not None:
+            return
+        if not FFMPEG_AVAILABLE:
+            logger.warning("ffmpeg is not installed - audio retention is disabled")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audio-retention", daemon=True)
+        self._thread.start()
+        logger.info(f"Started audio retention (recordings older than {self.retention_days} days, every {self.interval}s)")
+
+    def shutdown(self):
+        """Stop the background thread after the recording in progress"""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout=10)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                report = self.apply(stop=self._stop)
+                busy = sum(report[key] for key in ("transcoded", "failed", "missing", "skipped")) >= self.batch_size
+            except Exception as e:
+                logger.error(f"Audio retention failed: {e}")
+                busy = False
+            if not busy:
+                self._stop.wait(self.interval)
+
+    def candidates(self, db, limit=None):
+        """
+        Meetings whose recording is due for transcoding, oldest first
+
+        Args:
+            db: Database session
+            limit: Maximum number of meetings (None or 0 = all)
+
+        Returns:
+            List of (id, audio_path, audio_info) rows
+        """
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=self.retention_days)
+        query = (
+            db.query(Meeting.id, Meeting.audio_path, Meeting.audio_info)
+            .filter(
+                Meeting.status == "completed",
+                Meeting.date < cutoff,
+                Meeting.audio_path.isnot(None),
+                Meeting.audio_path.notlike(f"%{ARCHIVE_EXTENSION}")
+            )
+            .order_by(Meeting.date, Meeting.id)
+        )
+        with self._lock:
+            skipped = list(self._skipped_ids)
+        if skipped:
+            query = query.filter(Meeting.id.notin_(skipped))
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def apply(self, limit=None, dry_run=False, stop=None):
+        """
+        Transcode one batch of recordings that are due
+
+        Args:
+            limit: Maximum number of meetings (default AUDIO_RETENTION_BATCH_SIZE, 0 = all that are due)
+            dry_run: Only report what would be transcoded and the current size
+            stop: Optional threading.Event that ends the batch early
+
+        Returns:
+            Report dictionary with meeting counts and bytes before, after and reclaimed
+        """
+        report = self._empty_report()
+        db = SessionLocal()
+        try:
+            rows = self.candidates(db, self.batch_size if limit is None else limit)
+        finally:
+            db.close()
+
+        for meeting_id, audio_path, audio_info in rows:
+            if stop is not None and stop.is_set():
+                break
+            if not os.path.exists(audio_path):
+                report["missing"] += 1
+                self._skip(meeting_id)
+                continue
+            if dry_run:
+                report["transcoded"] += 1
+                report["bytes_before"] += os.path.getsize(audio_path)
+                continue
+            try:
+                result = self._archive(meeting_id, audio_path, audio_info)
+            except Exception as e:
+                report["failed"] += 1
+                self._skip(meeting_id)
+                logger.warning(f"Failed to transcode the recording of meeting {meeting_id} ({audio_path}): {e}")
+                continue
+            if result is None:
+                report["skipped"] += 1
+                continue
+            before, after = result
+            report["transcoded"] += 1
+            report["bytes_before"] += before
+            report["bytes_after"] += after
+            # The new file only takes space from the upload directory if it stays there
+            report["bytes_reclaimed"] += before - (0 if self.archive_dir else after)
+
+        if not dry_run:
+            with self._lock:
+                for key, value in report.items():
+                    self.totals[key] += value
+        if report["transcoded"] or report["failed"]:
+            logger.info(
+                f"Audio retention{' (dry run)' if dry_run else ''}: {report['transcoded']} recordings, "
+                f"{report['failed']} failed, {report['bytes_reclaimed'] / (1024 * 1024):.1f} MB reclaimed"
+            )
+        return report
+
+    def _skip(self, meeting_id):
+        with self._lock:
+            self._skipped_ids.add(meeting_id)
+
+    def _archive(self, meeting_id, audio_path, audio_info):
+        # Returns (bytes before, bytes after), or None if the meeting changed while transcoding
+        target_dir = self.archive_dir or os.path.dirname(audio_path)
+        os.makedirs(target_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(audio_path))[0]
+        # Unique per attempt, so two nodes transcoding the same meeting never share a file
+        target_path = os.path.join(target_dir, f"{stem}-{uuid.uuid4().hex[:8]}{ARCHIVE_EXTENSION}")
+        partial_path = f"{target_path}.part"
+
+        before = os.path.getsize(audio_path)
+        try:
+            transcode_to_opus(audio_path, partial_path, self.bitrate)
+            after = os.path.getsize(partial_path)
+            if after == 0:
+                raise RuntimeError("ffmpeg produced an empty file")
+            os.replace(partial_path, target_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        try:
+            info = json.loads(audio_info) if audio_info else {}
+        except ValueError:
+            info = {}
+        info.update({
+            "audio_format": ARCHIVE_EXTENSION.lstrip(".").upper(),
+            "original_format": os.path.splitext(audio_path)[1].lstrip(".").upper(),
+            "original_size": before,
+            "archived_at": datetime.datetime.utcnow().isoformat()
+        })
+
+        db = SessionLocal()
+        try:
+            # Deleted meetings are not loaded at all
+            meeting = db.query(Meeting).filter(Meeting.id == meeting_id).with_for_update().first()
+            updated = meeting is not None and meeting.audio_path == audio_path
+            if updated:
+                meeting.audio_path = target_path
+                meeting.audio_info = json.dumps(info)
+            db.commit()
+        except BaseException:
+            db.rollback()
+            os.remove(target_path)
+            raise
+        finally:
+            db.close()
+
+        if not updated:
+            os.remove(target_path)
+            return None
+        try:
+            os.remove(audio_path)
+        except OSError as e:
+            logger.warning(f"Transcoded meeting {meeting_id} but could not remove the original {audio_path}: {e}")
+        return before, after
+
+    def stats(self):
+        """
+        Audio retention totals since the process started
+
+        Returns:
+            Dictionary with the policy and the totals
+        """
+        with self._lock:
+            totals = dict(self.totals)
+        return {
+            "enabled": self.enabled,
+            "running": self._thread is not None,
+            "ffmpeg_available": FFMPEG_AVAILABLE,
+            "retention_days": self.retention_days,
+            "bitrate": self.bitrate,
+            "archive_dir": self.archive_dir or None,
+            **totals
+        }
+
+
+# Create instance
+audio_retention_service = AudioRetentionService()
@@ -0,0 +1,315 @@
+import hashlib
+import datetime
+import itertools
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import quote
+
+from fastapi.responses import Response, StreamingResponse
+
+
+def _metadata(meeting, language_label="Detected language"):
+    yield f"\n=== METADATA ===\nMeeting: {meeting.title}\n"
+    if meeting.detected_language:
+        yield f"{language_label}: {meeting.detected_language}\n"
+    if meeting.audio_duration:
+        yield f"Duration: {meeting.audio_duration}\n"
+    if meeting.date:
+        yield f"Date: {meeting.date.strftime('%Y-%m-%d %H:%M:%S')}\n"
+
+
+def text_document(meeting, content_type, translation=None, lang=None):
+    """
+    Plain-text document of a meeting as a sequence of chunks
+
+    The large fields are yielded as-is rather than concatenated, so building a
+    document does not copy the transcript.
+
+    Args:
+        meeting: Meeting record
+        content_type: Document type (transcript, summary, report, translation)
+        translation: Translated transcript, for the translation document
+        lang: Target language of the translation, used in the filename
+
+    Returns:
+        (chunk iterator, download filename) tuple
+
+    Raises:
+        ValueError: If the type is unknown or the meeting lacks the fields it needs
+    """
+    if content_type == "transcript":
+        if not meeting.transcription:
+            raise ValueError("Meeting has no transcription")
+
+        def chunks():
+            yield f"=== TRANSCRIPT: {meeting.title} ===\n\n"
+            yield meeting.transcription
+            yield "\n"
+            yield from _metadata(meeting)
+
+        return chunks(), f"{meeting.title}_transcript.txt"
+
+    if content_type == "summary":
+        if not meeting.summary:
+            raise ValueError("Meeting has no summary")
+
+        def chunks():
+            yield f"=== SUMMARY: {meeting.title} ===\n\n"
+            yield f"SUMMARY:\n{meeting.summary}\n\n"
+            if meeting.action_items:
+                yield f"ACTION ITEMS:\n{meeting.action_items}\n"
+            yield from _metadata(meeting)
+
+        return chunks(), f"{meeting.title}_summary.txt"
+
+    if content_type == "report":
+        if not meeting.transcription or not meeting.summary:
+            raise ValueError("Meeting incomplete")
+
+        def chunks():
+            yield f"=== FULL REPORT: {meeting.title} ===\n\n"
+            yield f"SUMMARY:\n{meeting.summary}\n\n"
+            if meeting.action_items:
+                yield f"ACTION ITEMS:\n{meeting.action_items}\n\n"
+            yield "TRANSCRIPT:\n"
+            yield meeting.transcription
+            yield "\n"
+            yield from _metadata(meeting)
+
+        return chunks(), f"{meeting.title}_full_report.txt"
+
+    if content_type == "translation":
+        if not translation:
+            raise ValueError("Meeting has no translation")
+
+        def chunks():
+            yield f"=== TRANSLATION: {meeting.title} ===\n\n"
+            yield translation
+            yield "\n"
+            yield from _metadata(meeting, "Source language")
+
+        return chunks(), f"{meeting.title}_translation_{lang}.txt" if lang else f"{meeting.title}_translation.txt"
+
+    raise ValueError("Invalid content type")
+
+
+def fallback_text_document(meeting, pdf_type, error):
+    """
+    Plain-text stand-in served when a document cannot be rendered
+
+    Args:
+        meeting: Meeting record
+        pdf_type: Requested document type
+        error: The rendering error
+
+    Returns:
+        Chunk iterator
+    """
+    yield f"=== {pdf_type.upper()} FOR: {meeting.title} ===\n\n"
+    yield f"Error generating document: {str(error)}\n\n"
+    if pdf_type in ("summary", "report"):
+        yield "SUMMARY:\n"
+        yield meeting.summary or "No summary available"
+        yield "\n\nACTION ITEMS:\n"
+        yield meeting.action_items or "No action items available"
+    if pdf_type == "report":
+        yield "\n\n"
+    if pdf_type in ("transcript", "report"):
+        yield "TRANSCRIPT:\n"
+        yield meeting.transcription or "No transcription available"
+
+
+def content_disposition(filename):
+    """Content-Disposition header for a download, RFC 5987-encoded when not plain ASCII"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def etag_matches(request, etag):
+    """Whether the request's If-None-Match already names this representation"""
+    if_none_match = request.headers.get("if-none-match") if request is not None else None
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+# Bump when the format of meeting responses or text documents changes, so clients refetch them
+REPRESENTATION_VERSION = 1
+
+
+def meeting_etag(meeting_id, content_version, *variant):
+    """
+    ETag of a representation of a meeting, from its content version
+
+    Args:
+        meeting_id: Meeting ID
+        content_version: Meeting.content_version
+        *variant: Whatever else selects the representation (document type, language, ...)
+
+    Returns:
+        Quoted ETag, computed without reading the meeting's text
+    """
+    digest = hashlib.sha256(repr((REPRESENTATION_VERSION,) + variant).encode("utf-8")).hexdigest()[:12]
+    return f'"m{meeting_id}.v{content_version or 0}.{digest}"'
+
+
+def validator_headers(etag, last_modified=None):
+    """
+    Headers letting clients revalidate their copy instead of downloading it again
+
+    Args:
+        etag: Quoted ETag
+        last_modified: Naive UTC datetime of the last change, or None
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=datetime.timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Whether the client's copy is current
+
+    If-None-Match decides when present; If-Modified-Since is only used without it.
+
+    Args:
+        request: Request, or None
+        etag: Quoted ETag of the current representation
+        last_modified: Naive UTC datetime of the last change, its HTTP date, or None
+    """
+    if request is None:
+        return False
+    if request.headers.get("if-none-match"):
+        return etag_matches(request, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+        if isinstance(last_modified, str):
+            last_modified = parsedate_to_datetime(last_modified)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have whole seconds
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def _as_utc(value):
+    return value.replace(tzinfo=datetime.timezone.utc) if value.tzinfo is None else value
+
+
+def not_modified_response(etag, last_modified=None):
+    """304 response carrying the validators of the current representation"""
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+# Documents up to this many bytes are sent with a Content-Length; larger ones are sent chunked
+CONTENT_LENGTH_MAX_BYTES = 256 * 1024
+
+# Characters of a text chunk encoded at a time, so a long transcript is never copied whole
+ENCODE_SLICE_CHARS = 64 * 1024
+
+
+def _encoded(chunks):
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            for start in range(0, len(chunk), ENCODE_SLICE_CHARS):
+                yield chunk[start:start + ENCODE_SLICE_CHARS].encode("utf-8")
+        elif chunk:
+            yield chunk
+
+
+def stream_text_document(chunks, filename, request=None, media_type="text/plain", etag=None, last_modified=None):
+    """
+    Stream a document generated in memory
+
+    Chunks are encoded as they are sent. A document that fits in
+    CONTENT_LENGTH_MAX_BYTES is read ahead so the response carries an exact
+    Content-Length; a larger one is sent chunked after its first bytes, so the
+    body is never held in memory as a whole.
+
+    Args:
+        chunks: Iterator of str (UTF-8 encoded here) or bytes chunks
+        filename: Download filename
+        request: Optional request, for If-None-Match handling
+        media_type: Response media type
+        etag: Quoted ETag of the document, from metadata such as the meeting's
+            content version; without one the response has no validators
+        last_modified: Naive UTC datetime of the last change, or None
+
+    Returns:
+        StreamingResponse, or a 304 Response if the client's copy is current
+    """
+    if etag is not None and not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    body = _encoded(chunks)
+    head = []
+    length = 0
+    complete = True
+    for data in body:
+        head.append(data)
+        length += len(data)
+        if length > CONTENT_LENGTH_MAX_BYTES:
+            complete = False
+            break
+
+    headers = {"Content-Disposition": content_disposition(filename)}
+    if complete:
+        headers["Content-Length"] = str(length)
+    if etag is not None:
+        headers.update(validator_headers(etag, last_modified))
+
+    return StreamingResponse(
+        iter(head) if complete else itertools.chain(head, body),
+        media_type=media_type,
+        headers=headers
+    )
+
+
+def stream_buffer(buffer, filename, media_type, etag, request=None, chunk_size=64 * 1024, last_modified=None):
+    """
+    Stream a rendered document from an in-memory or spooled buffer
+
+    Args:
+        buffer: Binary file object (BytesIO or SpooledTemporaryFile); closed once sent
+        filename: Download filename
+        media_type: Response media type
+        etag: Quoted ETag of the content
+        request: Optional request, for If-None-Match handling
+        chunk_size: Bytes per chunk
+        last_modified: Naive UTC datetime of the last change, or None
+
+    Returns:
+        StreamingResponse, or a 304 Response if the client's copy is current
+    """
+    if not_modified(request, etag, last_modified):
+        buffer.close()
+        return not_modified_response(etag, last_modified)
+
+    buffer.seek(0, 2)
+    length = buffer.tell()
+    buffer.seek(0)
+
+    def chunks():
+        try:
+            while True:
+                data = buffer.read(chunk_size)
+                if not data:
+                    break
+                yield data
+        finally:
+            buffer.close()
+
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={
+            "Content-Length": str(length),
+            "Content-Disposition": content_disposition(filename),
+            **validator_headers(etag, last_modified)
+        }
+    )
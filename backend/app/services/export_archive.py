@@ -0,0 +1,260 @@
+import json
+import time
+import zipfile
+import logging
+import datetime
+from collections import deque
+from concurrent.futures import Future
+
+from ..core.config import settings
+from ..db.database import SessionLocal, Meeting
+from .pdf_cache import pdf_cache_service, PDF_TYPES, document_inputs
+from .pdf_generator import pdf_generator_service
+from .render_farm import render_farm_service, RenderQueueFull
+from .document_stream import text_document
+from .export_renderers import export_renderer_registry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Artifact formats and the document types each supports
+EXPORT_FORMATS = {
+    "pdf": PDF_TYPES,
+    "txt": ("transcript", "summary", "report", "translation"),
+}
+
+# Bytes read from a cached file per archive write
+COPY_CHUNK_SIZE = 256 * 1024
+
+
+def parse_artifacts(artifacts):
+    """
+    Parse artifact names such as "report", "report.pdf", "transcript.txt" or "html"
+
+    Args:
+        artifacts: List of artifact names; a missing extension means PDF, and
+            an export format name on its own (md, html, srt, ...) means the
+            whole meeting in that format
+
+    Returns:
+        List of (document type, format) tuples without duplicates
+
+    Raises:
+        ValueError: If an artifact is not supported
+    """
+    parsed = []
+    for artifact in artifacts:
+        doc_type, _, fmt = artifact.strip().lower().partition(".")
+        if not fmt and export_renderer_registry.get(doc_type):
+            # A bare export format name: the whole meeting in that format
+            doc_type, fmt = "meeting", doc_type
+        fmt = fmt or "pdf"
+        if doc_type == "meeting":
+            supported = export_renderer_registry.get(fmt) is not None
+        else:
+            supported = doc_type in EXPORT_FORMATS.get(fmt, ())
+        if not supported:
+            raise ValueError(f"Unsupported artifact: {artifact}")
+        if (doc_type, fmt) not in parsed:
+            parsed.append((doc_type, fmt))
+    if not parsed:
+        raise ValueError("No artifacts requested")
+    return parsed
+
+
+class _ArchiveStream:
+    """Write-only file object that hands ZipFile output back to the response in pieces"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    """Service for exporting many meetings as one streamed ZIP archive"""
+
+    def __init__(self):
+        self.max_meetings = settings.EXPORT_MAX_MEETINGS
+
+    def find_meetings(self, db, meeting_ids=None, date_from=None, date_to=None, title=None):
+        """
+        IDs of the meetings matching an export filter, oldest first
+
+        Args:
+            db: Database session
+            meeting_ids: Optional explicit meeting IDs
+            date_from: Optional inclusive lower bound on the meeting date
+            date_to: Optional exclusive upper bound on the meeting date
+            title: Optional case-insensitive title substring
+
+        Returns:
+            List of meeting IDs
+        """
+        query = db.query(Meeting.id)
+        if meeting_ids:
+            query = query.filter(Meeting.id.in_(meeting_ids))
+        if date_from:
+            query = query.filter(Meeting.date >= date_from)
+        if date_to:
+            query = query.filter(Meeting.date < date_to)
+        if title:
+            query = query.filter(Meeting.title.ilike(f"%{title}%"))
+        return [row.id for row in query.order_by(Meeting.date, Meeting.id).limit(self.max_meetings + 1)]
+
+    def stream_archive(self, meeting_ids, artifacts):
+        """
+        Generate a ZIP archive of the requested artifacts, piece by piece
+
+        PDF renders for several meetings are kept in flight on the render farm
+        while finished meetings are written out, so rendering runs in parallel
+        with streaming. Entries use zip64 data descriptors, so neither the
+        archive nor its size has to be known up front. A manifest listing every
+        entry and every skipped artifact is written last.
+
+        Args:
+            meeting_ids: Meeting IDs to export, in archive order
+            artifacts: List of (document type, format) tuples from parse_artifacts
+
+        Yields:
+            Bytes of the archive
+        """
+        stream = _ArchiveStream()
+        manifest = {"created_at": datetime.datetime.utcnow().isoformat(), "entries": [], "skipped": []}
+        pdf_types = [doc_type for doc_type, fmt in artifacts if fmt == "pdf"]
+        # Meetings kept rendering ahead of the archive writer
+        window = 2 * max(1, render_farm_service.max_workers)
+
+        db = SessionLocal()
+        try:
+            with zipfile.ZipFile(stream, mode="w", allowZip64=True) as archive:
+                pending = deque()
+                for meeting_id in meeting_ids:
+                    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+                    if not meeting:
+                        continue
+
+                    # Queue the meeting's PDFs; if the render queue is full, write out
+                    # earlier meetings (or wait for other requests' jobs) to free a slot
+                    hits, future = {}, None
+                    deadline = time.monotonic() + render_farm_service.timeout
+                    while pdf_types:
+                        try:
+                            hits, future = pdf_cache_service.submit(db, meeting, pdf_types)
+                            break
+                        except RenderQueueFull as e:
+                            if pending:
+                                yield from self._write_meeting(db, archive, stream, manifest, artifacts, *pending.popleft())
+                            elif time.monotonic() > deadline:
+                                future = Future()
+                                future.set_exception(e)
+                                break
+                            else:
+                                time.sleep(0.5)
+                    pending.append((meeting, hits, future))
+
+                    # Keep a bounded number of meetings rendering ahead of the writer
+                    while len(pending) > window:
+                        yield from self._write_meeting(db, archive, stream, manifest, artifacts, *pending.popleft())
+
+                while pending:
+                    yield from self._write_meeting(db, archive, stream, manifest, artifacts, *pending.popleft())
+
+                archive.writestr(
+                    self._zip_info("export_manifest.json", datetime.datetime.utcnow(), zipfile.ZIP_DEFLATED),
+                    json.dumps(manifest, indent=2, ensure_ascii=False)
+                )
+            yield stream.drain()
+        finally:
+            db.close()
+
+    def _write_meeting(self, db, archive, stream, manifest, artifacts, meeting, hits, future):
+        rendered = {}
+        render_error = None
+        if future is not None:
+            try:
+                rendered = render_farm_service.result(future)
+            except Exception as e:
+                logger.error(f"Export: rendering failed for meeting {meeting.id}: {e}")
+                render_error = e
+
+        folder = f"{meeting.id:05d}_{pdf_generator_service._sanitize_filename(meeting.title)}"
+        date = meeting.date or datetime.datetime.utcnow()
+
+        for doc_type, fmt in artifacts:
+            name = f"{folder}/{doc_type}.{fmt}"
+            try:
+                if fmt == "pdf":
+                    document_inputs(meeting, doc_type)
+                    path = hits.get(doc_type) or rendered.get(doc_type)
+                    if path is None:
+                        raise render_error or RuntimeError("Document was not rendered")
+                    if not path.endswith(".pdf"):
+                        # Rendering fell back to text
+                        name = f"{folder}/{doc_type}.txt"
+                    yield from self._write_file(archive, stream, name, date, meeting, doc_type, path)
+                elif doc_type == "meeting":
+                    renderer = export_renderer_registry.get(fmt)
+                    renderer.check(meeting)
+                    name = f"{folder}/meeting.{renderer.extension}"
+                    # DOCX is itself a ZIP package, so store it as-is
+                    compress_type = zipfile.ZIP_STORED if fmt == "docx" else zipfile.ZIP_DEFLATED
+                    with archive.open(self._zip_info(name, date, compress_type), mode="w", force_zip64=True) as entry:
+                        for chunk in renderer.render(meeting):
+                            entry.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+                    yield stream.drain()
+                else:
+                    chunks, _ = text_document(meeting, doc_type, meeting.translation)
+                    with archive.open(self._zip_info(name, date, zipfile.ZIP_DEFLATED), mode="w", force_zip64=True) as entry:
+                        for chunk in chunks:
+                            entry.write(chunk.encode("utf-8"))
+                    yield stream.drain()
+                manifest["entries"].append({"meeting_id": meeting.id, "name": name})
+            except ValueError as e:
+                manifest["skipped"].append({"meeting_id": meeting.id, "artifact": f"{doc_type}.{fmt}", "reason": str(e)})
+            except Exception as e:
+                logger.error(f"Export: failed to add {name}: {e}")
+                manifest["skipped"].append({"meeting_id": meeting.id, "artifact": f"{doc_type}.{fmt}", "reason": f"Error: {e}"})
+
+        # Do not keep every exported transcript in the session
+        db.expunge(meeting)
+
+    def _write_file(self, archive, stream, name, date, meeting, doc_type, path):
+        info = self._zip_info(name, date, zipfile.ZIP_STORED if name.endswith(".pdf") else zipfile.ZIP_DEFLATED)
+        try:
+            source = open(path, "rb")
+        except FileNotFoundError:
+            # Evicted from the cache since it was looked up - render this copy in memory
+            source = pdf_generator_service.render_to_buffer(
+                doc_type, meeting.title, meeting.transcription, meeting.summary,
+                meeting.action_items or "No action items"
+            )
+        with source, archive.open(info, mode="w", force_zip64=True) as entry:
+            while True:
+                data = source.read(COPY_CHUNK_SIZE)
+                if not data:
+                    break
+                entry.write(data)
+                yield stream.drain()
+        yield stream.drain()
+
+    def _zip_info(self, name, date, compress_type):
+        info = zipfile.ZipInfo(name, date_time=date.timetuple()[:6])
+        info.compress_type = compress_type
+        info.external_attr = 0o644 << 16
+        return info
+
+
+# Create instance
+export_service = ExportService()
@@ -0,0 +1,356 @@
+import io
+import json
+import html
+import zipfile
+from collections import OrderedDict
+
+# Longest subtitle cue, in characters and milliseconds
+SUBTITLE_MAX_CHARS = 84
+SUBTITLE_MAX_MS = 7000
+
+
+def meeting_utterances(meeting):
+    """
+    Utterances stored with a meeting
+
+    Args:
+        meeting: Meeting record
+
+    Returns:
+        List of dicts with speaker, text, start and end (ms); empty if none were stored
+    """
+    if not meeting.utterances:
+        return []
+    try:
+        utterances = json.loads(meeting.utterances)
+    except ValueError:
+        return []
+    return [u for u in utterances if u.get("text") and u.get("start") is not None and u.get("end") is not None]
+
+
+def action_item_lines(action_items):
+    """Action items as a list of lines without existing bullet markers"""
+    items = []
+    for item in (action_items or "").split("\n"):
+        item = item.strip()
+        if item.startswith(("•", "-", "*")):
+            item = item[1:].strip()
+        if item:
+            items.append(item)
+    return items
+
+
+def paragraphs(text):
+    return [paragraph.strip() for paragraph in (text or "").split("\n\n") if paragraph.strip()]
+
+
+def subtitle_cues(utterances):
+    """
+    Split utterances into subtitle-sized cues
+
+    Long utterances are broken at word boundaries into cues of at most
+    SUBTITLE_MAX_CHARS characters and roughly SUBTITLE_MAX_MS milliseconds,
+    with their times interpolated by character position.
+
+    Args:
+        utterances: List of utterances (speaker, text, start and end in ms)
+
+    Yields:
+        (start ms, end ms, cue text) tuples
+    """
+    for utterance in utterances:
+        start, end = int(utterance["start"]), int(utterance["end"])
+        speaker = utterance.get("speaker")
+        text = " ".join(utterance["text"].split())
+        duration = max(end - start, 1)
+
+        # Enough pieces to respect both the length and the duration limits
+        pieces = max(-(-len(text) // SUBTITLE_MAX_CHARS), -(-duration // SUBTITLE_MAX_MS), 1)
+        target = -(-len(text) // pieces)
+
+        lines, current = [], ""
+        for word in text.split(" "):
+            if current and len(current) + 1 + len(word) > target:
+                lines.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            lines.append(current)
+
+        offset = 0
+        for i, line in enumerate(lines):
+            cue_start = start + duration * offset // max(len(text), 1)
+            offset += len(line) + 1
+            cue_end = end if i == len(lines) - 1 else start + duration * offset // max(len(text), 1)
+            if speaker and i == 0:
+                line = f"Speaker {speaker}: {line}"
+            yield cue_start, max(cue_end, cue_start + 1), line
+
+
+def _timestamp(ms, separator):
+    hours, ms = divmod(int(ms), 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+
+class ExportRenderer:
+    """
+    Base class for lightweight export formats
+
+    Subclasses set format, media_type and extension and implement render(),
+    yielding the document as str (or bytes) chunks.
+    """
+
+    format = None
+    media_type = "application/octet-stream"
+    extension = None
+    # Whether the format is built from utterance timestamps
+    needs_utterances = False
+
+    def render(self, meeting):
+        raise NotImplementedError
+
+    def check(self, meeting):
+        """
+        Raise ValueError if the meeting cannot be rendered in this format
+
+        Args:
+            meeting: Meeting record
+        """
+        if self.needs_utterances:
+            if not meeting_utterances(meeting):
+                raise ValueError("Meeting has no utterance timestamps")
+        elif not meeting.transcription:
+            raise ValueError("Meeting has no transcription")
+
+
+class MarkdownRenderer(ExportRenderer):
+    format = "md"
+    media_type = "text/markdown"
+    extension = "md"
+
+    def render(self, meeting):
+        yield f"# {meeting.title}\n\n"
+        if meeting.date:
+            yield f"*{meeting.date.strftime('%Y-%m-%d %H:%M')}*\n\n"
+        if meeting.summary:
+            yield "## Summary\n\n"
+            for paragraph in paragraphs(meeting.summary):
+                yield f"{paragraph}\n\n"
+        items = action_item_lines(meeting.action_items)
+        if items:
+            yield "## Action Items\n\n"
+            for item in items:
+                yield f"- {item}\n"
+            yield "\n"
+        yield "## Transcript\n\n"
+        for paragraph in paragraphs(meeting.transcription):
+            yield f"{paragraph}\n\n"
+
+
+class HTMLRenderer(ExportRenderer):
+    format = "html"
+    media_type = "text/html"
+    extension = "html"
+
+    def render(self, meeting):
+        title = html.escape(meeting.title or "")
+        yield ("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+               f"<title>{title}</title>\n</head>\n<body>\n<h1>{title}</h1>\n")
+        if meeting.date:
+            yield f"<p><em>{meeting.date.strftime('%Y-%m-%d %H:%M')}</em></p>\n"
+        if meeting.summary:
+            yield "<h2>Summary</h2>\n"
+            for paragraph in paragraphs(meeting.summary):
+                yield f"<p>{html.escape(paragraph).replace(chr(10), '<br>')}</p>\n"
+        items = action_item_lines(meeting.action_items)
+        if items:
+            yield "<h2>Action Items</h2>\n<ul>\n"
+            for item in items:
+                yield f"<li>{html.escape(item)}</li>\n"
+            yield "</ul>\n"
+        yield "<h2>Transcript</h2>\n"
+        for paragraph in paragraphs(meeting.transcription):
+            yield f"<p>{html.escape(paragraph).replace(chr(10), '<br>')}</p>\n"
+        yield "</body>\n</html>\n"
+
+
+class JSONRenderer(ExportRenderer):
+    format = "json"
+    media_type = "application/json"
+    extension = "json"
+
+    def render(self, meeting):
+        document = OrderedDict([
+            ("id", meeting.id),
+            ("title", meeting.title),
+            ("date", meeting.date.isoformat() if meeting.date else None),
+            ("timezone", meeting.timezone),
+            ("language", meeting.language),
+            ("detected_language", meeting.detected_language),
+            ("audio_duration", meeting.audio_duration),
+            ("summary", meeting.summary),
+            ("action_items", action_item_lines(meeting.action_items)),
+            ("transcription", meeting.transcription),
+            ("utterances", meeting_utterances(meeting)),
+            ("translations", {}),
+        ])
+        for translation in meeting.translations:
+            document["translations"].setdefault(translation.target_lang, {})[translation.field] = translation.content
+        # iterencode yields token-sized pieces; group them into larger chunks
+        pieces, size = [], 0
+        for piece in json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(document):
+            pieces.append(piece)
+            size += len(piece)
+            if size >= 64 * 1024:
+                yield "".join(pieces)
+                pieces, size = [], 0
+        if pieces:
+            yield "".join(pieces)
+
+
+class SRTRenderer(ExportRenderer):
+    format = "srt"
+    media_type = "application/x-subrip; charset=utf-8"
+    extension = "srt"
+    needs_utterances = True
+
+    def render(self, meeting):
+        for i, (start, end, text) in enumerate(subtitle_cues(meeting_utterances(meeting)), start=1):
+            yield f"{i}\n{_timestamp(start, ',')} --> {_timestamp(end, ',')}\n{text}\n\n"
+
+
+class VTTRenderer(ExportRenderer):
+    format = "vtt"
+    media_type = "text/vtt"
+    extension = "vtt"
+    needs_utterances = True
+
+    def render(self, meeting):
+        yield "WEBVTT\n\n"
+        for start, end, text in subtitle_cues(meeting_utterances(meeting)):
+            yield f"{_timestamp(start, '.')} --> {_timestamp(end, '.')}\n{text}\n\n"
+
+
+class DOCXRenderer(ExportRenderer):
+    """Minimal WordprocessingML package written directly, without a DOCX library"""
+
+    format = "docx"
+    media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    extension = "docx"
+
+    CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+        '</Types>'
+    )
+    PACKAGE_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    DOCUMENT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    STYLES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>'
+        '<w:pPr><w:spacing w:after="160"/></w:pPr><w:rPr><w:sz w:val="22"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/>'
+        '<w:rPr><w:b/><w:sz w:val="40"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>'
+        '<w:pPr><w:spacing w:before="240"/><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:sz w:val="30"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/><w:basedOn w:val="Normal"/>'
+        '<w:pPr><w:ind w:left="360"/></w:pPr></w:style>'
+        '</w:styles>'
+    )
+
+    def render(self, meeting):
+        body = []
+        body.append(self._paragraph(meeting.title or "", "Title"))
+        if meeting.summary:
+            body.append(self._paragraph("Summary", "Heading1"))
+            body.extend(self._paragraph(p) for p in paragraphs(meeting.summary))
+        items = action_item_lines(meeting.action_items)
+        if items:
+            body.append(self._paragraph("Action Items", "Heading1"))
+            body.extend(self._paragraph(f"• {item}", "ListBullet") for item in items)
+        body.append(self._paragraph("Transcript", "Heading1"))
+        body.extend(self._paragraph(p) for p in paragraphs(meeting.transcription))
+
+        document = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            + "".join(body)
+            + '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+            '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440"/></w:sectPr>'
+            '</w:body></w:document>'
+        )
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as package:
+            package.writestr("[Content_Types].xml", self.CONTENT_TYPES)
+            package.writestr("_rels/.rels", self.PACKAGE_RELS)
+            package.writestr("word/_rels/document.xml.rels", self.DOCUMENT_RELS)
+            package.writestr("word/styles.xml", self.STYLES)
+            package.writestr("word/document.xml", document)
+        yield buffer.getvalue()
+
+    def _paragraph(self, text, style=None):
+        properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        # Line breaks inside a paragraph become <w:br/> between runs
+        runs = '<w:r><w:br/></w:r>'.join(
+            f'<w:r><w:t xml:space="preserve">{html.escape(line, quote=False)}</w:t></w:r>'
+            for line in text.split("\n")
+        )
+        return f"<w:p>{properties}{runs}</w:p>"
+
+
+class ExportRendererRegistry:
+    """Registry of export formats by name"""
+
+    def __init__(self):
+        self.renderers = OrderedDict()
+
+    def register(self, renderer):
+        self.renderers[renderer.format] = renderer
+        return renderer
+
+    def get(self, fmt):
+        """
+        Renderer for a format
+
+        Args:
+            fmt: Format name (md, html, docx, json, srt, vtt)
+
+        Returns:
+            ExportRenderer, or None if the format is not registered
+        """
+        return self.renderers.get((fmt or "").lower())
+
+    @property
+    def formats(self):
+        return list(self.renderers.keys())
+
+
+# Create instance
+export_renderer_registry = ExportRendererRegistry()
+for renderer_class in (MarkdownRenderer, HTMLRenderer, DOCXRenderer, JSONRenderer, SRTRenderer, VTTRenderer):
+    export_renderer_registry.register(renderer_class())
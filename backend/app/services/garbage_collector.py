@@ -0,0 +1,238 @@
+import os
+import time
+import logging
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.config import settings
+from ..db.database import SessionLocal, Meeting, PDF
+from .semantic_search import semantic_search_service
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Attempts per file within one pass, and the pause between them
+FILE_REMOVE_ATTEMPTS = 3
+FILE_REMOVE_RETRY_DELAY = 0.5
+
+# Longest wait before a meeting whose purge failed is tried again
+MAX_RETRY_DELAY = 3600.0
+
+
+def _remove_file(path):
+    # A file that is already gone counts as removed, so an interrupted purge can simply run again
+    for attempt in range(1, FILE_REMOVE_ATTEMPTS + 1):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except FileNotFoundError:
+            return 0
+        except OSError:
+            if attempt == FILE_REMOVE_ATTEMPTS:
+                raise
+            time.sleep(FILE_REMOVE_RETRY_DELAY * attempt)
+
+
+class GarbageCollectorService:
+    """
+    Purges deleted meetings in the background
+
+    Deleting a meeting only sets deleted_at, which hides it from every query,
+    so deletes return at once however many files the meeting has. This
+    service then removes the audio and document files of deleted meetings in
+    batches, in parallel, and deletes the rows once every file is gone. The
+    row goes last: a purge interrupted by a crash leaves the meeting deleted
+    but still listing its files, and the next pass finishes it. A meeting
+    whose files cannot be removed is retried with exponential backoff.
+    """
+
+    def __init__(self):
+        self.enabled = settings.GC_ENABLED
+        self.interval = settings.GC_INTERVAL
+        self.batch_size = settings.GC_BATCH_SIZE
+        self.workers = max(1, settings.GC_DELETE_WORKERS)
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._failures = {}  # meeting ID -> (attempts, monotonic time of the next attempt)
+        self.counters = {"passes": 0, "meetings_purged": 0, "files_removed": 0, "bytes_removed": 0, "failures": 0}
+
+    def start(self):
+        """Start the background thread"""
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="meeting-gc", daemon=True)
+        self._thread.start()
+        logger.info(f"Started meeting garbage collector (every {self.interval}s, batches of {self.batch_size})")
+
+    def shutdown(self):
+        """Stop the background thread after the batch in progress"""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout=10)
+
+    def wake(self):
+        """Start a pass now instead of at the next interval, e.g. after a delete"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # Keep going while full batches are purged, otherwise wait for a delete or the interval
+                busy = self.collect() >= self.batch_size
+            except Exception as e:
+                logger.error(f"Meeting garbage collection failed: {e}")
+                busy = False
+            if not busy:
+                self._wake.wait(self.interval)
+                self._wake.clear()
+
+    def _blocked_ids(self):
+        now = time.monotonic()
+        with self._lock:
+            return [meeting_id for meeting_id, (_, retry_at) in self._failures.items() if retry_at > now]
+
+    def _record_failure(self, meeting_id, error):
+        with self._lock:
+            attempts = self._failures.get(meeting_id, (0, 0))[0] + 1
+            delay = min(self.interval * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+            self._failures[meeting_id] = (attempts, time.monotonic() + delay)
+            self.counters["failures"] += 1
+        logger.warning(f"Failed to purge meeting {meeting_id} (attempt {attempts}, retrying in {delay:.0f}s): {error}")
+
+    def collect(self, limit=None):
+        """
+        Purge one batch of deleted meetings
+
+        Args:
+            limit: Maximum number of meetings (default GC_BATCH_SIZE)
+
+        Returns:
+            Number of meetings purged
+        """
+        db = SessionLocal()
+        try:
+            query = (
+                db.query(Meeting.id, Meeting.audio_path)
+                .execution_options(include_deleted=True)
+                .filter(Meeting.deleted_at.isnot(None))
+            )
+            blocked = self._blocked_ids()
+            if blocked:
+                query = query.filter(Meeting.id.notin_(blocked))
+            meetings = query.order_by(Meeting.deleted_at).limit(limit or self.batch_size).all()
+            if not meetings:
+                return 0
+
+            files = {meeting.id: [meeting.audio_path] if meeting.audio_path else [] for meeting in meetings}
+            pdf_rows = db.query(PDF.meeting_id, PDF.file_path).filter(PDF.meeting_id.in_(list(files)))
+            for meeting_id, file_path in pdf_rows:
+                if file_path:
+                    files[meeting_id].append(file_path)
+
+            # Removing a file is one round trip on network storage, so the whole batch runs in parallel
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                removals = {
+                    meeting_id: [(path, executor.submit(_remove_file, path)) for path in paths]
+                    for meeting_id, paths in files.items()
+                }
+
+            purged = 0
+            for meeting_id, results in removals.items():
+                errors = [f"{path}: {future.exception()}" for path, future in results if future.exception()]
+                if errors:
+                    self._record_failure(meeting_id, "; ".join(errors))
+                    continue
+                try:
+                    semantic_search_service.remove_meeting(meeting_id)
+                    meeting = db.get(Meeting, meeting_id, execution_options={"include_deleted": True})
+                    if meeting is not None:
+                        db.delete(meeting)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    self._record_failure(meeting_id, e)
+                    continue
+                removed = [future.result() for _, future in results]
+                with self._lock:
+                    self._failures.pop(meeting_id, None)
+                    self.counters["meetings_purged"] += 1
+                    self.counters["files_removed"] += len(removed)
+                    self.counters["bytes_removed"] += sum(removed)
+                purged += 1
+
+            with self._lock:
+                self.counters["passes"] += 1
+            logger.info(f"Purged {purged} of {len(meetings)} deleted meetings")
+            return purged
+        finally:
+            db.close()
+
+    def pending(self):
+        """
+        Number of deleted meetings not purged yet
+
+        Returns:
+            Count of meetings with deleted_at set
+        """
+        db = SessionLocal()
+        try:
+            return (
+                db.query(Meeting)
+                .execution_options(include_deleted=True)
+                .filter(Meeting.deleted_at.isnot(None))
+                .count()
+            )
+        finally:
+            db.close()
+
+    def stats(self):
+        """
+        Garbage collector counters since the process started
+
+        Returns:
+            Dictionary with the counters, pending and retrying meetings
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            retrying = len(self._failures)
+        return {
+            "enabled": self.enabled,
+            "running": self._thread is not None,
+            "pending": self.pending(),
+            "retrying": retrying,
+            **counters
+        }
+
+
+# Create instance
+garbage_collector_service = GarbageCollectorService()
+
+
+def soft_delete_meetings(db, meeting_ids):
+    """
+    Mark meetings as deleted and hand their files to the garbage collector
+
+    Args:
+        db: Database session
+        meeting_ids: Meeting IDs
+
+    Returns:
+        List of the IDs that were deleted (meetings that do not exist, or are already deleted, are left out)
+    """
+    now = datetime.datetime.utcnow()
+    meetings = db.query(Meeting).filter(Meeting.id.in_(list(meeting_ids))).all()
+    for meeting in meetings:
+        meeting.deleted_at = now
+    db.commit()
+    if meetings:
+        garbage_collector_service.wake()
+    return [meeting.id for meeting in meetings]
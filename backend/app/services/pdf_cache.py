@@ -0,0 +1,412 @@
+import os
+import time
+import hashlib
+import logging
+import datetime
+import threading
+from collections import OrderedDict
+
+from ..core.config import settings
+from ..db.database import SessionLocal, PDF
+from .pdf_generator import TEMPLATE_VERSION, REPORTLAB_AVAILABLE
+from .render_farm import render_farm_service
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Document types that can be rendered
+PDF_TYPES = ("transcript", "summary", "report")
+
+
+def document_inputs(meeting, pdf_type):
+    """
+    Fields a document is rendered from
+
+    Args:
+        meeting: Meeting record
+        pdf_type: Document type (transcript, summary, report)
+
+    Returns:
+        Tuple of input fields, in the order the generator takes them
+
+    Raises:
+        ValueError: If the type is unknown or the meeting lacks the fields it needs
+    """
+    if pdf_type == "transcript":
+        if not meeting.transcription:
+            raise ValueError("Meeting has no transcription")
+        return (meeting.transcription,)
+    if pdf_type == "summary":
+        if not meeting.summary or not meeting.action_items:
+            raise ValueError("Meeting has no summary or action items")
+        return (meeting.summary, meeting.action_items)
+    if pdf_type == "report":
+        if not meeting.transcription or not meeting.summary:
+            raise ValueError("Meeting incomplete")
+        return (meeting.transcription, meeting.summary, meeting.action_items or "No action items")
+    raise ValueError("Invalid PDF type")
+
+
+def content_hash(pdf_type, title, inputs):
+    """
+    Cache key of a rendered document
+
+    Args:
+        pdf_type: Document type
+        title: Meeting title
+        inputs: Tuple returned by document_inputs
+
+    Returns:
+        Hex SHA-256 of the template version, document type, title and input fields
+    """
+    digest = hashlib.sha256()
+    for part in (str(TEMPLATE_VERSION), pdf_type, title or "") + tuple(inputs):
+        data = part.encode("utf-8")
+        # Length-prefix every part so field boundaries are part of the key
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class PDFCacheService:
+    """
+    Content-addressed cache of rendered meeting documents under PDF_DIR
+
+    The size of PDF_DIR and the least recently used order of its files are
+    tracked in memory and updated as documents are used, rendered and removed,
+    so evicting costs nothing per render however many files there are. Other
+    processes and the garbage collector change the directory too, so a
+    background thread rescans it at startup and every PDF_CACHE_RESCAN_INTERVAL
+    seconds to correct the totals.
+    """
+
+    def __init__(self):
+        self.pdf_dir = settings.PDF_DIR
+        self.max_bytes = settings.PDF_CACHE_MAX_BYTES
+        self.rescan_interval = settings.PDF_CACHE_RESCAN_INTERVAL
+        self._files = OrderedDict()  # path -> size, least recently used first
+        self._total = 0
+        self._changes = None  # path -> size (None = removed) noted while a rescan runs
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start the background thread that rescans PDF_DIR"""
+        if not self.max_bytes or self.max_bytes <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pdf-cache-rescan", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """Stop the background thread"""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout=10)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.rescan()
+                # Files may have been rendered before the first scan finished
+                self.evict()
+            except Exception as e:
+                logger.error(f"Failed to scan {self.pdf_dir}: {e}")
+            self._stop.wait(self.rescan_interval)
+
+    def rescan(self):
+        """
+        Rebuild the tracked size and LRU order of PDF_DIR from the files on disk
+
+        Returns:
+            Total bytes in PDF_DIR
+        """
+        with self._lock:
+            self._changes = {}
+        entries = []
+        try:
+            for root, _, files in os.walk(self.pdf_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path, stat.st_size))
+        except BaseException:
+            with self._lock:
+                self._changes = None
+            raise
+        # Modification time orders files by last use, since cache hits touch them
+        entries.sort()
+        with self._lock:
+            changes, self._changes = self._changes, None
+            files = OrderedDict((path, size) for _, path, size in entries)
+            # Apply what happened while the directory was being walked
+            for path, size in changes.items():
+                files.pop(path, None)
+                if size is not None:
+                    files[path] = size
+            self._files = files
+            self._total = sum(files.values())
+            return self._total
+
+    def _note(self, path, size=None):
+        # Record a use (size None, for a tracked file) or a new file as the most recently used
+        with self._lock:
+            if size is None:
+                size = self._files.get(path)
+                if size is None:
+                    return
+            self._total += size - self._files.pop(path, 0)
+            self._files[path] = size
+            if self._changes is not None:
+                self._changes[path] = size
+
+    def _forget(self, path):
+        with self._lock:
+            self._total -= self._files.pop(path, 0)
+            if self._changes is not None:
+                self._changes[path] = None
+
+    def get_or_render(self, db, meeting, pdf_type):
+        """
+        Return the document for a meeting, rendering it only if its inputs changed
+
+        Args:
+            db: Database session
+            meeting: Meeting record
+            pdf_type: Document type (transcript, summary, report)
+
+        Returns:
+            Up-to-date PDF record
+
+        Raises:
+            ValueError: If the document cannot be rendered for this meeting
+        """
+        return self.get_or_render_many(db, meeting, [pdf_type])[pdf_type]
+
+    def get_or_render_many(self, db, meeting, pdf_types, strict=True):
+        """
+        Return several documents of a meeting, rendering the stale ones in one job
+
+        The PDF row for (meeting, type) records the content hash of the file it
+        points to. A matching hash with the file still on disk is a cache hit;
+        all other documents are rendered together on the render farm so they
+        share the meeting's laid-out sections, and their rows are pointed at the
+        new files.
+
+        Args:
+            db: Database session
+            meeting: Meeting record
+            pdf_types: Document types (transcript, summary, report)
+            strict: Raise for documents the meeting cannot produce instead of skipping them
+
+        Returns:
+            Dict of document type to up-to-date PDF record
+
+        Raises:
+            ValueError: If strict and a document cannot be rendered for this meeting
+            RenderQueueFull: If the render queue is full
+            TimeoutError: If rendering takes longer than PDF_RENDER_TIMEOUT
+        """
+        results, stale = self._lookup(db, meeting, pdf_types, strict)
+        if stale:
+            paths = render_farm_service.result(self._submit(meeting, stale))
+            results.update(self._record(db, meeting.id, stale, paths))
+        return results
+
+    def prerender(self, db, meeting, pdf_types=PDF_TYPES):
+        """
+        Queue rendering of a meeting's stale documents without waiting for it
+
+        The PDF rows are updated from the render farm once the job finishes.
+
+        Args:
+            db: Database session
+            meeting: Meeting record
+            pdf_types: Document types to render; types the meeting cannot produce are skipped
+
+        Returns:
+            Future of the render job, or None if every document is up to date
+        """
+        return self.submit(db, meeting, pdf_types)[1]
+
+    def submit(self, db, meeting, pdf_types, strict=False):
+        """
+        Split a meeting's documents into cache hits and a render job for the rest
+
+        Args:
+            db: Database session
+            meeting: Meeting record
+            pdf_types: Document types
+            strict: Raise for documents the meeting cannot produce instead of skipping them
+
+        Returns:
+            (dict of document type to cached file path, Future of the render job
+            resolving to a dict of document type to new file path, or None)
+
+        Raises:
+            RenderQueueFull: If the render queue is full
+        """
+        hits, stale = self._lookup(db, meeting, pdf_types, strict)
+        paths = {pdf_type: pdf.file_path for pdf_type, pdf in hits.items()}
+        if not stale:
+            return paths, None
+
+        meeting_id = meeting.id
+        future = self._submit(meeting, stale)
+
+        def record(done):
+            if done.cancelled() or done.exception():
+                logger.error(f"Failed to render documents for meeting {meeting_id}: {done.exception() if not done.cancelled() else 'cancelled'}")
+                return
+            session = SessionLocal()
+            try:
+                self._record(session, meeting_id, stale, done.result())
+            except Exception as e:
+                logger.error(f"Failed to record documents for meeting {meeting_id}: {e}")
+            finally:
+                session.close()
+
+        future.add_done_callback(record)
+        return paths, future
+
+    def evict(self, keep=None):
+        """
+        Delete least recently used files until PDF_DIR fits in PDF_CACHE_MAX_BYTES
+
+        Works from the tracked sizes and LRU order, without listing the
+        directory. Rows pointing at evicted files are re-rendered on demand.
+
+        Args:
+            keep: Optional paths that must not be evicted (the files just rendered)
+
+        Returns:
+            Number of files removed
+        """
+        if not self.max_bytes or self.max_bytes <= 0:
+            return 0
+
+        keep = {os.path.abspath(path) for path in keep or []}
+        victims = []
+        with self._lock:
+            if self._total <= self.max_bytes:
+                return 0
+            total = self._total
+            for path, size in self._files.items():
+                if total <= self.max_bytes:
+                    break
+                if os.path.abspath(path) in keep:
+                    continue
+                victims.append(path)
+                total -= size
+
+        removed = 0
+        for path in victims:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to evict {path}: {e}")
+                continue
+            self._forget(path)
+
+        logger.info(f"Evicted {removed} cached documents, {self._total} bytes remain in {self.pdf_dir}")
+        return removed
+
+    def _lookup(self, db, meeting, pdf_types, strict):
+        """Split document types into cache hits (PDF rows) and stale ones (content hashes)"""
+        results = {}
+        stale = {}  # pdf_type -> content hash
+        for pdf_type in pdf_types:
+            try:
+                inputs = document_inputs(meeting, pdf_type)
+            except ValueError:
+                if strict:
+                    raise
+                continue
+            key = content_hash(pdf_type, meeting.title, inputs)
+
+            pdf = self._latest_row(db, meeting.id, pdf_type)
+            if pdf and pdf.content_hash == key and pdf.file_path and os.path.exists(pdf.file_path):
+                self._touch(pdf.file_path)
+                results[pdf_type] = pdf
+            else:
+                stale[pdf_type] = key
+        return results, stale
+
+    def _submit(self, meeting, stale):
+        return render_farm_service.submit(
+            meeting.title, meeting.id,
+            {pdf_type: os.path.join(self.pdf_dir, f"{pdf_type}_{meeting.id}_{key[:16]}.pdf")
+             for pdf_type, key in stale.items()},
+            transcript=meeting.transcription,
+            summary=meeting.summary,
+            action_items=meeting.action_items or "No action items"
+        )
+
+    def _record(self, db, meeting_id, stale, paths):
+        """Point the PDF rows at freshly rendered files and drop the files they replace"""
+        rows = {}
+        for pdf_type, key in stale.items():
+            file_path = paths[pdf_type]
+            # A text fallback from a failed render is served but not cached
+            cached = not REPORTLAB_AVAILABLE or file_path.endswith(".pdf")
+
+            pdf = self._latest_row(db, meeting_id, pdf_type)
+            if pdf:
+                if pdf.file_path and pdf.file_path != file_path and os.path.exists(pdf.file_path):
+                    try:
+                        os.remove(pdf.file_path)
+                        self._forget(pdf.file_path)
+                    except OSError as e:
+                        logger.warning(f"Failed to remove stale document {pdf.file_path}: {e}")
+                pdf.file_path = file_path
+                pdf.content_hash = key if cached else None
+                pdf.created_at = datetime.datetime.utcnow()
+            else:
+                pdf = PDF(
+                    meeting_id=meeting_id,
+                    file_path=file_path,
+                    pdf_type=pdf_type,
+                    content_hash=key if cached else None
+                )
+                db.add(pdf)
+            rows[pdf_type] = pdf
+        db.commit()
+
+        for pdf in rows.values():
+            db.refresh(pdf)
+        for file_path in paths.values():
+            try:
+                self._note(file_path, os.path.getsize(file_path))
+            except OSError:
+                pass
+        self.evict(keep=list(paths.values()))
+        return rows
+
+    def _latest_row(self, db, meeting_id, pdf_type):
+        return db.query(PDF).filter(
+            PDF.meeting_id == meeting_id,
+            PDF.pdf_type == pdf_type
+        ).order_by(PDF.id.desc()).first()
+
+    def _touch(self, path):
+        # The modification time keeps the LRU order across rescans and processes
+        self._note(path)
+        try:
+            now = time.time()
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+
+# Create instance
+pdf_cache_service = PDFCacheService()
@@ -1,6 +1,7 @@
 import os
 import logging
 import re
+import tempfile
 import unicodedata
 
 # Configure logging
@@ -40,14 +41,101 @@ except ImportError:
     
 from ..core.config import settings
 
+# Bump whenever the document layout changes so cached artifacts are re-rendered
+TEMPLATE_VERSION = 3
+
+# Document titles and the sections each document is composed of
+DOCUMENT_LAYOUTS = {
+    "transcript": ("Meeting Transcript", [(None, "transcript")]),
+    "summary": ("Meeting Summary", [("Summary", "summary"), ("Action Items", "action_items")]),
+    "report": ("Meeting Report", [("Executive Summary", "summary"), ("Action Items", "action_items"),
+                                  ("Full Transcript", "transcript")]),
+}
+
+
+if REPORTLAB_AVAILABLE:
+    class SharedParagraph(Paragraph):
+        """
+        Paragraph that remembers its line breaks per frame width
+
+        Line breaking dominates layout time. Section paragraphs are shared by
+        several documents with the same frame width, so the breaks computed for
+        the first document are reused by the rest.
+        """
+
+        def breakLines(self, width):
+            key = tuple(width) if isinstance(width, (list, tuple)) else (width,)
+            cache = self.__dict__.setdefault('_line_cache', {})
+            if key not in cache:
+                cache[key] = super().breakLines(width)
+            return cache[key]
+
+
+class LazyFlowables(list):
+    """
+    Flowable list that is filled from an iterator as ReportLab consumes it
+
+    SimpleDocTemplate.build() only looks at the front of its list, deletes each
+    flowable once it is placed and puts split remainders back at the front. A
+    short lookahead buffer refilled on every delete therefore keeps only a few
+    pages' worth of flowables alive, however long the document is.
+    """
+
+    def __init__(self, source, lookahead=64):
+        super().__init__()
+        self._source = iter(source)
+        self._lookahead = lookahead
+        self._fill()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._fill()
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+
+class MeetingSections:
+    """
+    Flowables of one meeting's sections, built once and shared by every document
+
+    Each section is escaped and laid out into Paragraphs on first use; the
+    transcript, summary and report documents then reference the same lists.
+
+    In streaming mode (used for very long meetings) nothing is kept: every
+    document gets a fresh generator over the section, so only the flowables
+    ReportLab is currently placing exist in memory.
+    """
+
+    def __init__(self, generator, transcript=None, summary=None, action_items=None, streaming=False):
+        self.generator = generator
+        self.texts = {"transcript": transcript, "summary": summary, "action_items": action_items}
+        self.streaming = streaming
+        self._flowables = {}
+
+    def get(self, name):
+        if self.streaming:
+            return self.generator._section_flowables(name, self.texts[name] or "")
+        if name not in self._flowables:
+            self._flowables[name] = list(self.generator._section_flowables(name, self.texts[name] or ""))
+        return self._flowables[name]
+
+
 class PDFGeneratorService:
     """Service for generating PDF files from meeting data"""
     
     def __init__(self):
         self.pdf_dir = settings.PDF_DIR
         os.makedirs(self.pdf_dir, exist_ok=True)
+        
+        # Styles are built once and shared by all documents
+        self.styles = self._build_styles() if REPORTLAB_AVAILABLE else {}
     
-    def generate_transcript_pdf(self, meeting_title, transcript, meeting_id):
+    def generate_transcript_pdf(self, meeting_title, transcript, meeting_id, output_path=None):
         """
         Generate PDF file from transcript
         
@@ -55,84 +143,17 @@ class PDFGeneratorService:
             meeting_title: Title of the meeting
             transcript: Transcript text
             meeting_id: Meeting ID for file naming
+            output_path: Optional path of the PDF to write (the extension is
+                replaced with .txt for text output)
             
         Returns:
             Path to the generated PDF file
         """
-        # Create filename
-        filename = f"transcript_{meeting_id}_{self._sanitize_filename(meeting_title)}"
-        
-        # Use proper extension based on available libraries
-        if REPORTLAB_AVAILABLE:
-            file_path = os.path.join(self.pdf_dir, f"{filename}.pdf")
-        else:
-            file_path = os.path.join(self.pdf_dir, f"{filename}.txt")
-            
-        logger.info(f"Generating transcript file: {file_path}")
-        
-        try:
-            if not REPORTLAB_AVAILABLE:
-                # Create a formatted text file if reportlab is not available
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"=== TRANSCRIPT: {meeting_title} ===\n\n")
-                    f.write(transcript)
-                return file_path
-                
-            # Create PDF document using reportlab
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            
-            # Create a custom style for the title
-            title_style = ParagraphStyle(
-                'TitleStyle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                alignment=1,  # Center alignment
-                spaceAfter=20,
-                fontName='DejaVuSans' if 'DejaVuSans' in pdfmetrics.getRegisteredFontNames() else 'Helvetica'
-            )
-            
-            # Create a custom style for the transcript
-            transcript_style = ParagraphStyle(
-                'TranscriptStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                leading=14,
-                spaceAfter=10,
-                fontName='DejaVuSans' if 'DejaVuSans' in pdfmetrics.getRegisteredFontNames() else 'Helvetica'
-            )
-            
-            # Create content elements
-            elements = []
-            
-            # Add title
-            safe_title = self._escape_xml(meeting_title)
-            elements.append(Paragraph(f"Meeting Transcript: {safe_title}", title_style))
-            elements.append(Spacer(1, 20))
-            
-            # Add transcript
-            # Split transcript into paragraphs for better formatting
-            safe_transcript = self._escape_xml(transcript)
-            paragraphs = safe_transcript.split('\n\n')
-            for paragraph in paragraphs:
-                if paragraph.strip():
-                    elements.append(Paragraph(paragraph.replace('\n', '<br/>'), transcript_style))
-                    elements.append(Spacer(1, 10))
-            
-            # Build PDF
-            doc.build(elements)
-            
-            return file_path
-        except Exception as e:
-            logger.error(f"Error generating transcript PDF: {e}")
-            # Fallback to text file
-            fallback_path = os.path.join(self.pdf_dir, f"{filename}.txt")
-            with open(fallback_path, 'w', encoding='utf-8') as f:
-                f.write(f"=== TRANSCRIPT: {meeting_title} ===\n\n")
-                f.write(transcript)
-            return fallback_path
+        return self.render_documents(
+            meeting_title, meeting_id, {"transcript": output_path}, transcript=transcript
+        )["transcript"]
     
-    def generate_summary_pdf(self, meeting_title, summary, action_items, meeting_id):
+    def generate_summary_pdf(self, meeting_title, summary, action_items, meeting_id, output_path=None):
         """
         Generate PDF file from summary and action items
         
@@ -141,103 +162,17 @@ class PDFGeneratorService:
             summary: Summary text
             action_items: Action items text
             meeting_id: Meeting ID for file naming
+            output_path: Optional path of the PDF to write (the extension is
+                replaced with .txt for text output)
             
         Returns:
             Path to the generated PDF file
         """
-        # Create filename
-        filename = f"summary_{meeting_id}_{self._sanitize_filename(meeting_title)}"
-        
-        # Use proper extension based on available libraries
-        if REPORTLAB_AVAILABLE:
-            file_path = os.path.join(self.pdf_dir, f"{filename}.pdf")
-        else:
-            file_path = os.path.join(self.pdf_dir, f"{filename}.txt")
-            
-        logger.info(f"Generating summary file: {file_path}")
-        
-        try:
-            if not REPORTLAB_AVAILABLE:
-                # Create a formatted text file if reportlab is not available
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"=== SUMMARY: {meeting_title} ===\n\n")
-                    f.write(f"SUMMARY:\n{summary}\n\n")
-                    f.write(f"ACTION ITEMS:\n{action_items}")
-                return file_path
-                
-            # Create PDF document using reportlab
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            
-            # Create custom styles
-            title_style = ParagraphStyle(
-                'TitleStyle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                alignment=1,  # Center alignment
-                spaceAfter=20
-            )
-            
-            heading_style = ParagraphStyle(
-                'HeadingStyle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                spaceBefore=15,
-                spaceAfter=10
-            )
-            
-            normal_style = ParagraphStyle(
-                'NormalStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                leading=14,
-                spaceAfter=10
-            )
-            
-            # Create content elements
-            elements = []
-            
-            # Add title
-            elements.append(Paragraph(f"Meeting Summary: {meeting_title}", title_style))
-            elements.append(Spacer(1, 20))
-            
-            # Add summary
-            elements.append(Paragraph("Summary", heading_style))
-            paragraphs = summary.split('\n\n')
-            for paragraph in paragraphs:
-                if paragraph.strip():
-                    elements.append(Paragraph(paragraph.replace('\n', '<br/>'), normal_style))
-            
-            elements.append(Spacer(1, 15))
-            
-            # Add action items
-            elements.append(Paragraph("Action Items", heading_style))
-            
-            # Format action items as a list
-            action_items_list = action_items.split('\n')
-            for item in action_items_list:
-                if item.strip():
-                    # Remove bullet points if they already exist
-                    item = item.strip()
-                    if item.startswith('•') or item.startswith('-') or item.startswith('*'):
-                        item = item[1:].strip()
-                    elements.append(Paragraph(f"• {item}", normal_style))
-            
-            # Build PDF
-            doc.build(elements)
-            
-            return file_path
-        except Exception as e:
-            logger.error(f"Error generating summary PDF: {e}")
-            # Fallback to text file
-            fallback_path = os.path.join(self.pdf_dir, f"{filename}.txt")
-            with open(fallback_path, 'w', encoding='utf-8') as f:
-                f.write(f"=== SUMMARY: {meeting_title} ===\n\n")
-                f.write(f"SUMMARY:\n{summary}\n\n")
-                f.write(f"ACTION ITEMS:\n{action_items}")
-            return fallback_path
+        return self.render_documents(
+            meeting_title, meeting_id, {"summary": output_path}, summary=summary, action_items=action_items
+        )["summary"]
     
-    def generate_full_report_pdf(self, meeting_title, transcript, summary, action_items, meeting_id):
+    def generate_full_report_pdf(self, meeting_title, transcript, summary, action_items, meeting_id, output_path=None):
         """
         Generate a comprehensive PDF report with all meeting data
         
@@ -247,107 +182,283 @@ class PDFGeneratorService:
             summary: Summary text
             action_items: Action items text
             meeting_id: Meeting ID for file naming
+            output_path: Optional path of the PDF to write (the extension is
+                replaced with .txt for text output)
             
         Returns:
             Path to the generated PDF file
         """
-        # Create filename
-        filename = f"report_{meeting_id}_{self._sanitize_filename(meeting_title)}"
+        return self.render_documents(
+            meeting_title, meeting_id, {"report": output_path},
+            transcript=transcript, summary=summary, action_items=action_items
+        )["report"]
+    
+    def render_documents(self, meeting_title, meeting_id, documents, transcript=None, summary=None, action_items=None):
+        """
+        Render several documents of one meeting in a single pass
         
-        # Use proper extension based on available libraries
-        if REPORTLAB_AVAILABLE:
-            file_path = os.path.join(self.pdf_dir, f"{filename}.pdf")
-        else:
-            file_path = os.path.join(self.pdf_dir, f"{filename}.txt")
+        The meeting's sections are turned into flowables once and every
+        document is composed from the same lists.
+        
+        Args:
+            meeting_title: Title of the meeting
+            meeting_id: Meeting ID for file naming
+            documents: Dict of document type (transcript, summary, report) to
+                output path, or None for the default path
+            transcript: Transcript text
+            summary: Summary text
+            action_items: Action items text
             
-        logger.info(f"Generating full report file: {file_path}")
+        Returns:
+            Dict of document type to the path of the generated file
+        """
+        sections = self._sections(transcript, summary, action_items) if REPORTLAB_AVAILABLE else None
+        paths = {}
+        
+        for doc_type, output_path in documents.items():
+            if doc_type not in DOCUMENT_LAYOUTS:
+                raise ValueError(f"Unknown document type: {doc_type}")
+            
+            # Create filename
+            if output_path:
+                output_dir = os.path.dirname(output_path)
+                filename = os.path.splitext(os.path.basename(output_path))[0]
+            else:
+                output_dir = self.pdf_dir
+                filename = f"{doc_type}_{meeting_id}_{self._sanitize_filename(meeting_title)}"
+            
+            # Use proper extension based on available libraries
+            extension = "pdf" if REPORTLAB_AVAILABLE else "txt"
+            file_path = os.path.join(output_dir, f"{filename}.{extension}")
+            logger.info(f"Generating {doc_type} file: {file_path}")
+            
+            try:
+                if not REPORTLAB_AVAILABLE:
+                    # Create a formatted text file if reportlab is not available
+                    self._write_text(file_path, doc_type, meeting_title, transcript, summary, action_items)
+                else:
+                    doc = SimpleDocTemplate(file_path, pagesize=letter)
+                    # build() consumes its list, so hand it a fresh one over the shared flowables
+                    doc.build(self.compose(doc_type, meeting_title, sections))
+                paths[doc_type] = file_path
+            except Exception as e:
+                logger.error(f"Error generating {doc_type} PDF: {e}")
+                # Fallback to text file
+                fallback_path = os.path.join(output_dir, f"{filename}.txt")
+                self._write_text(fallback_path, doc_type, meeting_title, transcript, summary, action_items)
+                paths[doc_type] = fallback_path
+        
+        return paths
+    
+    def render_to_buffer(self, doc_type, meeting_title, transcript=None, summary=None, action_items=None):
+        """
+        Render one document into memory instead of a file
         
+        Small documents stay in memory; larger ones spill to an anonymous
+        temporary file past DOCUMENT_SPOOL_MAX_BYTES.
+        
+        Args:
+            doc_type: Document type (transcript, summary, report)
+            meeting_title: Title of the meeting
+            transcript: Transcript text
+            summary: Summary text
+            action_items: Action items text
+            
+        Returns:
+            SpooledTemporaryFile holding the PDF, positioned at the start
+        """
+        if not REPORTLAB_AVAILABLE:
+            raise RuntimeError("ReportLab is not available")
+        if doc_type not in DOCUMENT_LAYOUTS:
+            raise ValueError(f"Unknown document type: {doc_type}")
+        
+        buffer = tempfile.SpooledTemporaryFile(max_size=settings.DOCUMENT_SPOOL_MAX_BYTES)
         try:
-            if not REPORTLAB_AVAILABLE:
-                # Create a formatted text file if reportlab is not available
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"=== REPORT: {meeting_title} ===\n\n")
-                    f.write(f"SUMMARY:\n{summary}\n\n")
-                    f.write(f"ACTION ITEMS:\n{action_items}\n\n")
-                    f.write(f"TRANSCRIPT:\n{transcript}")
-                return file_path
-                
-            # Create PDF document using reportlab
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
+            sections = self._sections(transcript, summary, action_items)
+            SimpleDocTemplate(buffer, pagesize=letter).build(self.compose(doc_type, meeting_title, sections))
+        except Exception:
+            buffer.close()
+            raise
+        buffer.seek(0)
+        return buffer
+    
+    def compose(self, doc_type, meeting_title, sections):
+        """
+        Assemble the flowables of one document from shared sections
+        
+        Args:
+            doc_type: Document type (transcript, summary, report)
+            meeting_title: Title of the meeting
+            sections: MeetingSections of the meeting
             
-            # Create custom styles
-            title_style = ParagraphStyle(
+        Returns:
+            List of flowables (a LazyFlowables list in streaming mode)
+        """
+        elements = self._compose_flowables(doc_type, meeting_title, sections)
+        return LazyFlowables(elements) if sections.streaming else list(elements)
+    
+    def _compose_flowables(self, doc_type, meeting_title, sections):
+        heading, parts = DOCUMENT_LAYOUTS[doc_type]
+        heading_style = self.styles["heading"] if doc_type == "summary" else self.styles["section"]
+        
+        yield Paragraph(f"{heading}: {self._escape_xml(meeting_title)}", self.styles["title"])
+        yield Spacer(1, 20)
+        for i, (section_heading, name) in enumerate(parts):
+            if section_heading:
+                if i > 0:
+                    yield Spacer(1, 10)
+                yield Paragraph(section_heading, heading_style)
+            yield from sections.get(name)
+    
+    def _sections(self, transcript, summary, action_items):
+        size = len(transcript or "") + len(summary or "") + len(action_items or "")
+        return MeetingSections(
+            self, transcript, summary, action_items,
+            streaming=size > settings.PDF_STREAMING_THRESHOLD
+        )
+    
+    def _build_styles(self):
+        styles = getSampleStyleSheet()
+        font_name = 'DejaVuSans' if 'DejaVuSans' in pdfmetrics.getRegisteredFontNames() else 'Helvetica'
+        
+        return {
+            "title": ParagraphStyle(
                 'TitleStyle',
                 parent=styles['Heading1'],
                 fontSize=18,
                 alignment=1,  # Center alignment
-                spaceAfter=20
-            )
-            
-            section_style = ParagraphStyle(
+                spaceAfter=20,
+                fontName=font_name
+            ),
+            "heading": ParagraphStyle(
+                'HeadingStyle',
+                parent=styles['Heading2'],
+                fontSize=14,
+                spaceBefore=15,
+                spaceAfter=10,
+                fontName=font_name
+            ),
+            "section": ParagraphStyle(
                 'SectionStyle',
                 parent=styles['Heading2'],
                 fontSize=16,
                 spaceBefore=20,
-                spaceAfter=10
-            )
-            
-            normal_style = ParagraphStyle(
-                'NormalStyle',
+                spaceAfter=10,
+                fontName=font_name
+            ),
+            "body": ParagraphStyle(
+                'BodyStyle',
                 parent=styles['Normal'],
                 fontSize=12,
                 leading=14,
-                spaceAfter=10
-            )
-            
-            # Create content elements
-            elements = []
-            
-            # Add title
-            elements.append(Paragraph(f"Meeting Report: {meeting_title}", title_style))
-            elements.append(Spacer(1, 20))
-            
-            # Add summary section
-            elements.append(Paragraph("Executive Summary", section_style))
-            summary_paragraphs = summary.split('\n\n')
-            for paragraph in summary_paragraphs:
-                if paragraph.strip():
-                    elements.append(Paragraph(paragraph.replace('\n', '<br/>'), normal_style))
-            elements.append(Spacer(1, 10))
+                spaceAfter=10,
+                fontName=font_name
+            ),
+            "body_continued": ParagraphStyle(
+                'BodyContinuedStyle',
+                parent=styles['Normal'],
+                fontSize=12,
+                leading=14,
+                spaceAfter=0,
+                fontName=font_name
+            ),
+        }
+    
+    def _section_flowables(self, name, text):
+        """
+        Escape and lay out one section's text into flowables
+        
+        Paragraphs longer than PDF_MAX_PARAGRAPH_CHARS (e.g. a transcript
+        without speaker labels) are split into several bounded Paragraphs, since
+        ReportLab's layout cost and memory grow superlinearly with paragraph size.
+        
+        Args:
+            name: Section name (transcript, summary, action_items)
+            text: Section text
             
-            # Add action items section
-            elements.append(Paragraph("Action Items", section_style))
-            action_items_list = action_items.split('\n')
-            for item in action_items_list:
-                if item.strip():
+        Yields:
+            Flowables
+        """
+        style = self.styles["body"]
+        
+        if name == "action_items":
+            # Format action items as a list
+            for item in text.split('\n'):
+                item = item.strip()
+                if item:
                     # Remove bullet points if they already exist
-                    item = item.strip()
                     if item.startswith('•') or item.startswith('-') or item.startswith('*'):
                         item = item[1:].strip()
-                    elements.append(Paragraph(f"• {item}", normal_style))
-            
-            # Add transcript section
-            elements.append(Paragraph("Full Transcript", section_style))
-            transcript_paragraphs = transcript.split('\n\n')
-            for paragraph in transcript_paragraphs:
-                if paragraph.strip():
-                    elements.append(Paragraph(paragraph.replace('\n', '<br/>'), normal_style))
-            
-            # Build PDF
-            doc.build(elements)
+                    yield SharedParagraph(f"• {self._escape_xml(item)}", style)
+            return
+        
+        # Split into paragraphs for better formatting
+        for paragraph in self._iter_paragraphs(text):
+            if not paragraph.strip():
+                continue
+            pieces = self._split_paragraph(paragraph, settings.PDF_MAX_PARAGRAPH_CHARS)
+            for i, piece in enumerate(pieces):
+                # Pieces of one paragraph follow each other without a gap
+                piece_style = style if i == len(pieces) - 1 else self.styles["body_continued"]
+                yield SharedParagraph(self._escape_xml(piece).replace('\n', '<br/>'), piece_style)
+            if name == "transcript":
+                yield Spacer(1, 10)
+    
+    def _iter_paragraphs(self, text):
+        """Same pieces as text.split('\\n\\n'), produced one at a time"""
+        start = 0
+        while True:
+            end = text.find('\n\n', start)
+            if end == -1:
+                yield text[start:]
+                return
+            yield text[start:end]
+            start = end + 2
+    
+    def _split_paragraph(self, paragraph, limit):
+        """
+        Split a paragraph into pieces of at most limit characters
+        
+        Pieces end at a sentence boundary where possible, otherwise at a space.
+        
+        Args:
+            paragraph: Paragraph text (not yet escaped)
+            limit: Maximum piece length
             
-            return file_path
-        except Exception as e:
-            logger.error(f"Error generating full report PDF: {e}")
-            # Fallback to text file
-            fallback_path = os.path.join(self.pdf_dir, f"{filename}.txt")
-            with open(fallback_path, 'w', encoding='utf-8') as f:
+        Returns:
+            List of pieces
+        """
+        if not limit or len(paragraph) <= limit:
+            return [paragraph]
+        
+        pieces = []
+        start = 0
+        while len(paragraph) - start > limit:
+            window = paragraph[start:start + limit]
+            cut = max(window.rfind('. '), window.rfind('? '), window.rfind('! '), window.rfind('\n'))
+            if cut < limit // 2:
+                cut = window.rfind(' ')
+            if cut <= 0:
+                cut = limit - 1
+            pieces.append(paragraph[start:start + cut + 1].strip())
+            start += cut + 1
+        pieces.append(paragraph[start:].strip())
+        return [piece for piece in pieces if piece]
+    
+    def _write_text(self, file_path, doc_type, meeting_title, transcript, summary, action_items):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            if doc_type == "transcript":
+                f.write(f"=== TRANSCRIPT: {meeting_title} ===\n\n")
+                f.write(transcript or "")
+            elif doc_type == "summary":
+                f.write(f"=== SUMMARY: {meeting_title} ===\n\n")
+                f.write(f"SUMMARY:\n{summary}\n\n")
+                f.write(f"ACTION ITEMS:\n{action_items}")
+            else:
                 f.write(f"=== REPORT: {meeting_title} ===\n\n")
                 f.write(f"SUMMARY:\n{summary}\n\n")
                 f.write(f"ACTION ITEMS:\n{action_items}\n\n")
                 f.write(f"TRANSCRIPT:\n{transcript}")
-            return fallback_path
     
     def _escape_xml(self, text):
         """
@@ -0,0 +1,198 @@
+import os
+import signal
+import logging
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from ..core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class RenderQueueFull(Exception):
+    """Raised when the render queue cannot take another job"""
+
+
+class _RenderTimeout(BaseException):
+    # Raised by the alarm in a worker; a BaseException so the generator's per-document
+    # fallback to text (which catches Exception) does not swallow it
+    pass
+
+
+def _init_worker():
+    # Register fonts and build styles once per worker instead of per job
+    from .pdf_generator import pdf_generator_service  # noqa: F401
+
+
+def _raise_timeout(signum, frame):
+    raise _RenderTimeout()
+
+
+@contextlib.contextmanager
+def _time_limit(seconds):
+    # SIGALRM interrupts pure-Python layout between bytecodes; it only exists on Unix
+    # and can only be handled in the main thread, which is where pool workers run jobs
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def render_documents_job(meeting_title, meeting_id, documents, transcript, summary, action_items, timeout=None):
+    """
+    Render documents inside a worker process
+
+    Args:
+        meeting_title: Title of the meeting
+        meeting_id: Meeting ID for file naming
+        documents: Dict of document type to output path
+        transcript: Transcript text
+        summary: Summary text
+        action_items: Action items text
+        timeout: Seconds the job may run before it is aborted (None = no limit)
+
+    Returns:
+        Dict of document type to the path of the generated file
+
+    Raises:
+        TimeoutError: If rendering took longer than timeout; partial files are removed
+    """
+    from .pdf_generator import pdf_generator_service
+    try:
+        with _time_limit(timeout):
+            return pdf_generator_service.render_documents(
+                meeting_title, meeting_id, documents,
+                transcript=transcript, summary=summary, action_items=action_items
+            )
+    except _RenderTimeout:
+        for path in documents.values():
+            for candidate in (path, os.path.splitext(path)[0] + ".txt"):
+                if candidate and os.path.exists(candidate):
+                    os.remove(candidate)
+        raise TimeoutError(f"Rendering meeting {meeting_id} took longer than {timeout}s") from None
+
+
+class RenderFarmService:
+    """
+    Renders documents on a pool of worker processes
+
+    ReportLab layout is pure Python and CPU-bound, so rendering in the API
+    process competes with request handling for the GIL. Jobs are dispatched to
+    PDF_RENDER_WORKERS processes instead; at most PDF_RENDER_QUEUE_SIZE jobs may
+    wait for a free worker. Identical jobs (same output files) that are already
+    queued or running are shared rather than rendered twice. A job is aborted
+    inside its worker once it has rendered for PDF_RENDER_TIMEOUT seconds, so
+    pathological documents cannot hold workers and queue slots indefinitely.
+    """
+
+    def __init__(self):
+        self.max_workers = settings.PDF_RENDER_WORKERS
+        self.queue_size = settings.PDF_RENDER_QUEUE_SIZE
+        self.timeout = settings.PDF_RENDER_TIMEOUT
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, self.max_workers) + self.queue_size)
+        self._in_flight = {}  # sorted output paths -> Future
+
+    def submit(self, meeting_title, meeting_id, documents, transcript=None, summary=None, action_items=None):
+        """
+        Queue a render job
+
+        Args:
+            meeting_title: Title of the meeting
+            meeting_id: Meeting ID for file naming
+            documents: Dict of document type to output path
+            transcript: Transcript text
+            summary: Summary text
+            action_items: Action items text
+
+        Returns:
+            Future resolving to a dict of document type to generated file path
+
+        Raises:
+            RenderQueueFull: If every worker is busy and the queue is full
+        """
+        key = tuple(sorted(documents.values()))
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+
+            if not self._slots.acquire(blocking=False):
+                raise RenderQueueFull("Document render queue is full, try again shortly")
+
+            args = (meeting_title, meeting_id, documents, transcript, summary, action_items)
+            try:
+                if self.max_workers <= 0:
+                    future = Future()
+                else:
+                    future = self._get_executor().submit(render_documents_job, *args, timeout=self.timeout or None)
+            except Exception:
+                self._slots.release()
+                raise
+            self._in_flight[key] = future
+
+        future.add_done_callback(lambda _: self._finish(key))
+        if self.max_workers <= 0:
+            # No pool configured: render in the calling thread
+            self._run_inline(future, args)
+        return future
+
+    def result(self, future):
+        """
+        Wait for a render job
+
+        The caller waits at most PDF_RENDER_TIMEOUT, which also bounds the
+        render itself in the worker (on Unix); queued jobs can make the caller
+        give up before its job has started.
+
+        Args:
+            future: Future returned by submit
+
+        Returns:
+            Dict of document type to generated file path
+        """
+        return future.result(timeout=self.timeout or None)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self):
+        # A worker that died (e.g. killed for memory) breaks the pool, so start a new one
+        if self._executor is None or getattr(self._executor, "_broken", False):
+            # Spawned workers do not inherit the API process's threads or open database handles
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            logger.info(f"Started document render pool with {self.max_workers} workers")
+        return self._executor
+
+    def _run_inline(self, future, args):
+        try:
+            future.set_result(render_documents_job(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _finish(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
+        self._slots.release()
+
+
+# Create instance
+render_farm_service = RenderFarmService()
@@ -0,0 +1,321 @@
+import time
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from anyio import to_thread
+from sqlalchemy import event
+
+from ..core.config import settings
+from ..db.database import MeetingSession, Meeting, MeetingContent
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Try to import redis for the shared cache backend
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Bump when the cached response format changes, so old entries are never served
+CACHE_FORMAT_VERSION = 2
+KEY_PREFIX = f"meeting-analyzer:response:v{CACHE_FORMAT_VERSION}"
+EPOCH_KEY = f"{KEY_PREFIX}:epoch"
+
+# Seconds a shared backend call may take before the cache is skipped
+REDIS_SOCKET_TIMEOUT = 0.5
+
+
+class LocalCacheBackend:
+    """In-process LRU of response bodies, bounded by entry count and total bytes"""
+
+    name = "local"
+    local = True
+
+    def __init__(self, max_entries, max_bytes, ttl):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, body)
+        self.size = 0
+        self.current_epoch = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return body
+
+    def set(self, key, body, epoch):
+        with self.lock:
+            if epoch != self.current_epoch or len(body) > self.max_bytes:
+                return False
+            self._remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl, body)
+            self.size += len(body)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+            return True
+
+    def invalidate(self, keys):
+        with self.lock:
+            self.current_epoch += 1
+            for key in keys:
+                self._remove(key)
+
+    def epoch(self):
+        return self.current_epoch
+
+    def usage(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.size}
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+class RedisCacheBackend:
+    """Response bodies in Redis, shared by every API node"""
+
+    name = "redis"
+    local = False
+
+    def __init__(self, url, ttl):
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=REDIS_SOCKET_TIMEOUT, socket_connect_timeout=REDIS_SOCKET_TIMEOUT
+        )
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, body, epoch):
+        # Store only if nothing was invalidated since the response was read from the database
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(EPOCH_KEY)
+                if int(pipe.get(EPOCH_KEY) or 0) != epoch:
+                    return False
+                pipe.multi()
+                pipe.set(key, body, ex=self.ttl)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def invalidate(self, keys):
+        pipe = self.client.pipeline()
+        pipe.incr(EPOCH_KEY)
+        if keys:
+            pipe.delete(*keys)
+        pipe.execute()
+
+    def epoch(self):
+        return int(self.client.get(EPOCH_KEY) or 0)
+
+    def usage(self):
+        return {"entries": None, "bytes": None}
+
+
+class ResponseCacheService:
+    """
+    Read-through cache of serialized meeting detail responses
+
+    Entries are dropped when a meeting or its content is committed, by the
+    session hooks below, so every write path (the processing pipeline,
+    translations, deletes) invalidates without calling the cache. A response
+    read from the database is only stored if nothing was invalidated while it
+    was being built (the epoch check), so a concurrent commit can never leave a
+    stale entry behind.
+    """
+
+    def __init__(self):
+        self.enabled = settings.RESPONSE_CACHE_ENABLED
+        self.backend = self._create_backend()
+        if self.enabled and self.backend.local and settings.API_WORKERS > 1:
+            # Invalidation only reaches the process that committed, so other processes
+            # would serve (and answer conditional requests for) stale meetings
+            logger.warning(
+                f"The in-process response cache cannot be shared by {settings.API_WORKERS} API processes - "
+                f"set RESPONSE_CACHE_URL to a Redis server; response caching is disabled"
+            )
+            self.enabled = False
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "stale_stores_skipped": 0, "invalidations": 0, "errors": 0}
+        self.counters_lock = threading.Lock()
+
+    def _create_backend(self):
+        if settings.RESPONSE_CACHE_URL:
+            if REDIS_AVAILABLE:
+                return RedisCacheBackend(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_TTL)
+            logger.warning("redis package not installed - using the in-process response cache")
+        return LocalCacheBackend(
+            settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL
+        )
+
+    @staticmethod
+    def meeting_key(meeting_id):
+        return f"{KEY_PREFIX}:meeting:{meeting_id}"
+
+    def _count(self, name):
+        with self.counters_lock:
+            self.counters[name] += 1
+
+    def epoch(self):
+        """
+        Invalidation epoch, taken before reading a response from the database
+
+        Returns:
+            Token to pass to put, or None if the cache is unavailable
+        """
+        if not self.enabled:
+            return None
+        try:
+            return self.backend.epoch()
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+
+    def get(self, meeting_id):
+        """
+        Cached response of a meeting
+
+        Args:
+            meeting_id: Meeting ID
+
+        Returns:
+            Tuple of (headers dict, JSON bytes), or None on a miss
+        """
+        if not self.enabled:
+            return None
+        try:
+            value = self.backend.get(self.meeting_key(meeting_id))
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+        self._count("hits" if value is not None else "misses")
+        if value is None:
+            return None
+        # Stored as a JSON line of headers followed by the body
+        headers, _, body = value.partition(b"\n")
+        return json.loads(headers), body
+
+    def put(self, meeting_id, body, epoch, headers=None):
+        """
+        Store the response of a meeting
+
+        Args:
+            meeting_id: Meeting ID
+            body: JSON bytes
+            epoch: Value of epoch() taken before the meeting was read
+            headers: Response headers to serve with the body (validators)
+        """
+        if not self.enabled or epoch is None:
+            return
+        value = json.dumps(headers or {}).encode("utf-8") + b"\n" + body
+        try:
+            stored = self.backend.set(self.meeting_key(meeting_id), value, epoch)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Response cache unavailable: {e}")
+            return
+        self._count("stores" if stored else "stale_stores_skipped")
+
+    def invalidate(self, meeting_ids):
+        """
+        Drop the cached responses of meetings
+
+        Args:
+            meeting_ids: Iterable of meeting IDs
+        """
+        if not self.enabled:
+            return
+        keys = [self.meeting_key(meeting_id) for meeting_id in meeting_ids]
+        try:
+            self.backend.invalidate(keys)
+        except Exception as e:
+            # The TTL bounds how long the shared cache can serve the old response
+            self._count("errors")
+            logger.error(f"Failed to invalidate cached responses for {keys}: {e}")
+            return
+        with self.counters_lock:
+            self.counters["invalidations"] += len(keys)
+
+    async def get_async(self, meeting_id):
+        """get() for async endpoints - a shared backend is called from a worker thread"""
+        if self.backend.local:
+            return self.get(meeting_id)
+        return await to_thread.run_sync(self.get, meeting_id)
+
+    async def epoch_async(self):
+        """epoch() for async endpoints"""
+        if self.backend.local:
+            return self.epoch()
+        return await to_thread.run_sync(self.epoch)
+
+    async def put_async(self, meeting_id, body, epoch, headers=None):
+        """put() for async endpoints"""
+        if self.backend.local:
+            return self.put(meeting_id, body, epoch, headers)
+        return await to_thread.run_sync(self.put, meeting_id, body, epoch, headers)
+
+    def stats(self):
+        """
+        Cache counters since the process started
+
+        Returns:
+            Dictionary with the backend, counters, hit rate and (in-process backend) size
+        """
+        with self.counters_lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else None,
+            **self.backend.usage()
+        }
+
+
+# Create instance
+response_cache_service = ResponseCacheService()
+
+
+# Invalidate on commit: collect the meetings written by each flush, drop their entries once committed
+
+@event.listens_for(MeetingSession, "after_flush")
+def _collect_changed_meetings(session, flush_context):
+    changed = session.info.setdefault("response_cache_changed", set())
+    for obj in list(session.dirty) + list(session.deleted) + list(session.new):
+        if isinstance(obj, Meeting):
+            changed.add(obj.id)
+        elif isinstance(obj, MeetingContent):
+            changed.add(obj.meeting_id)
+    changed.discard(None)
+
+
+@event.listens_for(MeetingSession, "after_commit")
+def _invalidate_changed_meetings(session):
+    changed = session.info.pop("response_cache_changed", None)
+    if changed:
+        response_cache_service.invalidate(changed)
+
+
+@event.listens_for(MeetingSession, "after_rollback")
+def _discard_changed_meetings(session):
+    session.info.pop("response_cache_changed", None)
@@ -0,0 +1,652 @@
+import os
+import re
+import json
+import math
+import uuid
+import logging
+import threading
+import importlib.util
+from contextlib import contextmanager
+
+from ..core.config import settings
+from ..db.database import SessionLocal, Meeting, MeetingContent, SearchSegment
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Try to import numpy for the vector index
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("NumPy not available - semantic search is disabled")
+
+# The local embedding model is imported on first use, since it loads PyTorch
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+# Try to import fcntl to lock the index between API processes
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Rows below this count are searched exhaustively; above it an IVF index is trained
+IVF_MIN_ROWS = 2048
+# Upper bound on the number of IVF lists
+IVF_MAX_LISTS = 4096
+# Number of rows sampled to train the IVF centroids
+IVF_TRAINING_SAMPLE = 20000
+# Number of k-means iterations used to train the IVF centroids
+IVF_TRAINING_ITERATIONS = 8
+# Rows processed per block for exhaustive scans and re-assignment
+SCAN_BLOCK_ROWS = 65536
+# Maximum number of texts sent to Cohere in one embed call
+COHERE_EMBED_BATCH = 96
+# Texts embedded per batch by the local model
+LOCAL_EMBED_BATCH = 32
+
+# Assignment markers stored alongside the vectors
+UNASSIGNED = -1
+DELETED = -2
+
+
+
+class LocalEmbedder:
+    """Sentence-embedding model run on the CPU with sentence-transformers"""
+
+    def __init__(self, model):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        # Each model gets its own index since vectors are not comparable
+        self.name = "local-" + re.sub(r"[^\w.-]+", "-", os.path.basename(model.rstrip("/\\")))
+
+    def embed(self, texts, input_type="search_document"):
+        """
+        Embed a list of texts
+
+        Args:
+            texts: List of strings
+            input_type: Unused, kept for interface parity with Cohere
+
+        Returns:
+            float32 array of shape (len(texts), dim) with L2-normalized rows
+        """
+        vectors = self.model.encode(
+            texts,
+            batch_size=LOCAL_EMBED_BATCH,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class CohereEmbedder:
+    """Embedding model backed by the Cohere embed API"""
+
+    name = "cohere"
+
+    def __init__(self, model):
+        import cohere
+        self.model = model
+        self.client = cohere.Client(api_key=settings.COHERE_API_KEY)
+        # Probe once to learn the model's dimension
+        self.dim = self.embed(["dimension probe"], input_type="search_query").shape[1]
+
+    def embed(self, texts, input_type="search_document"):
+        """
+        Embed a list of texts
+
+        Args:
+            texts: List of strings
+            input_type: "search_document" for indexed segments, "search_query" for queries
+
+        Returns:
+            float32 array of shape (len(texts), dim) with L2-normalized rows
+        """
+        embeddings = []
+        for start in range(0, len(texts), COHERE_EMBED_BATCH):
+            response = self.client.embed(
+                texts=texts[start:start + COHERE_EMBED_BATCH],
+                model=self.model,
+                input_type=input_type
+            )
+            embeddings.extend(response.embeddings)
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        self.dim = vectors.shape[1]
+        return _normalize(vectors)
+
+
+@contextmanager
+def _index_file_lock(path):
+    # Exclusive between API processes; without fcntl (Windows) only one process may use the index
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class VectorIndex:
+    """
+    Append-only float16 vector store with an IVF (inverted file) index.
+
+    Vectors live in a memory-mapped matrix so the index does not have to fit in
+    memory; only the centroids and the inverted lists of row ids are held in RAM.
+    Every write stores a new version in index.json, so a process holding an
+    older copy of the counters and lists knows to reload them (see refresh).
+    """
+
+    def __init__(self, index_dir, dim):
+        self.index_dir = index_dir
+        self.dim = dim
+        self.meta_path = os.path.join(index_dir, "index.json")
+        self.vectors_path = os.path.join(index_dir, "vectors.f16")
+        self.assignments_path = os.path.join(index_dir, "assignments.i32")
+        self.centroids_path = os.path.join(index_dir, "centroids.npy")
+
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.capacity = 0
+        self.trained_count = 0
+        self.version = None
+        self.centroids = None
+        self.vectors = None
+        self.assignments = None
+        self.lists = {}
+
+    def _read_meta(self):
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self):
+        """Open the on-disk index, creating it if needed"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        meta = self._read_meta()
+        if meta:
+            self.count = meta["count"]
+            self.capacity = meta["capacity"]
+            self.trained_count = meta.get("trained_count", 0)
+            self.version = meta.get("version")
+        if self.capacity == 0:
+            self._resize(1024)
+        else:
+            self._open_maps()
+        if self.trained_count and os.path.exists(self.centroids_path):
+            self.centroids = np.load(self.centroids_path)
+            self._build_lists()
+
+    def refresh(self):
+        """Reload the index if another process has written it since it was loaded"""
+        meta = self._read_meta()
+        if meta is not None and meta.get("version") != self.version:
+            self._reset()
+            self.load()
+
+    def add(self, vectors):
+        """
+        Append vectors to the index
+
+        Args:
+            vectors: float32 array of shape (n, dim)
+
+        Returns:
+            List of row ids assigned to the vectors
+        """
+        n = len(vectors)
+        if self.count + n > self.capacity:
+            new_capacity = self.capacity
+            while self.count + n > new_capacity:
+                new_capacity *= 2
+            self._resize(new_capacity)
+
+        start = self.count
+        self.vectors[start:start + n] = vectors.astype(np.float16)
+        self.assignments[start:start + n] = UNASSIGNED
+        self.count += n
+
+        if self.centroids is not None:
+            clusters = self._nearest_centroids(vectors, 1)[:, 0]
+            self.assignments[start:start + n] = clusters
+            for cluster in np.unique(clusters):
+                rows = np.nonzero(clusters == cluster)[0] + start
+                self.lists.setdefault(int(cluster), []).append(rows.astype(np.int64))
+
+        if self.count >= IVF_MIN_ROWS and self.count >= 4 * max(self.trained_count, 1):
+            self._train()
+
+        self._flush()
+        return list(range(start, start + n))
+
+    def remove(self, rows):
+        """Tombstone rows so they never score above zero"""
+        if not rows:
+            return
+        rows = np.asarray(rows, dtype=np.int64)
+        self.vectors[rows] = 0
+        self.assignments[rows] = DELETED
+        self._flush()
+
+    def search(self, query, top_k, nprobe):
+        """
+        Find the rows most similar to a query vector
+
+        Args:
+            query: float32 array of shape (dim,)
+            top_k: Number of rows to return
+            nprobe: Number of IVF lists to scan
+
+        Returns:
+            List of (row id, cosine similarity) tuples, best first
+        """
+        if self.count == 0:
+            return []
+
+        if self.centroids is None:
+            # Small index - exhaustive scan in blocks
+            rows = None
+            scores = np.concatenate([
+                self.vectors[start:min(start + SCAN_BLOCK_ROWS, self.count)].astype(np.float32) @ query
+                for start in range(0, self.count, SCAN_BLOCK_ROWS)
+            ])
+        else:
+            clusters = self._nearest_centroids(query[np.newaxis, :], nprobe)[0]
+            parts = [part for cluster in clusters for part in self.lists.get(int(cluster), [])]
+            if not parts:
+                return []
+            rows = np.sort(np.concatenate(parts))
+            scores = self.vectors[rows].astype(np.float32) @ query
+
+        k = min(top_k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        row_ids = best if rows is None else rows[best]
+        return [(int(row), float(scores[i])) for row, i in zip(row_ids, best)]
+
+    def _nearest_centroids(self, vectors, n):
+        similarities = vectors @ self.centroids.T
+        n = min(n, len(self.centroids))
+        if n == 1:
+            return np.argmax(similarities, axis=1)[:, np.newaxis]
+        nearest = np.argpartition(-similarities, n - 1, axis=1)[:, :n]
+        return nearest
+
+    def _train(self):
+        """Train IVF centroids with spherical k-means and re-assign every row"""
+        live = np.nonzero(self.assignments[:self.count] != DELETED)[0]
+        if len(live) < IVF_MIN_ROWS:
+            return
+        n_lists = min(IVF_MAX_LISTS, max(16, int(4 * math.sqrt(len(live)))))
+        logger.info(f"Training semantic search index: {len(live)} rows, {n_lists} lists")
+
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(rng.choice(live, size=min(len(live), max(IVF_TRAINING_SAMPLE, n_lists * 4)), replace=False))
+        sample = self.vectors[sample_rows].astype(np.float32)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(IVF_TRAINING_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = np.linalg.norm(sums, axis=1) == 0
+            # Re-seed empty clusters with random samples
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+            centroids = _normalize(sums)
+        self.centroids = centroids.astype(np.float32)
+
+        for start in range(0, self.count, SCAN_BLOCK_ROWS):
+            end = min(start + SCAN_BLOCK_ROWS, self.count)
+            block = self.vectors[start:end].astype(np.float32)
+            clusters = self._nearest_centroids(block, 1)[:, 0].astype(np.int32)
+            deleted = self.assignments[start:end] == DELETED
+            clusters[deleted] = DELETED
+            self.assignments[start:end] = clusters
+
+        self.trained_count = self.count
+        np.save(self.centroids_path, self.centroids)
+        self._build_lists()
+
+    def _build_lists(self):
+        assignments = np.asarray(self.assignments[:self.count])
+        order = np.argsort(assignments, kind="stable")
+        sorted_clusters = assignments[order]
+        self.lists = {}
+        for cluster in range(len(self.centroids)):
+            lo = np.searchsorted(sorted_clusters, cluster, side="left")
+            hi = np.searchsorted(sorted_clusters, cluster, side="right")
+            if hi > lo:
+                self.lists[cluster] = [order[lo:hi].astype(np.int64)]
+
+    def _resize(self, capacity):
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.assignments.flush()
+            self.vectors = None
+            self.assignments = None
+        for path, itemsize in ((self.vectors_path, 2 * self.dim), (self.assignments_path, 4)):
+            with open(path, "ab") as f:
+                f.truncate(capacity * itemsize)
+        self.capacity = capacity
+        self._open_maps()
+        self._save_meta()
+
+    def _open_maps(self):
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r+", shape=(self.capacity, self.dim))
+        self.assignments = np.memmap(self.assignments_path, dtype=np.int32, mode="r+", shape=(self.capacity,))
+
+    def _flush(self):
+        self.vectors.flush()
+        self.assignments.flush()
+        self._save_meta()
+
+    def _save_meta(self):
+        self.version = uuid.uuid4().hex
+        meta = {
+            "dim": self.dim,
+            "count": self.count,
+            "capacity": self.capacity,
+            "trained_count": self.trained_count,
+            "version": self.version
+        }
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+
+class SemanticSearchService:
+    """
+    Service for embedding meeting transcripts and searching them by meaning
+
+    The index files in SEARCH_INDEX_DIR are shared by every API process: each
+    operation holds a file lock on the index and reloads it first if another
+    process has written it. Across nodes the directory must be on storage
+    that supports flock (e.g. NFSv4).
+    """
+
+    def __init__(self):
+        self.index_dir = settings.SEARCH_INDEX_DIR
+        self.lock_path = os.path.join(self.index_dir, "index.lock")
+        self.disabled_reason = self._check_backend()
+        self.enabled = self.disabled_reason is None
+        if not self.enabled:
+            logger.warning(f"{self.disabled_reason} - semantic search is disabled")
+        elif fcntl is None and settings.API_WORKERS > 1:
+            logger.warning("File locks are not available - the semantic search index is only safe with a single API process")
+        self.embedder = None
+        self.index = None
+        self._lock = threading.Lock()
+
+    def _check_backend(self):
+        """Reason the configured embedding backend cannot be used, or None"""
+        backend = settings.SEARCH_EMBEDDING_BACKEND
+        if not NUMPY_AVAILABLE:
+            return "Semantic search requires NumPy"
+        if backend == "local":
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                return "The local embedding model requires sentence-transformers"
+        elif backend == "cohere":
+            if not settings.COHERE_API_KEY:
+                return "The cohere embedding backend requires COHERE_API_KEY"
+        else:
+            return f"Unknown SEARCH_EMBEDDING_BACKEND {backend!r}"
+        return None
+
+    def _ensure_embedder(self):
+        """Load the embedding model on first use"""
+        with self._lock:
+            if self.embedder is None:
+                if settings.SEARCH_EMBEDDING_BACKEND == "cohere":
+                    self.embedder = CohereEmbedder(settings.SEARCH_COHERE_MODEL)
+                else:
+                    self.embedder = LocalEmbedder(settings.SEARCH_LOCAL_MODEL)
+            return self.embedder
+
+    def _ensure_loaded(self):
+        """Load the on-disk index on first use"""
+        if self.index is not None:
+            return
+
+        # Each embedding backend gets its own index since vectors are not comparable
+        index_dir = os.path.join(self.index_dir, f"{self.embedder.name}_{self.embedder.dim}")
+        self.index = VectorIndex(index_dir, self.embedder.dim)
+        self.index.load()
+        logger.info(f"Semantic search index loaded from {index_dir} ({self.index.count} rows)")
+
+    @contextmanager
+    def _locked_index(self):
+        """Hold the index for this thread and process, reloaded if another process has written it"""
+        self._ensure_embedder()
+        os.makedirs(self.index_dir, exist_ok=True)
+        with self._lock, _index_file_lock(self.lock_path):
+            self._ensure_loaded()
+            self.index.refresh()
+            yield self.index
+
+    def chunk_transcript(self, transcript, utterances=None):
+        """
+        Split a transcript into searchable segments
+
+        Args:
+            transcript: Formatted transcript text
+            utterances: Optional list of utterances with speaker, text, start and end (ms)
+
+        Returns:
+            List of segment dictionaries with speaker, text, start_ms and end_ms
+        """
+        max_words = settings.SEARCH_CHUNK_WORDS
+        segments = []
+
+        if utterances:
+            for utterance in utterances:
+                words = utterance.get("text", "").split()
+                start, end = utterance.get("start"), utterance.get("end")
+                for offset in range(0, len(words), max_words):
+                    window = words[offset:offset + max_words]
+                    segment = {"speaker": utterance.get("speaker"), "text": " ".join(window), "start_ms": None, "end_ms": None}
+                    if start is not None and end is not None:
+                        # Interpolate timestamps for long utterances split into windows
+                        span = (end - start) / max(len(words), 1)
+                        segment["start_ms"] = int(start + offset * span)
+                        segment["end_ms"] = int(start + (offset + len(window)) * span)
+                    segments.append(segment)
+            return segments
+
+        for paragraph in (transcript or "").split("\n\n"):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            speaker = None
+            if ": " in paragraph[:40]:
+                speaker = paragraph.split(": ", 1)[0]
+            words = paragraph.split()
+            for offset in range(0, len(words), max_words):
+                segments.append({
+                    "speaker": speaker,
+                    "text": " ".join(words[offset:offset + max_words]),
+                    "start_ms": None,
+                    "end_ms": None
+                })
+        return segments
+
+    def index_meeting(self, meeting_id, transcript, utterances=None):
+        """
+        Embed a meeting transcript and add it to the index, replacing earlier segments
+
+        Args:
+            meeting_id: Meeting ID
+            transcript: Formatted transcript text
+            utterances: Optional list of utterances with timestamps
+
+        Returns:
+            Number of segments indexed
+        """
+        if not self.enabled:
+            return 0
+
+        segments = self.chunk_transcript(transcript, utterances)
+        # Embed before taking the index, which other processes may be waiting for
+        vectors = self._ensure_embedder().embed([segment["text"] for segment in segments]) if segments else None
+        with self._locked_index() as index:
+            db = SessionLocal()
+            try:
+                self._remove_meeting_rows(db, meeting_id)
+                if segments:
+                    row_ids = index.add(vectors)
+                    db.bulk_save_objects([
+                        SearchSegment(
+                            id=row_id,
+                            meeting_id=meeting_id,
+                            segment_index=i,
+                            speaker=segment["speaker"],
+                            start_ms=segment["start_ms"],
+                            end_ms=segment["end_ms"],
+                            text=segment["text"]
+                        )
+                        for i, (row_id, segment) in enumerate(zip(row_ids, segments))
+                    ])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+        logger.info(f"Indexed {len(segments)} segments for meeting {meeting_id}")
+        return len(segments)
+
+    def remove_meeting(self, meeting_id):
+        """Remove all segments of a meeting from the index"""
+        if not self.enabled:
+            return
+        with self._locked_index():
+            db = SessionLocal()
+            try:
+                self._remove_meeting_rows(db, meeting_id)
+                db.commit()
+            finally:
+                db.close()
+
+    def _remove_meeting_rows(self, db, meeting_id):
+        rows = [row_id for (row_id,) in db.query(SearchSegment.id).filter(SearchSegment.meeting_id == meeting_id)]
+        if rows:
+            self.index.remove(rows)
+            db.query(SearchSegment).filter(SearchSegment.meeting_id == meeting_id).delete(synchronize_session=False)
+
+    def search(self, db, query, limit=10):
+        """
+        Search meeting segments by meaning
+
+        Args:
+            db: Database session
+            query: Free-text query
+            limit: Maximum number of segments to return
+
+        Returns:
+            List of result dictionaries, best match first
+        """
+        if not self.enabled:
+            raise RuntimeError(self.disabled_reason)
+
+        query_vector = self._ensure_embedder().embed([query], input_type="search_query")[0]
+        with self._locked_index() as index:
+            # Over-fetch to make up for tombstoned rows
+            hits = index.search(query_vector, limit * 2, settings.SEARCH_NPROBE)
+
+        if not hits:
+            return []
+
+        segments = {
+            segment.id: segment
+            for segment in db.query(SearchSegment).filter(SearchSegment.id.in_([row for row, _ in hits]))
+        }
+        meeting_ids = {segment.meeting_id for segment in segments.values()}
+        titles = dict(db.query(Meeting.id, Meeting.title).filter(Meeting.id.in_(meeting_ids)).all())
+
+        results = []
+        for row, score in hits:
+            segment = segments.get(row)
+            # Skip deleted rows and segments unrelated to the query
+            if score <= 0 or segment is None or segment.meeting_id not in titles:
+                continue
+            results.append({
+                "meeting_id": segment.meeting_id,
+                "meeting_title": titles[segment.meeting_id],
+                "segment_index": segment.segment_index,
+                "speaker": segment.speaker,
+                "text": segment.text,
+                "start_ms": segment.start_ms,
+                "end_ms": segment.end_ms,
+                "timestamp": self._format_timestamp(segment.start_ms),
+                "score": round(score, 4)
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+    def rebuild(self, db):
+        """
+        Drop the index and re-index every completed meeting that has a transcription
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of meetings indexed
+        """
+        if not self.enabled:
+            raise RuntimeError(self.disabled_reason)
+
+        with self._locked_index() as index:
+            self.index = None
+            for filename in os.listdir(index.index_dir):
+                os.remove(os.path.join(index.index_dir, filename))
+            db.query(SearchSegment).delete(synchronize_session=False)
+            db.commit()
+            # Recreate it empty at once, so other processes reload instead of using the removed files
+            self._ensure_loaded()
+
+        meeting_ids = [
+            meeting_id for (meeting_id,) in
+            db.query(MeetingContent.meeting_id).join(Meeting, Meeting.id == MeetingContent.meeting_id).filter(
+                MeetingContent.transcription.isnot(None),
+                Meeting.deleted_at.is_(None),
+                Meeting.status == "completed"
+            ).order_by(MeetingContent.meeting_id)
+        ]
+        for meeting_id in meeting_ids:
+            transcription, utterances_json = db.query(MeetingContent.transcription, MeetingContent.utterances).filter(
+                MeetingContent.meeting_id == meeting_id
+            ).one()
+            utterances = json.loads(utterances_json) if utterances_json else None
+            self.index_meeting(meeting_id, transcription, utterances)
+        return len(meeting_ids)
+
+    def _format_timestamp(self, ms):
+        if ms is None:
+            return None
+        seconds = ms // 1000
+        hours, seconds = divmod(seconds, 3600)
+        minutes, seconds = divmod(seconds, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{seconds:02d}"
+        return f"{minutes:02d}:{seconds:02d}"
+
+
+# Create instance
+semantic_search_service = SemanticSearchService()
@@ -0,0 +1,231 @@
+import html
+import time
+import random
+import asyncio
+import logging
+import threading
+
+import httpx
+
+from ..core.config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Upstream status codes that mean "slow down and try again"
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class AdaptiveTokenBucket:
+    """
+    Token-bucket rate limiter whose rate adapts to upstream feedback.
+
+    The rate grows additively after successful requests and is halved when the
+    upstream throttles (429) or fails (5xx), so throughput settles just below
+    whatever the upstream tolerates. State is guarded by a thread lock so one
+    bucket can be shared by requests running on different event loops.
+    """
+
+    def __init__(self, rate, max_rate, min_rate=0.5, burst=None, increase_step=1.0):
+        self.rate = float(rate)
+        self.max_rate = float(max_rate)
+        self.min_rate = float(min_rate)
+        self.burst = float(burst or max(1.0, rate))
+        self.increase_step = increase_step
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """Additive increase after a successful request"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step / max(self.rate, 1.0))
+
+    def on_throttle(self, retry_after=None):
+        """
+        Multiplicative decrease after a 429/5xx response
+
+        Args:
+            retry_after: Optional number of seconds the upstream asked us to wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class TranslationClient:
+    """Concurrent, connection-pooled client for the Google Translate web endpoint"""
+
+    def __init__(self):
+        self.url = settings.TRANSLATION_API_URL
+        self.max_concurrency = settings.TRANSLATION_MAX_CONCURRENCY
+        self.max_retries = settings.TRANSLATION_MAX_RETRIES
+        self.timeout = settings.TRANSLATION_TIMEOUT
+        self.limiter = AdaptiveTokenBucket(
+            rate=settings.TRANSLATION_RATE_LIMIT,
+            max_rate=settings.TRANSLATION_MAX_RATE,
+            burst=settings.TRANSLATION_MAX_CONCURRENCY
+        )
+        self._client = None
+        self._client_loop = None
+        self._semaphore = None
+
+    def new_http_client(self):
+        """Create an HTTP client whose connection pool matches the concurrency limit"""
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+
+    def shared_http_client(self):
+        """
+        Long-lived HTTP client for the running event loop
+
+        httpx clients are bound to the loop they were first used on, so a new
+        one is created if the caller runs on a different loop. The concurrency
+        semaphore is shared the same way, so concurrent translations on one loop
+        stay within TRANSLATION_MAX_CONCURRENCY in total.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = self.new_http_client()
+            self._client_loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def translate_chunks(self, chunks, source_lang, target_lang, client=None, on_chunk=None):
+        """
+        Translate chunks concurrently
+
+        Args:
+            chunks: List of text chunks
+            source_lang: Source language code
+            target_lang: Target language code
+            client: Optional httpx.AsyncClient (defaults to the shared client)
+            on_chunk: Optional callback (index, translated chunk or None) called as each chunk finishes
+
+        Returns:
+            List of translated chunks (None for chunks that failed), in the same order
+        """
+        if client is None:
+            client = self.shared_http_client()
+            semaphore = self._semaphore
+        else:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(i, chunk):
+            async with semaphore:
+                result = await self._translate_chunk(client, i, chunk, source_lang, target_lang)
+            if on_chunk:
+                on_chunk(i, result)
+            return result
+
+        return await asyncio.gather(*(run(i, chunk) for i, chunk in enumerate(chunks)))
+
+    def translate_chunks_sync(self, chunks, source_lang, target_lang):
+        """
+        Blocking wrapper around translate_chunks for code running outside an event loop
+
+        Args:
+            chunks: List of text chunks
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            List of translated chunks (None for chunks that failed), in the same order
+        """
+        async def run():
+            async with self.new_http_client() as client:
+                return await self.translate_chunks(chunks, source_lang, target_lang, client=client)
+
+        return asyncio.run(run())
+
+    async def _translate_chunk(self, client, i, chunk, source_lang, target_lang):
+        params = {
+            "client": "gtx",
+            "sl": source_lang,
+            "tl": target_lang,
+            "dt": "t",
+            "q": chunk
+        }
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            retry_after = None
+            try:
+                response = await client.get(self.url, params=params)
+            except httpx.HTTPError as e:
+                logger.warning(f"Error translating chunk {i+1} (attempt {attempt+1}): {e}")
+                self.limiter.on_throttle()
+            else:
+                if response.status_code == 200:
+                    self.limiter.on_success()
+                    return self._parse_response(response, i)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    logger.error(f"Translation error: upstream returned status code {response.status_code} for chunk {i+1}")
+                    return None
+                retry_after = self._retry_after(response)
+                logger.warning(f"Upstream returned {response.status_code} for chunk {i+1} (attempt {attempt+1})")
+                self.limiter.on_throttle(retry_after)
+
+            if attempt < self.max_retries:
+                # Exponential backoff with jitter, unless the upstream told us how long to wait
+                await asyncio.sleep(retry_after or (0.5 * 2 ** attempt) * (0.5 + random.random()))
+
+        logger.error(f"Giving up on chunk {i+1} after {self.max_retries + 1} attempts")
+        return None
+
+    def _parse_response(self, response, i):
+        # The response is a nested array: [[["translated", "original", ...], ...], ...]
+        try:
+            data = response.json()
+        except ValueError as json_err:
+            logger.error(f"Error parsing translation JSON response for chunk {i+1}: {json_err}")
+            return None
+
+        if not (isinstance(data, list) and len(data) > 0 and isinstance(data[0], list)):
+            logger.error(f"Translation error: unexpected response format for chunk {i+1}")
+            return None
+
+        translated_parts = [str(part[0]) for part in data[0] if isinstance(part, list) and len(part) > 0]
+        # Clean up any HTML entities that might be in the response
+        return html.unescape("".join(translated_parts))
+
+    def _retry_after(self, response):
+        value = response.headers.get("Retry-After")
+        try:
+            return min(float(value), 60.0) if value else None
+        except ValueError:
+            return None
+
+
+# Create instance
+translation_client = TranslationClient()
@@ -0,0 +1,443 @@
+import json
+import uuid
+import asyncio
+import logging
+import datetime
+from collections import OrderedDict
+
+from ..db.database import SessionLocal, Meeting, Translation, TranslationJobRecord
+from .assembly_ai import assembly_ai_service, TranslationFailed
+from .translation_memory import segment_hash
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Translatable meeting fields and the separator their segments are joined with
+TRANSLATABLE_FIELDS = OrderedDict([
+    ("transcription", "\n\n"),
+    ("summary", "\n\n"),
+    ("action_items", "\n"),
+])
+
+# Finished jobs kept for status queries
+MAX_FINISHED_JOBS = 100
+
+# Seconds between heartbeats of a running job, and without one after which it counts as interrupted
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_STALE_AFTER = 120
+
+# Seconds between status checks while following a job that runs in another process
+REMOTE_POLL_INTERVAL = 1.0
+
+# Statuses of jobs that have not finished
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class TranslationStream:
+    """Translated segments of one (language, field) pair, filled in as they finish"""
+
+    def __init__(self, total):
+        self.total = total
+        self.segments = {}  # segment index -> translated text
+        self.failed = []  # indexes of segments that could not be translated
+
+
+class TranslationJob:
+    """State of one fan-out translation job"""
+
+    def __init__(self, meeting_id, target_languages, fields, update_meeting_translation=False):
+        self.id = uuid.uuid4().hex
+        self.meeting_id = meeting_id
+        self.target_languages = target_languages
+        self.fields = fields
+        self.update_meeting_translation = update_meeting_translation
+        self.status = "queued"
+        self.error = None
+        self.created_at = datetime.datetime.utcnow()
+        self.finished_at = None
+        # target language -> field -> "pending" | "running" | "completed" | "failed" | "skipped"
+        self.progress = {lang: {field: "pending" for field in fields} for lang in target_languages}
+        # (target language, field) -> TranslationStream
+        self.streams = {}
+        self._changed = None
+        self._persist_lock = None
+
+    def changed_event(self):
+        """
+        Event set on the next state change (new segment, new stream or job end)
+
+        A fresh event is handed out after every change, so any number of
+        listeners can wait on it without clearing it for each other.
+        """
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def notify(self):
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def persist_lock(self):
+        """Lock ordering the writes of this job's state, so an older state never overwrites a newer one"""
+        if self._persist_lock is None:
+            self._persist_lock = asyncio.Lock()
+        return self._persist_lock
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "meeting_id": self.meeting_id,
+            "status": self.status,
+            "target_languages": self.target_languages,
+            "fields": self.fields,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+def _record_to_dict(record):
+    state = {
+        "job_id": record.id,
+        "meeting_id": record.meeting_id,
+        "status": record.status,
+        "target_languages": json.loads(record.target_languages),
+        "fields": json.loads(record.fields),
+        "progress": json.loads(record.progress),
+        "error": record.error,
+        "created_at": record.created_at,
+        "finished_at": record.finished_at
+    }
+    stale_before = datetime.datetime.utcnow() - datetime.timedelta(seconds=JOB_STALE_AFTER)
+    if record.status in ACTIVE_STATUSES and record.updated_at < stale_before:
+        # The process running it stopped without finishing it
+        state["status"] = "failed"
+        state["error"] = "Translation job was interrupted"
+    return state
+
+
+class TranslationJobService:
+    """
+    Service for running multi-language translation jobs in the background
+
+    A job runs in the process that created it, which also holds the segments
+    translated so far for streaming. Its state is written to the
+    translation_jobs table whenever it changes (and on a heartbeat while it
+    runs), so any API process can report it, and a stream requested from
+    another process follows it through the table and sends the stored result.
+    """
+
+    def __init__(self):
+        self.jobs = OrderedDict()
+
+    def create_job(self, meeting_id, target_languages, fields=None, update_meeting_translation=False):
+        """
+        Register a new translation job
+
+        Args:
+            meeting_id: Meeting ID
+            target_languages: List of target language codes
+            fields: Fields to translate (defaults to all translatable fields)
+            update_meeting_translation: Also store the transcript translation in
+                Meeting.translation (used by the single-language translate endpoint)
+
+        Returns:
+            The queued TranslationJob
+        """
+        fields = list(fields or TRANSLATABLE_FIELDS.keys())
+        unknown = [field for field in fields if field not in TRANSLATABLE_FIELDS]
+        if unknown:
+            raise ValueError(f"Fields cannot be translated: {', '.join(unknown)}")
+
+        # Keep order but drop duplicates
+        target_languages = list(OrderedDict.fromkeys(target_languages))
+        job = TranslationJob(meeting_id, target_languages, fields, update_meeting_translation)
+        self._save_state(job.to_dict(), prune=True)
+        self.jobs[job.id] = job
+        self._prune()
+        return job
+
+    def get_job(self, job_id):
+        """
+        State of a job, whichever process runs it
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job dictionary (see TranslationJob.to_dict), or None if unknown
+        """
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        db = SessionLocal()
+        try:
+            record = db.get(TranslationJobRecord, job_id)
+            return _record_to_dict(record) if record is not None else None
+        finally:
+            db.close()
+
+    def find_active_job(self, meeting_id, target_lang, field):
+        """Most recent unfinished job of this process translating the given meeting field into target_lang"""
+        for job in reversed(self.jobs.values()):
+            if (job.meeting_id == meeting_id and not job.finished_at
+                    and target_lang in job.target_languages and field in job.fields):
+                return job
+        return None
+
+    def find_remote_job(self, meeting_id, target_lang, field):
+        """
+        Most recent unfinished job of another process translating the given meeting field into target_lang
+
+        Returns:
+            Job ID, or None
+        """
+        db = SessionLocal()
+        try:
+            records = db.query(TranslationJobRecord).filter(
+                TranslationJobRecord.meeting_id == meeting_id,
+                TranslationJobRecord.status.in_(ACTIVE_STATUSES)
+            ).order_by(TranslationJobRecord.created_at.desc()).all()
+            for record in records:
+                state = _record_to_dict(record)
+                if (record.id not in self.jobs and state["status"] in ACTIVE_STATUSES
+                        and target_lang in state["target_languages"] and field in state["fields"]):
+                    return record.id
+            return None
+        finally:
+            db.close()
+
+    async def wait_for_field(self, job_id, target_lang, field):
+        """
+        Wait until a job running in another process has finished a field
+
+        Args:
+            job_id: Job ID
+            target_lang: Target language code
+            field: Translated field
+
+        Returns:
+            Status of the field ("completed", "failed", ...)
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            state = await loop.run_in_executor(None, self.get_job, job_id)
+            if state is None:
+                return "failed"
+            status = state["progress"].get(target_lang, {}).get(field, state["status"])
+            if status not in ("pending", "running"):
+                return status
+            if state["status"] not in ACTIVE_STATUSES:
+                # Interrupted, or the field was never reached
+                return "failed"
+            await asyncio.sleep(REMOTE_POLL_INTERVAL)
+
+    async def stream_segments(self, job, target_lang, field):
+        """
+        Yield translated segments of one field in order, as they finish
+
+        Args:
+            job: Running or finished TranslationJob
+            target_lang: Target language code
+            field: Translated field
+
+        Yields:
+            (index, translated segment) tuples, in segment order; segments that
+            could not be translated (see TranslationStream.failed) are left out
+        """
+        sent = 0
+        while True:
+            changed = job.changed_event()
+            stream = job.streams.get((target_lang, field))
+            if stream:
+                failed = job.progress[target_lang][field] == "failed"
+                while sent < stream.total and (sent in stream.segments or failed):
+                    if sent in stream.segments:
+                        yield sent, stream.segments[sent]
+                    sent += 1
+                # Finish once the field's result is also stored
+                if sent >= stream.total and job.progress[target_lang][field] != "running":
+                    return
+            if job.finished_at:
+                return
+            await changed.wait()
+
+    async def run_job(self, job_id):
+        """
+        Translate every requested field into every target language
+
+        The source fields are segmented and hashed once and shared by all
+        languages; languages and fields are translated concurrently and each
+        result is stored as soon as it is ready.
+
+        Args:
+            job_id: ID of a job created with create_job
+        """
+        job = self.jobs[job_id]
+        job.status = "running"
+        loop = asyncio.get_running_loop()
+        await self._persist(job)
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+
+        try:
+            source_lang, sources = await loop.run_in_executor(None, self._load_sources, job)
+
+            # Shared source segmentation across languages
+            segmented = {}
+            for field, text in sources.items():
+                segments = assembly_ai_service.segment_text(text, TRANSLATABLE_FIELDS[field])
+                segmented[field] = (segments, [segment_hash(segment) for segment in segments])
+
+            results = await asyncio.gather(*(
+                self._translate_field(job, source_lang, lang, field, segments, hashes)
+                for lang in job.target_languages
+                for field, (segments, hashes) in segmented.items()
+            ), return_exceptions=True)
+
+            # Fields that did translate are stored, but the job only completes if all of them did
+            failures = [result for result in results if isinstance(result, Exception)]
+            job.status = "failed" if failures else "completed"
+            if failures:
+                job.error = "; ".join(str(failure) for failure in failures)
+        except Exception as e:
+            logger.error(f"Translation job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            heartbeat.cancel()
+            job.finished_at = datetime.datetime.utcnow()
+            await self._persist(job)
+            job.notify()
+
+    async def _heartbeat(self, job):
+        # Keeps the job from counting as interrupted while a long field translates
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+            await self._persist(job)
+
+    async def _persist(self, job):
+        # Snapshot in the event loop, write in a thread, in order
+        state = job.to_dict()
+        async with job.persist_lock():
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._save_state, state)
+            except Exception as e:
+                logger.error(f"Failed to save the state of translation job {job.id}: {e}")
+
+    async def _translate_field(self, job, source_lang, target_lang, field, segments, hashes):
+        job.progress[target_lang][field] = "running"
+        stream = TranslationStream(len(segments))
+        job.streams[(target_lang, field)] = stream
+        job.notify()
+        await self._persist(job)
+
+        def on_segment(i, text):
+            stream.segments[i] = text
+            job.notify()
+
+        try:
+            translated = await assembly_ai_service.translate_segments_async(
+                segments, source_lang, target_lang, hashes=hashes, on_segment=on_segment
+            )
+            content = TRANSLATABLE_FIELDS[field].join(translated)
+            update_meeting = job.update_meeting_translation and field == "transcription"
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._save_translation, job.meeting_id, target_lang, field, content, update_meeting
+            )
+            job.progress[target_lang][field] = "completed"
+        except Exception as e:
+            # Nothing is stored for the field, so a partial translation is never served as the real one
+            logger.error(f"Error translating {field} of meeting {job.meeting_id} to {target_lang}: {e}")
+            if isinstance(e, TranslationFailed):
+                stream.failed = e.failed_segments
+            job.progress[target_lang][field] = "failed"
+            raise
+        finally:
+            await self._persist(job)
+            job.notify()
+
+    def _load_sources(self, job):
+        db = SessionLocal()
+        try:
+            meeting = db.query(Meeting).filter(Meeting.id == job.meeting_id).first()
+            if not meeting:
+                raise ValueError(f"Meeting {job.meeting_id} not found")
+            sources = {}
+            for field in job.fields:
+                text = getattr(meeting, field)
+                if text:
+                    sources[field] = text
+                else:
+                    # Nothing to translate for this field
+                    for lang in job.target_languages:
+                        job.progress[lang][field] = "skipped"
+            return meeting.language or "en", sources
+        finally:
+            db.close()
+
+    def _save_translation(self, meeting_id, target_lang, field, content, update_meeting=False):
+        db = SessionLocal()
+        try:
+            if update_meeting:
+                # Set through the ORM so the text is compressed and the full-text index follows
+                meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+                if meeting:
+                    meeting.translation = content
+            translation = db.query(Translation).filter(
+                Translation.meeting_id == meeting_id,
+                Translation.target_lang == target_lang,
+                Translation.field == field
+            ).first()
+            if translation:
+                translation.content = content
+                translation.created_at = datetime.datetime.utcnow()
+            else:
+                db.add(Translation(meeting_id=meeting_id, target_lang=target_lang, field=field, content=content))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _save_state(self, state, prune=False):
+        db = SessionLocal()
+        try:
+            db.merge(TranslationJobRecord(
+                id=state["job_id"],
+                meeting_id=state["meeting_id"],
+                status=state["status"],
+                target_languages=json.dumps(state["target_languages"]),
+                fields=json.dumps(state["fields"]),
+                progress=json.dumps(state["progress"]),
+                error=state["error"],
+                created_at=state["created_at"],
+                updated_at=datetime.datetime.utcnow(),
+                finished_at=state["finished_at"]
+            ))
+            if prune:
+                keep = db.query(TranslationJobRecord.id).filter(
+                    TranslationJobRecord.finished_at.isnot(None)
+                ).order_by(TranslationJobRecord.finished_at.desc()).limit(MAX_FINISHED_JOBS)
+                db.query(TranslationJobRecord).filter(
+                    TranslationJobRecord.finished_at.isnot(None),
+                    TranslationJobRecord.id.notin_(keep.scalar_subquery())
+                ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished_at]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+
+# Create instance
+translation_job_service = TranslationJobService()
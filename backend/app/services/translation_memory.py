@@ -0,0 +1,180 @@
+import re
+import hashlib
+import logging
+import unicodedata
+
+from sqlalchemy.exc import IntegrityError
+
+from ..db.database import SessionLocal, TranslationMemory
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+WORD_PATTERN = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Languages identified by their script alone
+SCRIPT_RANGES = {
+    "ja": [(0x3040, 0x30FF)],                     # Hiragana and Katakana
+    "ko": [(0xAC00, 0xD7AF), (0x1100, 0x11FF)],   # Hangul
+    "zh": [(0x4E00, 0x9FFF), (0x3400, 0x4DBF)],   # CJK ideographs
+    "ru": [(0x0400, 0x04FF)],                     # Cyrillic
+}
+
+# Frequent function words for Latin-script languages
+STOPWORDS = {
+    "en": {"the", "and", "is", "are", "to", "of", "we", "that", "it", "for", "you", "this", "with", "have", "will"},
+    "es": {"el", "la", "que", "de", "y", "los", "las", "es", "en", "por", "para", "una", "con", "del", "se"},
+    "fr": {"le", "la", "les", "et", "est", "que", "des", "une", "pour", "dans", "nous", "pas", "vous", "sur", "du"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "wir", "ich", "zu", "ein", "eine", "mit", "auf", "den", "sie"},
+    "it": {"il", "che", "di", "la", "per", "non", "sono", "una", "con", "gli", "della", "anche", "questo", "ci"},
+    "pt": {"o", "que", "de", "não", "uma", "para", "com", "os", "é", "do", "da", "em", "um", "se"},
+    "nl": {"de", "het", "een", "en", "is", "van", "dat", "niet", "we", "ik", "op", "te", "zijn", "met"},
+}
+
+
+def normalize_segment(text):
+    """Normalize a segment so trivially different copies share a hash"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def segment_hash(text):
+    """SHA-256 hex digest of the normalized segment"""
+    return hashlib.sha256(normalize_segment(text).encode("utf-8")).hexdigest()
+
+
+def base_language(code):
+    """Reduce a language code such as 'zh-CN' or 'yue' to the code used for detection"""
+    code = (code or "").lower().replace("_", "-").split("-")[0]
+    return "zh" if code == "yue" else code
+
+
+def detect_language(text):
+    """
+    Cheap language guess for a single segment
+
+    Uses the dominant script for CJK, Korean and Cyrillic text and stopword
+    counts for Latin-script languages. Only meant to spot segments that are
+    already in the target language, so it returns None when unsure.
+
+    Args:
+        text: Segment text
+
+    Returns:
+        Language code (en, zh, ...) or None
+    """
+    letters = [ch for ch in text if ch.isalpha()]
+    if not letters:
+        return None
+
+    script_counts = {lang: 0 for lang in SCRIPT_RANGES}
+    for ch in letters:
+        code = ord(ch)
+        for lang, ranges in SCRIPT_RANGES.items():
+            if any(lo <= code <= hi for lo, hi in ranges):
+                script_counts[lang] += 1
+                break
+
+    # Japanese mixes kana with ideographs, so any significant kana wins
+    if script_counts["ja"] >= 0.1 * len(letters):
+        return "ja"
+    lang, count = max(script_counts.items(), key=lambda item: item[1])
+    if count >= 0.5 * len(letters):
+        return lang
+    if sum(script_counts.values()) > 0.2 * len(letters):
+        return None
+
+    words = [word.lower() for word in WORD_PATTERN.findall(text)]
+    if len(words) < 4:
+        return None
+    scores = sorted(
+        ((sum(1 for word in words if word in stopwords), lang) for lang, stopwords in STOPWORDS.items()),
+        reverse=True
+    )
+    (best_score, best_lang), (second_score, _) = scores[0], scores[1]
+    # Require a clear winner, since many stopwords are shared between languages
+    if best_score >= 2 and best_score >= 0.15 * len(words) and best_score >= 1.5 * second_score:
+        return best_lang
+    return None
+
+
+def is_in_language(text, language):
+    """Check whether a segment already appears to be in the given language"""
+    return detect_language(text) == base_language(language)
+
+
+class TranslationMemoryService:
+    """Service for storing and reusing translated segments"""
+
+    def lookup(self, hashes, source_lang, target_lang):
+        """
+        Fetch stored translations
+
+        Args:
+            hashes: Iterable of segment hashes
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Dictionary mapping segment hash to translated text
+        """
+        hashes = list(set(hashes))
+        found = {}
+        db = SessionLocal()
+        try:
+            for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+                rows = db.query(TranslationMemory.segment_hash, TranslationMemory.translated_text).filter(
+                    TranslationMemory.source_lang == source_lang,
+                    TranslationMemory.target_lang == target_lang,
+                    TranslationMemory.segment_hash.in_(hashes[start:start + LOOKUP_BATCH_SIZE])
+                ).all()
+                found.update(rows)
+        finally:
+            db.close()
+        return found
+
+    def store(self, translations, source_lang, target_lang):
+        """
+        Save translated segments, ignoring ones that are already stored
+
+        Args:
+            translations: Dictionary mapping segment hash to translated text
+            source_lang: Source language code
+            target_lang: Target language code
+        """
+        if not translations:
+            return
+        # Another request may have stored some of these meanwhile
+        existing = self.lookup(translations.keys(), source_lang, target_lang)
+        entries = [
+            TranslationMemory(
+                segment_hash=h,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                translated_text=text
+            )
+            for h, text in translations.items() if h not in existing
+        ]
+        if not entries:
+            return
+        db = SessionLocal()
+        try:
+            db.add_all(entries)
+            db.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent writer - the other copy is just as good
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error storing translation memory entries: {e}")
+        finally:
+            db.close()
+
+
+# Create instance
+translation_memory_service = TranslationMemoryService()
@@ -0,0 +1,17 @@
+"""Benchmarks for transcript and analysis formatting"""
+
+from app.services.assembly_ai import assembly_ai_service
+from app.services.cohere_analysis import cohere_analysis_service
+
+from conftest import MEETING_SIZES, make_utterances
+
+
+def bench_format_utterances(measure, size):
+    utterances = make_utterances(MEETING_SIZES[size])
+    result = measure(assembly_ai_service.format_utterances, utterances)
+    assert len(result["utterances"]) == len(utterances)
+
+
+def bench_format_action_items(measure, meeting):
+    formatted = measure(cohere_analysis_service._format_action_items, meeting.action_items)
+    assert formatted.startswith("• ")
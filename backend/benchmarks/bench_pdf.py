@@ -0,0 +1,43 @@
+"""Benchmarks for PDF rendering"""
+
+from app.services.pdf_generator import pdf_generator_service
+
+
+def bench_generate_transcript_pdf(measure, meeting, tmp_path):
+    path = measure(
+        pdf_generator_service.generate_transcript_pdf,
+        meeting.title, meeting.transcription, meeting.id, output_path=str(tmp_path / "transcript.pdf")
+    )
+    assert path.endswith(".pdf")
+
+
+def bench_generate_summary_pdf(measure, meeting, tmp_path):
+    path = measure(
+        pdf_generator_service.generate_summary_pdf,
+        meeting.title, meeting.summary, meeting.action_items, meeting.id, output_path=str(tmp_path / "summary.pdf")
+    )
+    assert path.endswith(".pdf")
+
+
+def bench_generate_full_report_pdf(measure, meeting, tmp_path):
+    path = measure(
+        pdf_generator_service.generate_full_report_pdf,
+        meeting.title, meeting.transcription, meeting.summary, meeting.action_items, meeting.id,
+        output_path=str(tmp_path / "report.pdf")
+    )
+    assert path.endswith(".pdf")
+
+
+def bench_render_to_buffer(measure, meeting):
+    def render():
+        buffer = pdf_generator_service.render_to_buffer(
+            "report", meeting.title, meeting.transcription, meeting.summary, meeting.action_items
+        )
+        buffer.close()
+
+    measure(render)
+
+
+def bench_escape_xml(measure, meeting):
+    escaped = measure(pdf_generator_service._escape_xml, meeting.transcription)
+    assert "<draft>" not in escaped
@@ -0,0 +1,34 @@
+"""Benchmarks for plain-text document generation"""
+
+import asyncio
+
+from app.services.document_stream import text_document, stream_text_document
+
+
+def read_body(response):
+    """Number of bytes a streamed response sends, reading its body the way the server does"""
+    async def drain():
+        length = 0
+        async for chunk in response.body_iterator:
+            length += len(chunk)
+        return length
+
+    return asyncio.run(drain())
+
+
+def bench_get_meeting_text(measure, meeting):
+    # What GET /meetings/{id}/text does once the meeting is loaded, including sending the body
+    def generate(content_type):
+        chunks, filename = text_document(meeting, content_type)
+        return read_body(stream_text_document(chunks, filename))
+
+    length = measure(generate, "report")
+    assert length > len(meeting.transcription)
+
+
+def bench_get_meeting_text_transcript(measure, meeting):
+    def generate():
+        chunks, filename = text_document(meeting, "transcript")
+        return read_body(stream_text_document(chunks, filename))
+
+    measure(generate)
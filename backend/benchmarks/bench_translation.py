@@ -0,0 +1,14 @@
+"""Benchmarks for splitting transcripts into translation requests"""
+
+from app.services.assembly_ai import assembly_ai_service
+
+
+def bench_segment_text(measure, meeting):
+    segments = measure(assembly_ai_service.segment_text, meeting.transcription)
+    assert segments
+
+
+def bench_pack_chunks(measure, meeting):
+    segments = assembly_ai_service.segment_text(meeting.transcription)
+    chunks = measure(assembly_ai_service._pack_chunks, segments)
+    assert sum(len(chunk) for chunk in chunks) == len(segments)
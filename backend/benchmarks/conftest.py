@@ -0,0 +1,185 @@
+"""
+Shared fixtures for the benchmark suite
+
+Meetings are synthetic and come in three sizes, so a regression that only
+shows on long meetings is caught too. Every benchmark records its time with
+pytest-benchmark and its peak Python memory with tracemalloc; peaks are
+checked against baselines/memory.json.
+"""
+
+import os
+import sys
+import json
+import datetime
+import tempfile
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+# Keep the app's database, uploads and PDFs out of the working tree
+_WORK_DIR = tempfile.mkdtemp(prefix="meeting-benchmarks-")
+for _name in ("DATA_DIR", "UPLOAD_DIR", "PDF_DIR", "SEARCH_INDEX_DIR"):
+    os.environ.setdefault(_name, os.path.join(_WORK_DIR, _name.lower()))
+
+# Add the backend directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+MEMORY_BASELINE = os.path.join(BASELINE_DIR, "memory.json")
+
+# Transcript sizes in characters
+MEETING_SIZES = {
+    "small": 10_000,
+    "medium": 100_000,
+    "large": 1_000_000,
+}
+
+# Timed rounds per size, so large meetings do not dominate the run
+ROUNDS = {
+    "small": 20,
+    "medium": 5,
+    "large": 3,
+}
+
+# Peak memory below this is noise and never fails the baseline check
+MEMORY_SLACK_BYTES = 256 * 1024
+
+SENTENCES = [
+    "We reviewed the release plan and agreed to fix the checkout bugs before the dashboard work starts.",
+    "The customer interviews showed that onboarding takes too long & the pricing page is confusing.",
+    "Marketing wants the launch announcement <draft> ready by Thursday so legal can review it.",
+    "Infrastructure costs grew 12% last month, mostly from the search cluster and log storage.",
+]
+
+SPEAKERS = ["Alice", "Bob", "Carol", "Dave"]
+
+
+def make_utterances(size):
+    """Synthetic utterances whose formatted transcript is about size characters"""
+    utterances = []
+    total = 0
+    start = 0
+    i = 0
+    while total < size:
+        text = " ".join(SENTENCES[(i + j) % len(SENTENCES)] for j in range(1 + i % 5))
+        utterances.append(SimpleNamespace(speaker=SPEAKERS[i % len(SPEAKERS)], text=text, start=start, end=start + 4000))
+        total += len(text) + 9
+        start += 4500
+        i += 1
+    return utterances
+
+
+def make_action_items(count):
+    """Synthetic action items with the mixed bullet styles the model returns"""
+    bullets = ["• ", "- ", "* ", "1. ", ""]
+    lines = ["Action Items:"]
+    for i in range(count):
+        lines.append(f"{bullets[i % len(bullets)]}{SPEAKERS[i % len(SPEAKERS)]}: {SENTENCES[i % len(SENTENCES)]}")
+    return "\n".join(lines)
+
+
+def make_meeting(size):
+    """Synthetic meeting record with a transcript of about size characters"""
+    transcript = "\n\n".join(f"{u.speaker}: {u.text}" for u in make_utterances(size))
+    summary = "\n\n".join(" ".join(SENTENCES) for _ in range(max(1, size // 20_000)))
+    return SimpleNamespace(
+        id=1,
+        title=f"Planning meeting ({size // 1000} KB)",
+        transcription=transcript,
+        translation=transcript,
+        summary=summary,
+        action_items=make_action_items(max(5, size // 2000)),
+        detected_language="en",
+        audio_duration=size / 15,
+        date=datetime.datetime(2024, 1, 15, 10, 30),
+    )
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("memory baselines")
+    group.addoption("--memory-save", action="store_true", default=False,
+                    help="Store the measured peak memory as the new baseline")
+    group.addoption("--memory-tolerance", type=float, default=0.25,
+                    help="Allowed growth of peak memory over the baseline (default 0.25 = 25%%)")
+
+
+class MemoryBaseline:
+    """Peak memory per benchmark, compared against the stored baseline"""
+
+    def __init__(self, path, tolerance, save):
+        self.path = path
+        self.tolerance = tolerance
+        self.save = save
+        self.measured = {}
+        self.baseline = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.baseline = json.load(f)
+
+    def check(self, name, peak):
+        self.measured[name] = peak
+        expected = self.baseline.get(name)
+        if self.save or expected is None:
+            return
+        limit = expected * (1 + self.tolerance) + MEMORY_SLACK_BYTES
+        if peak > limit:
+            pytest.fail(
+                f"Peak memory regression: {peak / 1024:.0f} KB, "
+                f"baseline {expected / 1024:.0f} KB (limit {limit / 1024:.0f} KB)"
+            )
+
+    def write(self):
+        if not self.save or not self.measured:
+            return
+        self.baseline.update(self.measured)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(self.baseline.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def memory_baseline(request):
+    baseline = MemoryBaseline(
+        MEMORY_BASELINE,
+        request.config.getoption("--memory-tolerance"),
+        request.config.getoption("--memory-save")
+    )
+    yield baseline
+    baseline.write()
+
+
+@pytest.fixture(scope="session", params=list(MEETING_SIZES))
+def size(request):
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def meeting(size):
+    return make_meeting(MEETING_SIZES[size])
+
+
+@pytest.fixture
+def measure(benchmark, request, size, memory_baseline):
+    """
+    Time a callable with pytest-benchmark, then record its peak memory
+
+    Peak memory comes from one extra, untimed call under tracemalloc, so
+    tracing does not skew the timings. It covers Python allocations only.
+    """
+    def run(fn, *args, **kwargs):
+        result = benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=ROUNDS[size], iterations=1, warmup_rounds=1)
+
+        tracemalloc.start()
+        try:
+            fn(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        benchmark.extra_info["peak_memory_kb"] = round(peak / 1024)
+        memory_baseline.check(request.node.nodeid, peak)
+        return result
+
+    return run
@@ -1,13 +1,22 @@
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.api.meetings import router
+from app.api.search import router as search_router
+from app.api.exports import router as exports_router
 import os
 from app.core.config import settings
+from app.lifecycle import register_lifecycle
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Compression, database setup and background services
+register_lifecycle(app)
 
 # Include routers
 app.include_router(router, prefix="/api")
+app.include_router(search_router, prefix="/api")
+app.include_router(exports_router, prefix="/api")
 
 # Ensure data directory exists
 os.makedirs(settings.DATA_DIR, exist_ok=True)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Stress benchmark for PDF rendering of long transcripts.
+
+Renders transcript documents from 10 KB to 10 MB and reports render time and
+peak memory for each size. Every case runs in a fresh process, so the peak RSS
+of one case does not hide behind another's. Two transcript shapes are used:
+speaker-labelled paragraphs, and a single paragraph with no breaks at all (what
+AssemblyAI returns without speaker labels).
+
+The "bounded" mode is the current renderer (oversized paragraphs are split and
+long meetings are laid out incrementally); "legacy" disables both, to show what
+the renderer did before.
+
+Usage:
+    python scripts/benchmark_pdf_memory.py
+    python scripts/benchmark_pdf_memory.py --sizes 10k,1m --shapes single --modes bounded,legacy
+"""
+
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SENTENCE = "We reviewed the release plan and agreed to fix the checkout bugs before the dashboard work starts. "
+
+
+def parse_size(value):
+    value = value.strip().lower()
+    units = {"k": 1000, "m": 1000 ** 2}
+    if value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def make_transcript(size, shape):
+    """Synthetic transcript of about size characters"""
+    if shape == "single":
+        return (SENTENCE * (size // len(SENTENCE) + 1))[:size]
+    paragraph = SENTENCE * 6
+    parts = []
+    total = 0
+    i = 0
+    while total < size:
+        part = f"Speaker {'ABC'[i % 3]}: {paragraph}"
+        parts.append(part)
+        total += len(part) + 2
+        i += 1
+    return "\n\n".join(parts)
+
+
+def max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_case(size, shape, mode, queue):
+    from app.core.config import settings
+    if mode == "legacy":
+        settings.PDF_MAX_PARAGRAPH_CHARS = 0
+        settings.PDF_STREAMING_THRESHOLD = 10 ** 12
+    from app.services.pdf_generator import pdf_generator_service
+
+    transcript = make_transcript(size, shape)
+    baseline = max_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "transcript.pdf")
+        start = time.perf_counter()
+        path = pdf_generator_service.generate_transcript_pdf("Stress test", transcript, 0, output_path=output)
+        elapsed = time.perf_counter() - start
+        out_size = os.path.getsize(path)
+    queue.put({
+        "seconds": elapsed,
+        "peak_mb": max_rss_mb(),
+        "render_mb": max_rss_mb() - baseline,
+        "output_kb": out_size / 1024,
+        "pdf": path.endswith(".pdf"),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF rendering stress benchmark")
+    parser.add_argument("--sizes", default="10k,100k,1m,10m", help="Comma-separated transcript sizes")
+    parser.add_argument("--shapes", default="paragraphs,single", help="paragraphs and/or single")
+    parser.add_argument("--modes", default="bounded,legacy", help="bounded and/or legacy")
+    parser.add_argument("--legacy-max-size", default="1m", help="Skip legacy runs above this size")
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds before a case is abandoned")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    legacy_max = parse_size(args.legacy_max_size)
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{'size':>10} {'shape':>11} {'mode':>8} {'seconds':>9} {'peak MB':>9} {'render MB':>10} {'output KB':>10}  result")
+    for size in sizes:
+        for shape in args.shapes.split(","):
+            for mode in args.modes.split(","):
+                if mode == "legacy" and size > legacy_max:
+                    continue
+                queue = context.Queue()
+                process = context.Process(target=run_case, args=(size, shape, mode, queue))
+                process.start()
+                process.join(args.timeout)
+                if process.is_alive():
+                    process.kill()
+                    print(f"{size:>10} {shape:>11} {mode:>8}  timed out after {args.timeout:.0f}s")
+                    continue
+                if process.exitcode != 0 or queue.empty():
+                    print(f"{size:>10} {shape:>11} {mode:>8}  failed (exit code {process.exitcode})")
+                    continue
+                r = queue.get()
+                print(f"{size:>10} {shape:>11} {mode:>8} {r['seconds']:>9.2f} {r['peak_mb']:>9.1f} "
+                      f"{r['render_mb']:>10.1f} {r['output_kb']:>10.0f}  {'pdf' if r['pdf'] else 'text fallback'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Benchmark the translation client against the local stand-in server.
+
+Compares the old one-chunk-at-a-time approach (fresh requests.get per chunk and
+a fixed delay between chunks) with the concurrent pooled client, using the same
+chunks. No network access or API key is needed.
+
+Usage:
+    python scripts/benchmark_translation.py --chunks 100 --latency 0.2
+    python scripts/benchmark_translation.py --chunks 100 --rate-limit 15 --error-rate 0.05
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from mock_translate_server import start_in_background
+from app.services.translation_client import TranslationClient
+
+
+def make_chunks(count, paragraphs_per_chunk=4):
+    """Build synthetic transcript chunks of roughly 1000 characters"""
+    paragraph = "Speaker {n}: We reviewed the release plan and agreed to fix the checkout bugs before the dashboard work starts."
+    chunks = []
+    for i in range(count):
+        chunks.append("\n\n".join(paragraph.format(n=i * paragraphs_per_chunk + j) for j in range(paragraphs_per_chunk)))
+    return chunks
+
+
+def run_sequential(url, chunks, delay):
+    """The previous implementation: one request at a time with a fixed delay"""
+    results = []
+    for i, chunk in enumerate(chunks):
+        response = requests.get(url, params={"client": "gtx", "sl": "en", "tl": "zh", "dt": "t", "q": chunk}, timeout=10)
+        results.append(response.status_code == 200)
+        if i < len(chunks) - 1:
+            time.sleep(delay)
+    return results
+
+
+def run_concurrent(url, chunks, concurrency, rate, max_rate):
+    client = TranslationClient()
+    client.url = url
+    client.max_concurrency = concurrency
+    client.limiter.rate = rate
+    client.limiter.max_rate = max_rate
+    client.limiter.burst = concurrency
+    client.limiter.tokens = concurrency
+    results = client.translate_chunks_sync(chunks, "en", "zh")
+    return [result is not None for result in results], client.limiter.rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the translation client offline")
+    parser.add_argument("--chunks", type=int, default=100, help="Number of ~1000-character chunks")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated upstream latency in seconds")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Upstream requests per second before 429s (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream requests failing with 503")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent requests for the pooled client")
+    parser.add_argument("--rate", type=float, default=5.0, help="Initial client request rate (per second)")
+    parser.add_argument("--max-rate", type=float, default=40.0, help="Maximum client request rate (per second)")
+    parser.add_argument("--sequential-delay", type=float, default=1.0, help="Delay between chunks in the old approach")
+    parser.add_argument("--skip-sequential", action="store_true", help="Only run the concurrent client")
+    args = parser.parse_args()
+
+    server = start_in_background(latency=args.latency, rate_limit=args.rate_limit, error_rate=args.error_rate)
+    chunks = make_chunks(args.chunks)
+    print(f"Mock server at {server.url}: latency={args.latency}s rate_limit={args.rate_limit or 'none'} error_rate={args.error_rate}")
+    print(f"Translating {len(chunks)} chunks ({sum(len(c) for c in chunks)} characters)")
+
+    try:
+        if not args.skip_sequential:
+            server.request_count = 0
+            start = time.perf_counter()
+            ok = run_sequential(server.url, chunks, args.sequential_delay)
+            elapsed = time.perf_counter() - start
+            print(f"Sequential: {elapsed:.2f}s, {sum(ok)}/{len(ok)} chunks ok, "
+                  f"{server.request_count} requests, {len(chunks) / elapsed:.1f} chunks/s")
+
+        server.request_count = 0
+        start = time.perf_counter()
+        ok, final_rate = run_concurrent(server.url, chunks, args.concurrency, args.rate, args.max_rate)
+        elapsed = time.perf_counter() - start
+        print(f"Concurrent: {elapsed:.2f}s, {sum(ok)}/{len(ok)} chunks ok, "
+              f"{server.request_count} requests, {len(chunks) / elapsed:.1f} chunks/s, final rate {final_rate:.1f}/s")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
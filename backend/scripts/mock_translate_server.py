@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Local stand-in for the Google Translate web endpoint.
+
+Serves GET /translate_a/single with the same query parameters and nested-array
+response format as the real endpoint, so the translation client can be run and
+benchmarked offline. Latency, rate limiting and error rates are configurable.
+
+Usage:
+    python scripts/mock_translate_server.py --port 8765 --latency 0.2 --rate-limit 20
+    TRANSLATION_API_URL=http://127.0.0.1:8765/translate_a/single python run.py
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class MockTranslateHandler(BaseHTTPRequestHandler):
+    """Request handler; behaviour is configured through attributes on the server"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != "/translate_a/single":
+            self.send_error(404)
+            return
+
+        server = self.server
+        server.record_request()
+
+        if server.over_rate_limit():
+            self._send_json(429, {"error": "rate limited"}, {"Retry-After": "1"})
+            return
+        if random.random() < server.error_rate:
+            self._send_json(503, {"error": "unavailable"})
+            return
+
+        time.sleep(server.latency)
+
+        params = parse_qs(parsed.query)
+        text = params.get("q", [""])[0]
+        target = params.get("tl", ["zh"])[0]
+        source = params.get("sl", ["en"])[0]
+
+        # Mimic the real format: one [translated, original, ...] entry per sentence-ish piece
+        pieces = []
+        for line in text.split("\n"):
+            pieces.append([f"[{target}] {line}" if line else "", line, None, None])
+            pieces.append(["\n", "\n", None, None])
+        pieces = pieces[:-1]
+        self._send_json(200, [pieces, None, source])
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MockTranslateServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a sliding one-second request window"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.2, rate_limit=0, error_rate=0.0, verbose=False):
+        super().__init__(address, MockTranslateHandler)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self.request_count = 0
+        self._window = []
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def over_rate_limit(self):
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.rate_limit:
+                return True
+            self._window.append(now)
+            return False
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/translate_a/single"
+
+
+def start_in_background(latency=0.2, rate_limit=0, error_rate=0.0, port=0):
+    """
+    Start a mock server on a background thread
+
+    Returns:
+        The running MockTranslateServer (call shutdown() to stop it)
+    """
+    server = MockTranslateServer(("127.0.0.1", port), latency=latency, rate_limit=rate_limit, error_rate=error_rate)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in translation server")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds of simulated latency per request")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per second before returning 429 (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = MockTranslateServer(
+        ("127.0.0.1", args.port),
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        verbose=args.verbose
+    )
+    print(f"Mock translation server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -364,7 +364,15 @@ const MeetingDetailPage = () => {
   const handleTranslate = async () => {
     try {
       setTranslationLoading(true);
-      await apiService.translateMeeting(meetingId, targetLanguage);
+      
+      // Show the translation as its segments arrive
+      const segments = [];
+      await apiService.translateMeeting(meetingId, targetLanguage, (index, text) => {
+        segments[index] = text;
+        const translation = segments.filter((segment) => segment !== undefined).join('\n\n');
+        setMeeting((current) => (current ? { ...current, translation } : current));
+        setTabValue(1);
+      });
       
       // Refresh meeting data to get translation
       const updatedMeeting = await apiService.getMeeting(meetingId);
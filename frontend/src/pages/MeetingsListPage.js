@@ -36,9 +36,13 @@ import CheckCircleOutlineIcon from '@mui/icons-material/CheckCircleOutline';
 import PendingIcon from '@mui/icons-material/Pending';
 import SpeakerNotesOffIcon from '@mui/icons-material/SpeakerNotesOff';
 import TimerIcon from '@mui/icons-material/Timer';
+import ErrorOutlineIcon from '@mui/icons-material/ErrorOutline';
 import { formatDateWithTimezone, getTimeAgo } from '../utils/dateUtils';
 import TimezoneSelector from '../components/TimezoneSelector';
 
+// Meetings fetched per page
+const PAGE_SIZE = 30;
+
 const MeetingsListPage = () => {
   const navigate = useNavigate();
   const theme = useTheme();
@@ -48,13 +52,16 @@ const MeetingsListPage = () => {
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   const [meetingToDelete, setMeetingToDelete] = useState(null);
   const [deleteLoading, setDeleteLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchMeetings = async () => {
       try {
         setLoading(true);
-        const data = await apiService.getMeetings();
-        setMeetings(data);
+        const page = await apiService.getMeetings({ limit: PAGE_SIZE });
+        setMeetings(page.items);
+        setNextCursor(page.next_cursor);
         setError('');
       } catch (error) {
         console.error('Error fetching meetings:', error);
@@ -67,6 +74,32 @@ const MeetingsListPage = () => {
     fetchMeetings();
   }, []);
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+
+    try {
+      setLoadingMore(true);
+      const page = await apiService.getMeetings({ cursor: nextCursor, limit: PAGE_SIZE });
+      setMeetings((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Error fetching more meetings:', error);
+      setError('Failed to load more meetings. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const getStatusChip = (status) => {
+    if (status === 'completed') {
+      return { label: 'Transcribed', color: 'success', icon: <CheckCircleOutlineIcon /> };
+    }
+    if (status === 'failed') {
+      return { label: 'Failed', color: 'error', icon: <ErrorOutlineIcon /> };
+    }
+    return { label: 'Processing', color: 'warning', icon: <PendingIcon /> };
+  };
+
   const getLanguageLabel = (code) => {
     const languages = {
       'en': 'English',
@@ -271,24 +304,22 @@ const MeetingsListPage = () => {
                     <Box sx={{ display: 'flex', alignItems: 'center', mb: 2 }}>
                       <Avatar
                         sx={{
-                          bgcolor: meeting.transcription 
-                            ? 'success.light'
-                            : 'warning.light',
+                          bgcolor: `${getStatusChip(meeting.status).color}.light`,
                           width: 48,
                           height: 48
                         }}
                       >
-                        {meeting.transcription 
+                        {meeting.status === 'completed'
                           ? <ArticleIcon />
-                          : <PendingIcon />
+                          : meeting.status === 'failed'
+                            ? <ErrorOutlineIcon />
+                            : <PendingIcon />
                         }
                       </Avatar>
                       <Box sx={{ ml: 2 }}>
                         <Chip 
                           size="small" 
-                          label={meeting.transcription ? "Transcribed" : "Processing"} 
-                          color={meeting.transcription ? "success" : "warning"}
-                          icon={meeting.transcription ? <CheckCircleOutlineIcon /> : <PendingIcon />}
+                          {...getStatusChip(meeting.status)}
                         />
                       </Box>
                     </Box>
@@ -353,6 +384,20 @@ const MeetingsListPage = () => {
                           </Typography>
                         </Box>
                       )}
+                      {meeting.summary_excerpt && (
+                        <Typography 
+                          variant="body2" 
+                          color="text.secondary"
+                          sx={{
+                            overflow: 'hidden',
+                            display: '-webkit-box',
+                            WebkitLineClamp: 3,
+                            WebkitBoxOrient: 'vertical'
+                          }}
+                        >
+                          {meeting.summary_excerpt}
+                        </Typography>
+                      )}
                     </Stack>
                   </CardContent>
                   
@@ -379,6 +424,19 @@ const MeetingsListPage = () => {
                 </Card>
               </Grid>
             ))}
+            {nextCursor && (
+              <Grid item xs={12} sx={{ display: 'flex', justifyContent: 'center' }}>
+                <Button
+                  variant="outlined"
+                  onClick={handleLoadMore}
+                  disabled={loadingMore}
+                  startIcon={loadingMore ? <CircularProgress size={16} /> : null}
+                  sx={{ borderRadius: 2, px: 4 }}
+                >
+                  {loadingMore ? 'Loading...' : 'Load More'}
+                </Button>
+              </Grid>
+            )}
           </Grid>
         ) : (
           <Paper 
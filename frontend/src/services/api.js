@@ -12,6 +12,39 @@ const api = axios.create({
   },
 });
 
+// Follow a translation stream (server-sent events) - resolves with the "done" event,
+// or null if the stream broke off before it, so the caller can fall back to polling
+const streamTranslation = (streamUrl, onSegment) => new Promise((resolve) => {
+  const source = new EventSource(streamUrl);
+
+  source.addEventListener('segment', (event) => {
+    const segment = JSON.parse(event.data);
+    if (onSegment) onSegment(segment.index, segment.text);
+  });
+  source.addEventListener('done', (event) => {
+    source.close();
+    resolve(JSON.parse(event.data));
+  });
+  source.onerror = () => {
+    source.close();
+    resolve(null);
+  };
+});
+
+// Poll a translation job until it finishes
+const waitForTranslationJob = async (meetingId, job) => {
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    const jobResponse = await api.get(`/meetings/${meetingId}/translation-jobs/${job.job_id}`);
+    job = jobResponse.data;
+  }
+
+  if (job.status === 'failed') {
+    throw new Error(job.error || 'Translation failed');
+  }
+  return job;
+};
+
 // API service functions
 const apiService = {
   // Upload meeting audio
@@ -27,23 +60,52 @@ const apiService = {
     return response.data;
   },
 
-  // Get all meetings
-  getMeetings: async () => {
-    const response = await api.get('/meetings');
+  // Get a page of meetings, newest first - pass the previous page's next_cursor to continue
+  // fields (e.g. ['title', 'status']) returns only those fields of each meeting
+  getMeetings: async ({ cursor, limit, dateFrom, dateTo, language, fields } = {}) => {
+    const params = {};
+    if (cursor) params.cursor = cursor;
+    if (fields) params.fields = fields.join(',');
+    if (limit) params.limit = limit;
+    if (dateFrom) params.date_from = dateFrom;
+    if (dateTo) params.date_to = dateTo;
+    if (language) params.language = language;
+    const response = await api.get('/meetings/', { params });
+    return response.data;
+  },
+
+  // Get meeting by ID - pass fields to load only those fields
+  getMeeting: async (meetingId, fields) => {
+    const params = fields ? { fields: fields.join(',') } : {};
+    const response = await api.get(`/meetings/${meetingId}`, { params });
     return response.data;
   },
 
-  // Get meeting by ID
-  getMeeting: async (meetingId) => {
-    const response = await api.get(`/meetings/${meetingId}`);
+  // Get several meetings in one request - returns { items, missing }
+  getMeetingsBatch: async (meetingIds, fields) => {
+    const params = { ids: meetingIds.join(',') };
+    if (fields) params.fields = fields.join(',');
+    const response = await api.get('/meetings/batch', { params });
     return response.data;
   },
 
-  // Translate meeting
-  translateMeeting: async (meetingId, targetLanguage) => {
+  // Translate meeting - the backend runs the translation as a job and streams its segments
+  // onSegment(index, text) is called for each segment as soon as it is translated
+  translateMeeting: async (meetingId, targetLanguage, onSegment) => {
     try {
       const response = await api.post(`/meetings/${meetingId}/translate?target_language=${targetLanguage}`);
-      return response.data;
+      const job = response.data;
+
+      if (typeof EventSource !== 'undefined' && job.stream_url) {
+        const done = await streamTranslation(job.stream_url, onSegment);
+        if (done) {
+          if (done.status !== 'completed') {
+            throw new Error(`Translation failed (${(done.failed_segments || []).length} segments untranslated)`);
+          }
+          return { ...job, status: done.status };
+        }
+      }
+      return await waitForTranslationJob(meetingId, job);
     } catch (error) {
       console.error('Translation error:', error);
       throw error;
@@ -106,6 +168,12 @@ const apiService = {
     const response = await api.delete(`/meetings/${meetingId}`);
     return response.data;
   },
+
+  // Delete several meetings - returns { deleted, missing }
+  bulkDeleteMeetings: async (meetingIds) => {
+    const response = await api.post('/meetings/bulk-delete', { meeting_ids: meetingIds });
+    return response.data;
+  },
 };
 
 export default apiService; 
\ No newline at end of file